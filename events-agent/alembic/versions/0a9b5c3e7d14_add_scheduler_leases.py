@@ -0,0 +1,27 @@
+"""
+add scheduler_leases table
+
+Revision ID: 0a9b5c3e7d14
+Revises: f2c87d05a6e1
+Create Date: 2025-10-10 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0a9b5c3e7d14'
+down_revision = 'f2c87d05a6e1'
+
+
+def upgrade() -> None:
+    op.create_table('scheduler_leases',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('holder', sa.String(length=128), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduler_leases')
@@ -0,0 +1,34 @@
+"""
+scope events to their owner and record transparency and attendance
+
+Revision ID: 9d41c6b8e2a7
+Revises: 0a9b5c3e7d14
+Create Date: 2025-10-12 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '9d41c6b8e2a7'
+down_revision = '0a9b5c3e7d14'
+
+
+def upgrade() -> None:
+    op.drop_index('ix_events_google_event_id', table_name='events')
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.add_column(sa.Column('transparency', sa.String(length=16), nullable=False, server_default='opaque'))
+        batch_op.add_column(sa.Column('response_status', sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column('all_day', sa.Boolean(), nullable=False, server_default=sa.false()))
+        batch_op.create_unique_constraint('uq_events_user_google_event', ['discord_user_id', 'google_event_id'])
+    op.create_index('ix_events_google_event_id', 'events', ['google_event_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_google_event_id', table_name='events')
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.drop_constraint('uq_events_user_google_event', type_='unique')
+        batch_op.drop_column('all_day')
+        batch_op.drop_column('response_status')
+        batch_op.drop_column('transparency')
+    op.create_index('ix_events_google_event_id', 'events', ['google_event_id'], unique=True)
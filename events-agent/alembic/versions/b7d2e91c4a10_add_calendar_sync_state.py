@@ -0,0 +1,34 @@
+"""
+add calendar_sync_state table
+
+Revision ID: b7d2e91c4a10
+Revises: 59c458ed2bb7
+Create Date: 2025-10-01 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'b7d2e91c4a10'
+down_revision = '59c458ed2bb7'
+
+
+def upgrade() -> None:
+    op.create_table('calendar_sync_state',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('discord_user_id', sa.String(length=32), nullable=False),
+        sa.Column('calendar_id', sa.String(length=256), nullable=False),
+        sa.Column('sync_token', sa.Text(), nullable=True),
+        sa.Column('last_full_sync_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('discord_user_id', 'calendar_id', name='uq_sync_state_user_calendar')
+    )
+    op.create_index(op.f('ix_calendar_sync_state_discord_user_id'), 'calendar_sync_state', ['discord_user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_calendar_sync_state_discord_user_id'), table_name='calendar_sync_state')
+    op.drop_table('calendar_sync_state')
@@ -0,0 +1,32 @@
+"""
+add events.watch channel columns to calendar_sync_state
+
+Revision ID: c41f7a9e2d35
+Revises: b7d2e91c4a10
+Create Date: 2025-10-02 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'c41f7a9e2d35'
+down_revision = 'b7d2e91c4a10'
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('calendar_sync_state') as batch_op:
+        batch_op.add_column(sa.Column('channel_id', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('channel_resource_id', sa.String(length=256), nullable=True))
+        batch_op.add_column(sa.Column('channel_token', sa.String(length=128), nullable=True))
+        batch_op.add_column(sa.Column('channel_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(op.f('ix_calendar_sync_state_channel_id'), 'calendar_sync_state', ['channel_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_calendar_sync_state_channel_id'), table_name='calendar_sync_state')
+    with op.batch_alter_table('calendar_sync_state') as batch_op:
+        batch_op.drop_column('channel_expires_at')
+        batch_op.drop_column('channel_token')
+        batch_op.drop_column('channel_resource_id')
+        batch_op.drop_column('channel_id')
@@ -0,0 +1,46 @@
+"""
+add composite event indexes and partial unsent-reminder index
+
+Revision ID: d58e3b1f7c62
+Revises: c41f7a9e2d35
+Create Date: 2025-10-06 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'd58e3b1f7c62'
+down_revision = 'c41f7a9e2d35'
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking writes on large tables but cannot run inside a transaction.
+    concurrently = _is_postgres()
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_discord_user_id_start_time', 'events', ['discord_user_id', 'start_time'],
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            'ix_events_user_id_start_time', 'events', ['user_id', 'start_time'],
+            postgresql_concurrently=concurrently,
+        )
+        op.create_index(
+            'ix_reminders_unsent_remind_at', 'reminders', ['remind_at'],
+            postgresql_where=sa.text('sent = false'),
+            sqlite_where=sa.text('sent = 0'),
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade() -> None:
+    concurrently = _is_postgres()
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_reminders_unsent_remind_at', table_name='reminders', postgresql_concurrently=concurrently)
+        op.drop_index('ix_events_user_id_start_time', table_name='events', postgresql_concurrently=concurrently)
+        op.drop_index('ix_events_discord_user_id_start_time', table_name='events', postgresql_concurrently=concurrently)
@@ -0,0 +1,64 @@
+"""
+add normalized title hash to events for duplicate detection
+
+Revision ID: e13a6c94b2f8
+Revises: d58e3b1f7c62
+Create Date: 2025-10-07 09:00:00
+"""
+from __future__ import annotations
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'e13a6c94b2f8'
+down_revision = 'd58e3b1f7c62'
+
+BATCH_SIZE = 1000
+
+
+def _title_hash(title: str) -> str:
+    # Frozen copy of events_agent.domain.titles.title_hash so the migration does not drift with app code.
+    return hashlib.sha256(" ".join(title.casefold().split()).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.add_column(sa.Column('title_hash', sa.String(length=64), nullable=True))
+
+    events = sa.table(
+        'events',
+        sa.column('id', sa.Integer),
+        sa.column('title', sa.String),
+        sa.column('title_hash', sa.String),
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(events.c.id, events.c.title)
+            .where(events.c.id > last_id)
+            .order_by(events.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            events.update()
+            .where(events.c.id == sa.bindparam('row_id'))
+            .values(title_hash=sa.bindparam('hash')),
+            [{'row_id': row.id, 'hash': _title_hash(row.title or '')} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_events_discord_user_id_title_hash_start_time', 'events',
+        ['discord_user_id', 'title_hash', 'start_time'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_discord_user_id_title_hash_start_time', table_name='events')
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.drop_column('title_hash')
@@ -0,0 +1,26 @@
+"""
+add delivery lease columns to reminders
+
+Revision ID: f2c87d05a6e1
+Revises: e13a6c94b2f8
+Create Date: 2025-10-09 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'f2c87d05a6e1'
+down_revision = 'e13a6c94b2f8'
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('reminders') as batch_op:
+        batch_op.add_column(sa.Column('claimed_by', sa.String(length=128), nullable=True))
+        batch_op.add_column(sa.Column('claimed_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reminders') as batch_op:
+        batch_op.drop_column('claimed_until')
+        batch_op.drop_column('claimed_by')
@@ -1,103 +1,248 @@
 from __future__ import annotations
 
 import asyncio
+import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
-
-
-def _build_client(token: Dict[str, Any]):
-    creds = Credentials(
-        token=token.get("access_token"),
-        refresh_token=token.get("refresh_token"),
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=token.get("client_id"),
-        client_secret=token.get("client_secret"),
-        scopes=[
-            "openid",
-            "email",
-            "https://www.googleapis.com/auth/calendar",
-        ],
-    )
-    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+from googleapiclient.errors import HttpError
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception
+
+from ..domain.availability import RankedSlot, rank_common_slots
+from ..domain.slots import find_free_slots
+from ..infra.settings import settings
+from .gcal_http import async_transport, insert_retry, is_transient_error
+from .gcal_pool import client_pool, token_fingerprint
+
+
+def _use_async_transport() -> bool:
+    """True when calls should go through the asyncio-native httpx transport."""
+    return settings.gcal_transport == "httpx"
 
 
 @retry(
-    retry=retry_if_exception_type(Exception),
+    retry=retry_if_exception(is_transient_error),
     wait=wait_exponential_jitter(initial=0.5, max=5.0),
     stop=stop_after_attempt(4),
     reraise=True,
 )
-def _freebusy_sync(token: Dict[str, Any], time_min: str, time_max: str, calendar_id: str = "primary") -> Dict[str, Any]:
-    service = _build_client(token)
+def _freebusy_sync(token: Dict[str, Any], body: Dict[str, Any], user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.freebusy().query(body=body), user_key)
+
+
+async def freebusy_query(token: Dict[str, Any], body: Dict[str, Any], user_key: Optional[str] = None) -> Dict[str, Any]:
+    """Run a raw freebusy.query request body."""
+    if _use_async_transport():
+        return await async_transport.freebusy_query(token, body, user_key=user_key)
+    return await asyncio.to_thread(_freebusy_sync, token, body, user_key)
+
+
+async def get_freebusy(token: Dict[str, Any], time_min: str, time_max: str, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
     body = {"timeMin": time_min, "timeMax": time_max, "items": [{"id": calendar_id}]}
-    return service.freebusy().query(body=body).execute()
+    return await freebusy_query(token, body, user_key)
+
+
+@insert_retry
+def _create_event_sync(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.events().insert(calendarId=calendar_id, body=body), user_key)
+
+
+async def create_event(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Insert an event, safely retried on transient errors.
+
+    The event id is generated here, so when an attempt reached Google but its
+    response was lost, the retry gets 409 Conflict and the stored event is
+    returned instead of a duplicate being created.
+    """
+    body = {**body, "id": body.get("id") or new_event_id()}
+    try:
+        if _use_async_transport():
+            return await async_transport.insert_event(token, body, calendar_id, user_key=user_key)
+        return await asyncio.to_thread(_create_event_sync, token, body, calendar_id, user_key)
+    except HttpError as e:
+        if e.resp.status != 409:
+            raise
+        return await get_event(token, body["id"], calendar_id, user_key)
 
 
-async def get_freebusy(token: Dict[str, Any], time_min: str, time_max: str, calendar_id: str = "primary") -> Dict[str, Any]:
-    return await asyncio.to_thread(_freebusy_sync, token, time_min, time_max, calendar_id)
+def new_event_id() -> str:
+    """A client-side Calendar event id (base32hex characters, 5-1024 long)."""
+    return uuid.uuid4().hex
 
 
 @retry(
-    retry=retry_if_exception_type(Exception),
+    retry=retry_if_exception(is_transient_error),
     wait=wait_exponential_jitter(initial=0.5, max=5.0),
     stop=stop_after_attempt(4),
     reraise=True,
 )
-def _create_event_sync(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary") -> Dict[str, Any]:
-    service = _build_client(token)
-    return service.events().insert(calendarId=calendar_id, body=body).execute()
+def _list_events_sync(token: Dict[str, Any], params: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.events().list(calendarId=calendar_id, **params), user_key)
 
 
-async def create_event(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary") -> Dict[str, Any]:
-    return await asyncio.to_thread(_create_event_sync, token, body, calendar_id)
+async def list_events_raw(token: Dict[str, Any], params: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    """Run events.list with arbitrary query parameters (one page)."""
+    if _use_async_transport():
+        return await async_transport.list_events(token, calendar_id, user_key=user_key, **params)
+    return await asyncio.to_thread(_list_events_sync, token, params, calendar_id, user_key)
+
+
+async def list_events(token: Dict[str, Any], time_min: Optional[str] = None, max_results: int = 5, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    params: Dict[str, Any] = {"maxResults": max_results, "singleEvents": True, "orderBy": "startTime"}
+    if time_min:
+        params["timeMin"] = time_min
+    return await list_events_raw(token, params, calendar_id, user_key)
 
 
 @retry(
-    retry=retry_if_exception_type(Exception),
+    retry=retry_if_exception(is_transient_error),
     wait=wait_exponential_jitter(initial=0.5, max=5.0),
     stop=stop_after_attempt(4),
     reraise=True,
 )
-def _list_events_sync(token: Dict[str, Any], time_min: Optional[str] = None, max_results: int = 5, calendar_id: str = "primary") -> Dict[str, Any]:
-    service = _build_client(token)
-    kwargs: Dict[str, Any] = {"calendarId": calendar_id, "maxResults": max_results, "singleEvents": True, "orderBy": "startTime"}
-    if time_min:
-        kwargs["timeMin"] = time_min
-    return service.events().list(**kwargs).execute()
+def _get_event_sync(token: Dict[str, Any], event_id: str, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.events().get(calendarId=calendar_id, eventId=event_id), user_key)
 
 
-async def list_events(token: Dict[str, Any], time_min: Optional[str] = None, max_results: int = 5, calendar_id: str = "primary") -> Dict[str, Any]:
-    return await asyncio.to_thread(_list_events_sync, token, time_min, max_results, calendar_id)
+async def get_event(token: Dict[str, Any], event_id: str, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    if _use_async_transport():
+        return await async_transport.get_event(token, event_id, calendar_id, user_key=user_key)
+    return await asyncio.to_thread(_get_event_sync, token, event_id, calendar_id, user_key)
 
 
 @retry(
-    retry=retry_if_exception_type(Exception),
+    retry=retry_if_exception(is_transient_error),
     wait=wait_exponential_jitter(initial=0.5, max=5.0),
     stop=stop_after_attempt(4),
     reraise=True,
 )
-def _get_multiple_freebusy_sync(tokens: List[Dict[str, Any]], time_min: str, time_max: str) -> Dict[str, Any]:
-    """Get free/busy information for multiple users simultaneously."""
-    service = _build_client(tokens[0])  # Use first token for API calls
-    
-    # Build request body with all calendars
-    items = []
-    for token in tokens:
-        # Get user's email/calendar ID from token
-        calendar_id = token.get("calendar_id", "primary")
-        items.append({"id": calendar_id})
-    
-    body = {"timeMin": time_min, "timeMax": time_max, "items": items}
-    return service.freebusy().query(body=body).execute()
+def _patch_event_sync(token: Dict[str, Any], event_id: str, body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.events().patch(calendarId=calendar_id, eventId=event_id, body=body), user_key)
+
+
+async def patch_event(token: Dict[str, Any], event_id: str, body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    if _use_async_transport():
+        return await async_transport.patch_event(token, event_id, body, calendar_id, user_key=user_key)
+    return await asyncio.to_thread(_patch_event_sync, token, event_id, body, calendar_id, user_key)
+
+
+@retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_exponential_jitter(initial=0.5, max=5.0),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+def _delete_event_sync(token: Dict[str, Any], event_id: str, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.events().delete(calendarId=calendar_id, eventId=event_id), user_key) or {}
+
+
+async def delete_event(token: Dict[str, Any], event_id: str, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    if _use_async_transport():
+        return await async_transport.delete_event(token, event_id, calendar_id, user_key=user_key)
+    return await asyncio.to_thread(_delete_event_sync, token, event_id, calendar_id, user_key)
+
+
+@retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_exponential_jitter(initial=0.5, max=5.0),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+def _watch_events_sync(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.events().watch(calendarId=calendar_id, body=body), user_key)
+
+
+async def watch_events(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+    """Open an events.watch push notification channel."""
+    if _use_async_transport():
+        return await async_transport.watch_events(token, body, calendar_id, user_key=user_key)
+    return await asyncio.to_thread(_watch_events_sync, token, body, calendar_id, user_key)
+
+
+@retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_exponential_jitter(initial=0.5, max=5.0),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+def _stop_channel_sync(token: Dict[str, Any], body: Dict[str, Any], user_key: Optional[str] = None) -> Dict[str, Any]:
+    return client_pool.execute(token, lambda service: service.channels().stop(body=body), user_key) or {}
+
+
+async def stop_channel(token: Dict[str, Any], channel_id: str, resource_id: str, user_key: Optional[str] = None) -> Dict[str, Any]:
+    """Stop a push notification channel."""
+    body = {"id": channel_id, "resourceId": resource_id}
+    if _use_async_transport():
+        return await async_transport.stop_channel(token, body, user_key=user_key)
+    return await asyncio.to_thread(_stop_channel_sync, token, body, user_key)
+
+
+# Google rejects freebusy queries with more than 50 calendars.
+FREEBUSY_MAX_ITEMS = 50
 
 
-async def get_multiple_freebusy(tokens: List[Dict[str, Any]], time_min: str, time_max: str) -> Dict[str, Any]:
-    """Get free/busy information for multiple users."""
-    return await asyncio.to_thread(_get_multiple_freebusy_sync, tokens, time_min, time_max)
+async def get_multiple_freebusy(
+    tokens: List[Dict[str, Any]],
+    time_min: str,
+    time_max: str,
+    calendar_ids: Optional[List[str]] = None,
+    chunk_size: int = FREEBUSY_MAX_ITEMS,
+    max_concurrency: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Get free/busy information for multiple users.
+    
+    Every attendee's calendar is queried with that attendee's own token, so
+    it does not matter whether it is shared with anyone else. Results are
+    keyed by attendee (the token's ``attendee`` entry, else its ``email``),
+    never by calendar ID, so every attendee's "primary" stays distinct.
+    Extra ``calendar_ids`` (e.g. shared or resource calendars) are queried
+    with the first (organizer) token and keyed by calendar ID.
+    
+    Calendars that one credential can see go into the same request, e.g. the
+    organizer's own calendar and the extra calendars, so there is one request
+    per distinct credential, split into chunks of at most ``chunk_size``
+    calendars and run concurrently under a bounded semaphore. Calendars whose
+    request failed carry an ``errors`` list instead of busy periods.
+    """
+    # credential fingerprint -> (token, {requested calendar id: [result labels]})
+    groups: Dict[str, Tuple[Dict[str, Any], Dict[str, List[str]]]] = {}
+    
+    def _add(token: Dict[str, Any], calendar_id: str, label: str) -> None:
+        _, targets = groups.setdefault(token_fingerprint(token), (token, {}))
+        targets.setdefault(calendar_id, []).append(label)
+    
+    for index, token in enumerate(tokens):
+        label = token.get("attendee") or token.get("email") or f"attendee_{index}"
+        _add(token, token.get("calendar_id", "primary"), label)
+    if calendar_ids and tokens:
+        for calendar_id in calendar_ids:
+            _add(tokens[0], calendar_id, calendar_id)
+    
+    chunks = [
+        (token, list(targets.items())[i:i + chunk_size])
+        for token, targets in groups.values()
+        for i in range(0, len(targets), chunk_size)
+    ]
+    semaphore = asyncio.Semaphore(max_concurrency or settings.gcal_freebusy_concurrency)
+    
+    async def _query(token: Dict[str, Any], targets: List[Tuple[str, List[str]]]) -> Dict[str, Any]:
+        body = {"timeMin": time_min, "timeMax": time_max, "items": [{"id": cid} for cid, _ in targets]}
+        async with semaphore:
+            try:
+                response = await freebusy_query(token, body)
+            except Exception as e:
+                error = {"domain": "global", "reason": "requestFailed", "message": str(e)}
+                return {label: {"busy": [], "errors": [error]} for _, labels in targets for label in labels}
+        calendars = response.get("calendars", {})
+        not_found = {"busy": [], "errors": [{"domain": "global", "reason": "notFound"}]}
+        return {label: calendars.get(cid, not_found) for cid, labels in targets for label in labels}
+    
+    merged: Dict[str, Any] = {"kind": "calendar#freeBusy", "timeMin": time_min, "timeMax": time_max, "calendars": {}}
+    for calendars in await asyncio.gather(*(_query(token, targets) for token, targets in chunks)):
+        merged["calendars"].update(calendars)
+    return merged
 
 
 def find_optimal_time_slots(
@@ -120,8 +265,6 @@ def find_optimal_time_slots(
     Returns:
         List of (start_time, end_time) tuples for available slots
     """
-    available_slots = []
-    
     # Parse free/busy data
     calendars = freebusy_data.get("calendars", {})
     
@@ -134,39 +277,19 @@ def find_optimal_time_slots(
             end_time = datetime.fromisoformat(period["end"].replace("Z", "+00:00"))
             all_busy_periods.append((start_time, end_time))
     
-    # Sort busy periods by start time
-    all_busy_periods.sort(key=lambda x: x[0])
-    
     # Find time range to search
     time_min = datetime.fromisoformat(freebusy_data["timeMin"].replace("Z", "+00:00"))
     time_max = datetime.fromisoformat(freebusy_data["timeMax"].replace("Z", "+00:00"))
     
-    # Generate potential time slots
-    current_time = time_min
-    slot_duration = timedelta(minutes=duration_minutes)
-    buffer_duration = timedelta(minutes=buffer_minutes)
-    
-    while current_time + slot_duration <= time_max:
-        # Check if this time slot is within preferred hours
-        if preferred_start_hour <= current_time.hour < preferred_end_hour:
-            slot_end = current_time + slot_duration
-            
-            # Check for conflicts with busy periods
-            has_conflict = False
-            for busy_start, busy_end in all_busy_periods:
-                # Check if there's any overlap (with buffer)
-                if (current_time - buffer_duration < busy_end and 
-                    slot_end + buffer_duration > busy_start):
-                    has_conflict = True
-                    break
-            
-            if not has_conflict:
-                available_slots.append((current_time, slot_end))
-        
-        # Move to next potential slot (30-minute increments)
-        current_time += timedelta(minutes=30)
-    
-    return available_slots[:10]  # Return top 10 slots
+    return find_free_slots(
+        all_busy_periods,
+        time_min,
+        time_max,
+        timedelta(minutes=duration_minutes),
+        buffer=timedelta(minutes=buffer_minutes),
+        working_hours=(preferred_start_hour, preferred_end_hour),
+        limit=10,
+    )
 
 
 async def suggest_meeting_times(
@@ -222,21 +345,96 @@ async def suggest_meeting_times(
     return suggestions
 
 
-@retry(
-    retry=retry_if_exception_type(Exception),
-    wait=wait_exponential_jitter(initial=0.5, max=5.0),
-    stop=stop_after_attempt(4),
-    reraise=True,
-)
-def _create_recurring_event_sync(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary") -> Dict[str, Any]:
-    """Create a recurring event with RRULE."""
-    service = _build_client(token)
-    return service.events().insert(calendarId=calendar_id, body=body).execute()
+def rank_meeting_times(
+    freebusy_data: Dict[str, Any],
+    duration_minutes: int = 60,
+    preferred_start_hour: int = 9,
+    preferred_end_hour: int = 17,
+    min_attendees: Optional[int] = None,
+    slot_minutes: int = 15,
+    limit: int = 10
+) -> List[RankedSlot]:
+    """
+    Rank meeting slots by how many calendars are free, using availability bitmaps.
+    
+    Calendars that came back with errors are left out rather than counted as free.
+    With ``min_attendees`` unset only slots where everyone is free are returned.
+    """
+    busy_by_calendar: Dict[str, List[Tuple[datetime, datetime]]] = {}
+    for calendar_id, calendar_data in freebusy_data.get("calendars", {}).items():
+        if calendar_data.get("errors"):
+            continue
+        busy_by_calendar[calendar_id] = [
+            (
+                datetime.fromisoformat(period["start"].replace("Z", "+00:00")),
+                datetime.fromisoformat(period["end"].replace("Z", "+00:00")),
+            )
+            for period in calendar_data.get("busy", [])
+        ]
+    
+    time_min = datetime.fromisoformat(freebusy_data["timeMin"].replace("Z", "+00:00"))
+    time_max = datetime.fromisoformat(freebusy_data["timeMax"].replace("Z", "+00:00"))
+    
+    return rank_common_slots(
+        busy_by_calendar,
+        time_min,
+        time_max,
+        duration_minutes,
+        slot_minutes=slot_minutes,
+        working_hours=(preferred_start_hour, preferred_end_hour),
+        min_free=min_attendees,
+        limit=limit,
+    )
+
+
+async def suggest_quorum_meeting_times(
+    organizer_token: Dict[str, Any],
+    attendee_tokens: List[Dict[str, Any]],
+    duration_minutes: int = 60,
+    days_ahead: int = 7,
+    preferred_start_hour: int = 9,
+    preferred_end_hour: int = 17,
+    min_attendees: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Suggest the meeting times that suit the most attendees.
+    
+    Unlike ``suggest_meeting_times`` this scales to large groups and also
+    returns slots where only a quorum (``min_attendees``) is free.
+    """
+    now = datetime.utcnow()
+    time_min = now.isoformat() + "Z"
+    time_max = (now + timedelta(days=days_ahead)).isoformat() + "Z"
+    
+    all_tokens = [organizer_token] + attendee_tokens
+    freebusy_data = await get_multiple_freebusy(all_tokens, time_min, time_max)
+    
+    slots = rank_meeting_times(
+        freebusy_data,
+        duration_minutes,
+        preferred_start_hour,
+        preferred_end_hour,
+        min_attendees=min_attendees
+    )
+    
+    return [
+        {
+            "start_time": slot.start.isoformat(),
+            "end_time": slot.end.isoformat(),
+            "duration_minutes": duration_minutes,
+            "available_count": slot.free_count,
+            "total_attendees": slot.total,
+            "available_attendees": list(slot.free_attendees),
+            "available_for_all": slot.free_count == slot.total,
+            "timezone": "UTC"
+        }
+        for slot in slots
+    ]
 
 
 async def create_recurring_event(token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary") -> Dict[str, Any]:
     """Create a recurring event."""
-    return await asyncio.to_thread(_create_recurring_event_sync, token, body, calendar_id)
+    return await create_event(token, body, calendar_id)
 
 
 def build_rrule(frequency: str, interval: int = 1, count: Optional[int] = None, until: Optional[str] = None, byday: Optional[List[str]] = None) -> str:
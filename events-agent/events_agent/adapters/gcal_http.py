@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import quote
+
+import httplib2
+import httpx
+from googleapiclient.errors import HttpError
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception
+
+from ..infra.logging import get_logger
+from ..infra.settings import settings
+
+
+logger = get_logger().bind(service="gcal_http")
+
+# Google access tokens live for an hour; used when the token endpoint omits expires_in.
+DEFAULT_ACCESS_TOKEN_LIFETIME_SECONDS = 3600
+
+# Called with (user_key, refreshed token) after a 401 forced an inline refresh.
+TokenSaver = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    """True for failures worth retrying: rate limiting, Google 5xx and transport errors (both transports)."""
+    if isinstance(exc, HttpError):
+        return exc.resp.status == 429 or exc.resp.status >= 500
+    return isinstance(exc, (httpx.TransportError, httplib2.HttpLib2Error, OSError))
+
+
+_gcal_retry = retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_exponential_jitter(initial=0.5, max=5.0),
+    stop=stop_after_attempt(4),
+    reraise=True,
+)
+
+# events.insert runs inside interactive commands: fewer, shorter retries. Callers
+# must send a client-generated event id so a retried insert cannot duplicate.
+insert_retry = retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_exponential_jitter(initial=0.25, max=1.0),
+    stop=stop_after_attempt(3),
+    reraise=True,
+)
+
+
+class AsyncCalendarTransport:
+    """
+    asyncio-native Google Calendar v3 transport.
+
+    Talks to the REST API directly over a shared ``httpx.AsyncClient`` so calls
+    reuse keep-alive connections and never occupy a worker thread. Errors are
+    raised as ``googleapiclient.errors.HttpError`` so callers handle both
+    transports the same way. When a 401 forces an inline token refresh, the
+    new token is handed to ``on_token_refreshed`` so it can be stored.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        token_uri: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        on_token_refreshed: Optional[TokenSaver] = None,
+    ):
+        self.base_url = (base_url or settings.gcal_api_base_url).rstrip("/")
+        self.token_uri = token_uri or settings.google_token_uri
+        self._limits = httpx.Limits(
+            max_connections=max_connections or settings.gcal_http_max_connections,
+            max_keepalive_connections=max_keepalive_connections or settings.gcal_http_max_keepalive,
+        )
+        self._timeout = httpx.Timeout(timeout_seconds or settings.gcal_http_timeout_seconds)
+        self._http: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.on_token_refreshed = on_token_refreshed
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(limits=self._limits, timeout=self._timeout)
+        return self._http
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        # Callers beyond the pool size queue here: httpcore slows down sharply
+        # with hundreds of requests waiting inside the pool itself.
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._limits.max_connections)
+        return self._slots
+
+    async def aclose(self) -> None:
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+        self._http = None
+        self._slots = None
+
+    @insert_retry
+    async def insert_event(self, token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request(token, "POST", f"/calendars/{_q(calendar_id)}/events", json=body, user_key=user_key)
+
+    @_gcal_retry
+    async def list_events(self, token: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+        return await self._request(token, "GET", f"/calendars/{_q(calendar_id)}/events", params=params, user_key=user_key)
+
+    @_gcal_retry
+    async def get_event(self, token: Dict[str, Any], event_id: str, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request(token, "GET", f"/calendars/{_q(calendar_id)}/events/{_q(event_id)}", user_key=user_key)
+
+    @_gcal_retry
+    async def patch_event(self, token: Dict[str, Any], event_id: str, body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request(token, "PATCH", f"/calendars/{_q(calendar_id)}/events/{_q(event_id)}", json=body, user_key=user_key)
+
+    @_gcal_retry
+    async def delete_event(self, token: Dict[str, Any], event_id: str, calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request(token, "DELETE", f"/calendars/{_q(calendar_id)}/events/{_q(event_id)}", user_key=user_key)
+
+    @_gcal_retry
+    async def watch_events(self, token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request(token, "POST", f"/calendars/{_q(calendar_id)}/events/watch", json=body, user_key=user_key)
+
+    @_gcal_retry
+    async def stop_channel(self, token: Dict[str, Any], body: Dict[str, Any], user_key: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request(token, "POST", "/channels/stop", json=body, user_key=user_key)
+
+    @_gcal_retry
+    async def freebusy_query(self, token: Dict[str, Any], body: Dict[str, Any], user_key: Optional[str] = None) -> Dict[str, Any]:
+        return await self._request(token, "POST", "/freeBusy", json=body, user_key=user_key)
+
+    async def _request(
+        self,
+        token: Dict[str, Any],
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        user_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        url = f"{self.base_url}{path}"
+        params = {k: _param(v) for k, v in (params or {}).items() if v is not None}
+        http = self.http
+        async with self.slots:
+            response = await http.request(method, url, params=params, json=json, headers=_auth(token))
+            if response.status_code == 401 and token.get("refresh_token"):
+                # Same behaviour as google-auth: refresh once, then replay the call.
+                await self._refresh(token, user_key)
+                response = await http.request(method, url, params=params, json=json, headers=_auth(token))
+        if response.status_code >= 400:
+            raise _http_error(response)
+        if response.status_code == 204 or not response.content:
+            return {}
+        return response.json()
+
+    async def refresh_access_token(self, token: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Exchange the refresh token for a new access token.
+
+        Returns a copy of ``token`` with the new ``access_token``, its
+        ``expiry`` (ISO-8601 UTC) and any rotated ``refresh_token``.
+        """
+        response = await self.http.post(
+            self.token_uri,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": token.get("refresh_token"),
+                "client_id": token.get("client_id"),
+                "client_secret": token.get("client_secret"),
+            },
+        )
+        if response.status_code >= 400:
+            raise _http_error(response)
+        payload = response.json()
+        refreshed = {**token, "access_token": payload["access_token"]}
+        # Always record an expiry, so the token is not treated as expiry-less and refreshed on every run.
+        lifetime = int(payload.get("expires_in") or DEFAULT_ACCESS_TOKEN_LIFETIME_SECONDS)
+        refreshed["expiry"] = (datetime.now(timezone.utc) + timedelta(seconds=lifetime)).isoformat()
+        if payload.get("refresh_token"):
+            refreshed["refresh_token"] = payload["refresh_token"]
+        return refreshed
+
+    async def _refresh(self, token: Dict[str, Any], user_key: Optional[str]) -> None:
+        token.update(await self.refresh_access_token(token))
+        logger.info("gcal_access_token_refreshed", user_key=user_key)
+        if user_key and self.on_token_refreshed:
+            # Without this every later call would start from the stale token and refresh again.
+            try:
+                await self.on_token_refreshed(user_key, dict(token))
+            except Exception as e:
+                logger.warning("gcal_refreshed_token_save_failed", user_key=user_key, error=str(e))
+
+
+def _q(value: str) -> str:
+    return quote(value, safe="")
+
+
+def _param(value: Any) -> Any:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return value
+
+
+def _auth(token: Dict[str, Any]) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token.get('access_token')}"}
+
+
+def _http_error(response: httpx.Response) -> HttpError:
+    resp = httplib2.Response({"status": str(response.status_code), "reason": response.reason_phrase})
+    return HttpError(resp, response.content, uri=str(response.request.url))
+
+
+async_transport = AsyncCalendarTransport()
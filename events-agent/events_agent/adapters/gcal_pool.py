@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from ..infra.logging import get_logger
+from ..infra.settings import settings
+
+
+logger = get_logger().bind(service="gcal_pool")
+
+SCOPES = [
+    "openid",
+    "email",
+    "https://www.googleapis.com/auth/calendar",
+]
+
+
+def build_calendar_client(token: Dict[str, Any]) -> Any:
+    """Build a Google Calendar v3 resource from a stored token dict."""
+    creds = Credentials(
+        token=token.get("access_token"),
+        refresh_token=token.get("refresh_token"),
+        token_uri=settings.google_token_uri,
+        client_id=token.get("client_id"),
+        client_secret=token.get("client_secret"),
+        scopes=SCOPES,
+        expiry=token_expiry(token, naive=True),
+    )
+    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+
+
+def token_expiry(token: Dict[str, Any], naive: bool = False) -> Optional[datetime]:
+    """
+    The access token's expiry from the stored ``expiry`` field, in UTC.
+
+    ``naive=True`` drops the tzinfo, which is what google-auth ``Credentials`` expects.
+    """
+    if not token.get("expiry"):
+        return None
+    try:
+        expiry = datetime.fromisoformat(str(token["expiry"]).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    expiry = expiry.astimezone(timezone.utc) if expiry.tzinfo else expiry.replace(tzinfo=timezone.utc)
+    return expiry.replace(tzinfo=None) if naive else expiry
+
+
+def token_fingerprint(token: Dict[str, Any]) -> str:
+    """Stable digest identifying a token; changes whenever the token is re-issued."""
+    material = "\x1f".join(
+        str(token.get(k) or "") for k in ("client_id", "refresh_token", "access_token")
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _PoolEntry:
+    user_key: Optional[str]
+    idle: List[Any] = field(default_factory=list)
+    in_use: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class CalendarClientPool:
+    """
+    Per-user pool of Google Calendar clients.
+
+    Building a client parses the discovery document and creates a resource tree,
+    so clients are reused across calls. Each client owns an httplib2 connection,
+    which is not thread-safe, so a client is checked out by exactly one worker
+    thread at a time; concurrent calls for the same user get extra clients, of
+    which at most ``max_idle_per_key`` are kept.
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 256,
+        max_idle_per_key: int = 4,
+        idle_ttl_seconds: float = 900.0,
+        factory: Callable[[Dict[str, Any]], Any] = build_calendar_client,
+    ):
+        self.max_keys = max_keys
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_ttl = idle_ttl_seconds
+        self._factory = factory
+        self._entries: "OrderedDict[str, _PoolEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def client(self, token: Dict[str, Any], user_key: Optional[str] = None) -> Iterator[Any]:
+        """Check out a client for ``token``; it is returned to the pool on exit."""
+        key = token_fingerprint(token)
+        service = self._checkout(key, user_key)
+        if service is None:
+            service = self._factory(token)
+        try:
+            yield service
+        finally:
+            self._checkin(key, service)
+
+    def execute(
+        self,
+        token: Dict[str, Any],
+        make_request: Callable[[Any], Any],
+        user_key: Optional[str] = None,
+    ) -> Any:
+        """Build a request with a pooled client and execute it (blocking)."""
+        with self.client(token, user_key) as service:
+            return make_request(service).execute()
+
+    def invalidate(self, user_key: str) -> int:
+        """Drop every pooled client belonging to ``user_key``."""
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if e.user_key == user_key]
+            for k in stale:
+                del self._entries[k]
+        if stale:
+            logger.info("gcal_clients_invalidated", user_key=user_key, count=len(stale))
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _checkout(self, key: str, user_key: Optional[str]) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire_locked(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PoolEntry(user_key=user_key)
+                self._entries[key] = entry
+                self._evict_locked()
+            elif user_key and entry.user_key is None:
+                entry.user_key = user_key
+            self._entries.move_to_end(key)
+            entry.in_use += 1
+            entry.last_used = now
+            return entry.idle.pop() if entry.idle else None
+
+    def _checkin(self, key: str, service: Any) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # Invalidated or evicted while checked out; let it be collected.
+                return
+            entry.in_use = max(0, entry.in_use - 1)
+            entry.last_used = time.monotonic()
+            if len(entry.idle) < self.max_idle_per_key:
+                entry.idle.append(service)
+
+    def _expire_locked(self, now: float) -> None:
+        expired = [
+            k for k, e in self._entries.items()
+            if e.in_use == 0 and now - e.last_used > self.idle_ttl
+        ]
+        for k in expired:
+            del self._entries[k]
+
+    def _evict_locked(self) -> None:
+        while len(self._entries) > self.max_keys:
+            victim: Optional[Tuple[str, _PoolEntry]] = None
+            for k, e in self._entries.items():
+                if e.in_use == 0:
+                    victim = (k, e)
+                    break
+            if victim is None:
+                return
+            del self._entries[victim[0]]
+
+
+client_pool = CalendarClientPool(
+    max_keys=settings.gcal_pool_max_users,
+    max_idle_per_key=settings.gcal_pool_max_idle_per_user,
+    idle_ttl_seconds=settings.gcal_pool_idle_ttl_seconds,
+)
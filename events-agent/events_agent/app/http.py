@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+from typing import Any, Optional
+
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
@@ -19,8 +21,9 @@ logger = get_logger().bind(service="http")
 # metrics provided by infra.metrics
 
 
-def create_app() -> FastAPI:
+def create_app(channel_manager: Optional[Any] = None) -> FastAPI:
     app = FastAPI(title="Events Agent")
+    app.state.channel_manager = channel_manager
 
     @app.middleware("http")
     async def add_request_id(request: Request, call_next):
@@ -47,6 +50,15 @@ def create_app() -> FastAPI:
         content = generate_latest(registry)
         return Response(content=content, media_type=CONTENT_TYPE_LATEST)
 
+    @app.post("/webhooks/google/calendar")
+    async def google_calendar_webhook(request: Request) -> Response:
+        """Receive Google Calendar push notifications (events.watch)."""
+        manager = request.app.state.channel_manager
+        if manager is None:
+            return Response(status_code=503)
+        accepted = await manager.handle_notification(request.headers)
+        return Response(status_code=200 if accepted else 403)
+
     @app.get("/auth/success")
     async def auth_success() -> FileResponse:
         """Serve the auth success page for handling OAuth tokens"""
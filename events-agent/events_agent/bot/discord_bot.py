@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import re
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 
@@ -19,9 +20,20 @@ from ..domain.models import User, Event, Reminder
 from sqlalchemy import select, update, insert
 from ..infra.metrics import events_created_total
 from ..infra.rate_limit import check_rate_limit
+from .outbound import Lane, outbound
 
 logger = get_logger().bind(service="discord")
 
+# Discord user mentions in free-text command options, e.g. "<@123>" or "<@!123>".
+MENTION_PATTERN = re.compile(r"<@!?(\d+)>")
+
+
+async def _followup(interaction: discord.Interaction, *args: Any, **kwargs: Any) -> Any:
+    """Send an interaction followup through the outbound queue, ahead of queued reminders."""
+    return await outbound.send(
+        f"webhook:{interaction.id}", Lane.INTERACTIVE, lambda: interaction.followup.send(*args, **kwargs)
+    )
+
 
 class DiscordClient(discord.Client):
     def __init__(self, *, intents: discord.Intents) -> None:
@@ -93,7 +105,7 @@ def build_bot() -> DiscordClient:
                 try:
                     start_dt, end_dt = parse_natural_range(when, tz)
                 except Exception as e:
-                    await interaction.followup.send(
+                    await _followup(interaction,
                         f"❌ Sorry, I couldn't parse the time '{when}'. Try formats like:\n"
                         f"• 'tomorrow 3pm'\n"
                         f"• 'next Monday 2-4pm'\n"
@@ -161,15 +173,16 @@ def build_bot() -> DiscordClient:
                     description=description,
                     location=location,
                     attendees=attendee_list,
-                    reminder_minutes=reminder_minutes
+                    reminder_minutes=reminder_minutes,
+                    guild_id=str(interaction.guild_id) if interaction.guild_id else None
                 )
                 
-                await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+                await _followup(interaction, embed=embed, view=view, ephemeral=True)
                 break
                 
         except Exception as e:
             logger.error("addevent_command_error", error=str(e))
-            await interaction.followup.send(
+            await _followup(interaction,
                 f"❌ An error occurred while creating the event: {str(e)}", 
                 ephemeral=True
             )
@@ -189,47 +202,26 @@ def build_bot() -> DiscordClient:
                 reminder_repo = ReminderRepository(session)
                 calendar_service = GoogleCalendarService(user_repo, event_repo, reminder_repo)
                 
-                result = await calendar_service.list_events(str(interaction.user.id), limit)
+                limit = max(1, min(limit, 10))
+                result = await calendar_service.list_events_page(str(interaction.user.id), limit)
                 
                 if not result["success"]:
-                    await interaction.followup.send(f"❌ {result['message']}", ephemeral=True)
+                    await _followup(interaction, f"❌ {result['message']}", ephemeral=True)
                     return
                 
                 events = result.get("events", [])
                 if not events:
-                    await interaction.followup.send("📅 No upcoming events found.", ephemeral=True)
+                    await _followup(interaction, "📅 No upcoming events found.", ephemeral=True)
                     return
                 
-                embed = discord.Embed(
-                    title=f"📅 Your Upcoming Events ({len(events)})",
-                    color=0x00ff00
-                )
-                
-                for i, event in enumerate(events, 1):
-                    start_time = datetime.fromisoformat(event["start_time"])
-                    end_time = datetime.fromisoformat(event["end_time"])
-                    
-                    event_text = f"**{event['title']}**\n"
-                    event_text += f"🕐 {start_time.strftime('%A, %B %d at %I:%M %p')} - {end_time.strftime('%I:%M %p')}\n"
-                    
-                    if event.get("location"):
-                        event_text += f"📍 {event['location']}\n"
-                    if event.get("description"):
-                        desc = event["description"][:100] + "..." if len(event["description"]) > 100 else event["description"]
-                        event_text += f"📄 {desc}\n"
-                    
-                    embed.add_field(
-                        name=f"{i}. {event['title']}", 
-                        value=event_text, 
-                        inline=False
-                    )
-                
-                await interaction.followup.send(embed=embed, ephemeral=True)
+                view = EventPagesView(str(interaction.user.id), limit)
+                view.update(result)
+                await _followup(interaction, embed=build_events_embed(events, view.page), view=view, ephemeral=True)
                 break
                 
         except Exception as e:
             logger.error("myevents_command_error", error=str(e))
-            await interaction.followup.send(
+            await _followup(interaction,
                 f"❌ An error occurred while listing events: {str(e)}", 
                 ephemeral=True
             )
@@ -245,7 +237,7 @@ def build_bot() -> DiscordClient:
             try:
                 pytz.timezone(timezone)
             except pytz.exceptions.UnknownTimeZoneError:
-                await interaction.followup.send(
+                await _followup(interaction,
                     f"❌ Invalid timezone '{timezone}'. Please use a valid timezone like:\n"
                     f"• 'Australia/Melbourne'\n"
                     f"• 'America/New_York'\n"
@@ -261,12 +253,12 @@ def build_bot() -> DiscordClient:
                 success = await user_repo.update_user_timezone(str(interaction.user.id), timezone)
                 
                 if success:
-                    await interaction.followup.send(
+                    await _followup(interaction,
                         f"✅ Timezone set to **{timezone}** successfully!", 
                         ephemeral=True
                     )
                 else:
-                    await interaction.followup.send(
+                    await _followup(interaction,
                         "❌ Failed to update timezone. Please try again.", 
                         ephemeral=True
                     )
@@ -274,7 +266,7 @@ def build_bot() -> DiscordClient:
                 
         except Exception as e:
             logger.error("set_tz_command_error", error=str(e))
-            await interaction.followup.send(
+            await _followup(interaction,
                 f"❌ An error occurred while setting timezone: {str(e)}", 
                 ephemeral=True
             )
@@ -284,8 +276,10 @@ def build_bot() -> DiscordClient:
         interaction: discord.Interaction,
         duration_minutes: int = 60,
         days_ahead: int = 7,
+        attendees: Optional[str] = None,
+        min_attendees: Optional[int] = None,
     ) -> None:
-        """Suggest optimal meeting times."""
+        """Suggest optimal meeting times, optionally for a group of @mentioned attendees."""
         await interaction.response.defer(ephemeral=True)
         
         try:
@@ -296,16 +290,18 @@ def build_bot() -> DiscordClient:
                 calendar_service = GoogleCalendarService(user_repo, event_repo, reminder_repo)
                 
                 result = await calendar_service.suggest_meeting_times(
-                    str(interaction.user.id), duration_minutes, days_ahead
+                    str(interaction.user.id), duration_minutes, days_ahead,
+                    attendee_discord_ids=MENTION_PATTERN.findall(attendees or ""),
+                    min_attendees=min_attendees
                 )
                 
                 if not result["success"]:
-                    await interaction.followup.send(f"❌ {result['message']}", ephemeral=True)
+                    await _followup(interaction, f"❌ {result['message']}", ephemeral=True)
                     return
                 
                 suggestions = result.get("suggestions", [])
                 if not suggestions:
-                    await interaction.followup.send(
+                    await _followup(interaction,
                         f"❌ No available time slots found in the next {days_ahead} days.", 
                         ephemeral=True
                     )
@@ -321,9 +317,20 @@ def build_bot() -> DiscordClient:
                     start_time = datetime.fromisoformat(suggestion["start_time"])
                     end_time = datetime.fromisoformat(suggestion["end_time"])
                     
+                    value = f"🕐 {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}"
+                    if "total_attendees" in suggestion:
+                        value += f"\n👥 {suggestion['available_count']}/{suggestion['total_attendees']} free"
                     embed.add_field(
                         name=f"{i}. {start_time.strftime('%A, %B %d')}",
-                        value=f"🕐 {start_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}",
+                        value=value,
+                        inline=False
+                    )
+                
+                if result.get("not_connected"):
+                    embed.add_field(
+                        name="⚠️ Not included",
+                        value=" ".join(f"<@{user_id}>" for user_id in result["not_connected"])
+                        + " not connected to Google Calendar",
                         inline=False
                     )
                 
@@ -333,12 +340,12 @@ def build_bot() -> DiscordClient:
                     inline=False
                 )
                 
-                await interaction.followup.send(embed=embed, ephemeral=True)
+                await _followup(interaction, embed=embed, ephemeral=True)
                 break
                 
         except Exception as e:
             logger.error("suggest_command_error", error=str(e))
-            await interaction.followup.send(
+            await _followup(interaction,
                 f"❌ An error occurred while suggesting times: {str(e)}", 
                 ephemeral=True
             )
@@ -346,6 +353,90 @@ def build_bot() -> DiscordClient:
     return client
 
 
+def build_events_embed(events: list, page: int = 1) -> discord.Embed:
+    """Render one page of events from ``GoogleCalendarService`` listings."""
+    embed = discord.Embed(
+        title=f"📅 Your Upcoming Events (page {page})",
+        color=0x00ff00
+    )
+    
+    for i, event in enumerate(events, 1):
+        start_time = datetime.fromisoformat(event["start_time"])
+        end_time = datetime.fromisoformat(event["end_time"])
+        
+        event_text = f"**{event['title']}**\n"
+        event_text += f"🕐 {start_time.strftime('%A, %B %d at %I:%M %p')} - {end_time.strftime('%I:%M %p')}\n"
+        
+        if event.get("location"):
+            event_text += f"📍 {event['location']}\n"
+        if event.get("description"):
+            desc = event["description"][:100] + "..." if len(event["description"]) > 100 else event["description"]
+            event_text += f"📄 {desc}\n"
+        
+        embed.add_field(
+            name=f"{i}. {event['title']}", 
+            value=event_text, 
+            inline=False
+        )
+    
+    return embed
+
+
+class EventPagesView(discord.ui.View):
+    """Prev/Next navigation for /myevents; each click fetches one keyset page."""
+    
+    def __init__(self, user_id: str, limit: int):
+        super().__init__(timeout=300)  # 5 minutes timeout
+        self.user_id = user_id
+        self.limit = limit
+        self.page = 1
+        self.next_cursor: Optional[str] = None
+        self.prev_cursor: Optional[str] = None
+    
+    def update(self, result: Dict[str, Any]) -> None:
+        self.next_cursor = result.get("next_cursor")
+        self.prev_cursor = result.get("prev_cursor")
+        self.prev_button.disabled = self.prev_cursor is None
+        self.next_button.disabled = self.next_cursor is None
+    
+    async def _show(self, interaction: discord.Interaction, after: Optional[str], before: Optional[str], step: int) -> None:
+        if str(interaction.user.id) != self.user_id:
+            await interaction.response.send_message("❌ These aren't your events.", ephemeral=True)
+            return
+        
+        try:
+            async for session in session_scope():
+                calendar_service = GoogleCalendarService(
+                    UserRepository(session), EventRepository(session), ReminderRepository(session)
+                )
+                result = await calendar_service.list_events_page(self.user_id, self.limit, after=after, before=before)
+                break
+            
+            if not result["success"] or not result.get("events"):
+                await interaction.response.send_message(
+                    f"❌ {result['message']}" if not result["success"] else "📅 No more events.",
+                    ephemeral=True
+                )
+                return
+            
+            self.page += step
+            self.update(result)
+            await interaction.response.edit_message(embed=build_events_embed(result["events"], self.page), view=self)
+        except Exception as e:
+            logger.error("event_pages_error", error=str(e))
+            await interaction.response.send_message(f"❌ An error occurred while listing events: {str(e)}", ephemeral=True)
+    
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary, disabled=True)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the previous page."""
+        await self._show(interaction, None, self.prev_cursor, -1)
+    
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Show the next page."""
+        await self._show(interaction, self.next_cursor, None, 1)
+
+
 class EventConfirmationView(discord.ui.View):
     """View for event confirmation with buttons."""
     
@@ -359,7 +450,8 @@ class EventConfirmationView(discord.ui.View):
         description: Optional[str],
         location: Optional[str],
         attendees: list,
-        reminder_minutes: Optional[int]
+        reminder_minutes: Optional[int],
+        guild_id: Optional[str] = None
     ):
         super().__init__(timeout=300)  # 5 minutes timeout
         self.calendar_service = calendar_service
@@ -371,6 +463,7 @@ class EventConfirmationView(discord.ui.View):
         self.location = location
         self.attendees = attendees
         self.reminder_minutes = reminder_minutes
+        self.guild_id = guild_id
 
     @discord.ui.button(label="✅ Confirm", style=discord.ButtonStyle.green)
     async def confirm_button(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -386,7 +479,8 @@ class EventConfirmationView(discord.ui.View):
                 description=self.description,
                 location=self.location,
                 attendees=self.attendees,
-                reminder_minutes=self.reminder_minutes
+                reminder_minutes=self.reminder_minutes,
+                guild_id=self.guild_id
             )
             
             if result["success"]:
@@ -411,14 +505,14 @@ class EventConfirmationView(discord.ui.View):
                         inline=False
                     )
                 
-                await interaction.followup.send(embed=embed, ephemeral=True)
+                await _followup(interaction, embed=embed, ephemeral=True)
                 events_created_total.inc()
             else:
-                await interaction.followup.send(f"❌ {result['message']}", ephemeral=True)
+                await _followup(interaction, f"❌ {result['message']}", ephemeral=True)
                 
         except Exception as e:
             logger.error("confirm_button_error", error=str(e))
-            await interaction.followup.send(
+            await _followup(interaction,
                 f"❌ An error occurred while creating the event: {str(e)}", 
                 ephemeral=True
             )
@@ -439,7 +533,7 @@ class EventConfirmationView(discord.ui.View):
             color=0xff0000
         )
         
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await _followup(interaction, embed=embed, ephemeral=True)
         
         # Disable all buttons
         for item in self.children:
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import discord
+
+from ..infra.logging import get_logger
+from ..infra.metrics import dm_cache_requests_total
+from ..infra.settings import settings
+
+logger = get_logger().bind(service="dm_cache")
+
+
+class DMChannelCache:
+    """
+    Bounded LRU cache of DM channels for reminder delivery.
+
+    Resolving a DM normally costs a ``fetch_user`` and a ``create_dm`` REST
+    call. A cached channel costs neither; on a miss the user object comes
+    from ``client.get_user`` (the gateway cache) before falling back to
+    ``fetch_user``, and concurrent misses for one user share a single lookup.
+    Users whose DMs are closed (``discord.Forbidden``) are remembered for
+    ``forbidden_ttl_seconds`` so they are skipped instead of retried; that
+    list is bounded by ``max_entries`` as well, oldest entry first.
+    """
+
+    def __init__(self, max_entries: int = 2048, forbidden_ttl_seconds: float = 86400.0):
+        self.max_entries = max_entries
+        self.forbidden_ttl = forbidden_ttl_seconds
+        self._channels: "OrderedDict[int, discord.DMChannel]" = OrderedDict()
+        self._forbidden: "OrderedDict[int, float]" = OrderedDict()
+        self._inflight: Dict[int, asyncio.Future] = {}
+
+    async def get_channel(self, client: discord.Client, user_id: int) -> Optional[discord.DMChannel]:
+        """DM channel for ``user_id``, or None if the user is known to refuse DMs."""
+        if self.is_forbidden(user_id):
+            dm_cache_requests_total.labels(result="forbidden").inc()
+            return None
+
+        channel = self._channels.get(user_id)
+        if channel is not None:
+            self._channels.move_to_end(user_id)
+            dm_cache_requests_total.labels(result="hit").inc()
+            return channel
+
+        future = self._inflight.get(user_id)
+        if future is not None:
+            dm_cache_requests_total.labels(result="coalesced").inc()
+            return await asyncio.shield(future)
+
+        dm_cache_requests_total.labels(result="miss").inc()
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        try:
+            channel = await self._open(client, user_id)
+            self._put(user_id, channel)
+            future.set_result(channel)
+            return channel
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future does not log "exception never retrieved".
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(user_id, None)
+
+    def mark_forbidden(self, user_id: int) -> None:
+        """Remember that ``user_id`` rejected a DM, and drop their cached channel."""
+        self._forbidden[user_id] = time.monotonic() + self.forbidden_ttl
+        # Every entry has the same TTL, so insertion order is expiry order.
+        self._forbidden.move_to_end(user_id)
+        while len(self._forbidden) > self.max_entries:
+            self._forbidden.popitem(last=False)
+        self._channels.pop(user_id, None)
+        logger.info("dm_forbidden_cached", user_id=user_id, ttl_seconds=self.forbidden_ttl)
+
+    def is_forbidden(self, user_id: int) -> bool:
+        expires_at = self._forbidden.get(user_id)
+        if expires_at is None:
+            return False
+        if expires_at <= time.monotonic():
+            del self._forbidden[user_id]
+            return False
+        return True
+
+    def invalidate(self, user_id: int) -> None:
+        self._channels.pop(user_id, None)
+        self._forbidden.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._channels.clear()
+        self._forbidden.clear()
+
+    async def _open(self, client: discord.Client, user_id: int) -> discord.DMChannel:
+        user = client.get_user(user_id)
+        if user is None:
+            user = await client.fetch_user(user_id)
+        return user.dm_channel or await user.create_dm()
+
+    def _put(self, user_id: int, channel: discord.DMChannel) -> None:
+        self._channels[user_id] = channel
+        self._channels.move_to_end(user_id)
+        while len(self._channels) > self.max_entries:
+            self._channels.popitem(last=False)
+
+
+dm_cache = DMChannelCache(settings.dm_cache_max_entries, settings.dm_forbidden_ttl_seconds)
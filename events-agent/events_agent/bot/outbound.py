@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from ..infra.logging import get_logger
+from ..infra.metrics import outbound_queue_depth, outbound_queue_wait_seconds
+from ..infra.rate_limit import TokenBucket
+from ..infra.settings import settings
+
+logger = get_logger().bind(service="outbound")
+
+Send = Callable[[], Awaitable[Any]]
+
+
+class Lane(IntEnum):
+    """Priority lanes; lower values are sent first."""
+    INTERACTIVE = 0
+    REMINDER = 1
+
+
+@dataclass(order=True)
+class _Job:
+    lane: Lane
+    seq: int
+    route: str = field(compare=False)
+    send: Send = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+
+
+class OutboundQueue:
+    """
+    Single outbound path for Discord messages, shared by commands and reminders.
+
+    Jobs are taken in lane order, so an interactive followup queued behind
+    thousands of reminders is sent next. Each send takes a token from the
+    global bucket (Discord's ~50 requests/s) and from its route's bucket
+    (per DM channel or interaction webhook); a job whose route is exhausted
+    is put back until the route refills instead of stalling the queue in
+    discord.py's 429 handling. Each lane admits at most ``max_pending``
+    jobs, so a reminder burst waits in ``send`` rather than piling up.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 40.0,
+        burst: int = 10,
+        route_rate_per_second: float = 1.0,
+        route_burst: int = 5,
+        max_pending: int = 1000,
+        concurrency: int = 20,
+    ):
+        self.route_rate_per_second = route_rate_per_second
+        self.route_burst = route_burst
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+        self._global = TokenBucket(rate_per_minute=int(rate_per_second * 60), burst=burst)
+        self._routes: Dict[str, TokenBucket] = {}
+        self._seq = itertools.count()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._admission: Dict[Lane, asyncio.Semaphore] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._depth: Dict[Lane, int] = {lane: 0 for lane in Lane}
+        self._task: Optional[asyncio.Task] = None
+        self._sends: Set[asyncio.Task] = set()
+
+    async def send(self, route: str, lane: Lane, send: Send) -> Any:
+        """Queue ``send`` on ``route`` and return its result once it has gone out."""
+        self._ensure_started()
+        admission = self._admission[lane]
+        await admission.acquire()
+        future = asyncio.get_running_loop().create_future()
+        job = _Job(lane, next(self._seq), route, send, future, time.monotonic())
+        self._set_depth(lane, 1)
+        self._queue.put_nowait(job)
+        try:
+            return await future
+        finally:
+            admission.release()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._admission = {lane: asyncio.Semaphore(self.max_pending) for lane in Lane}
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job: _Job = await self._queue.get()
+            if job.future.cancelled():
+                self._set_depth(job.lane, -1)
+                continue
+
+            bucket = self._route_bucket(job.route)
+            if not bucket.allow():
+                # Route exhausted: park the job until it refills and serve other routes meanwhile.
+                loop.call_later((1.0 - bucket.tokens) / bucket.rate, self._queue.put_nowait, job)
+                continue
+
+            await self._global.acquire()
+            await self._slots.acquire()
+            self._set_depth(job.lane, -1)
+            outbound_queue_wait_seconds.labels(lane=job.lane.name.lower()).observe(time.monotonic() - job.enqueued_at)
+            task = asyncio.create_task(self._deliver(job))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _deliver(self, job: _Job) -> None:
+        try:
+            result = await job.send()
+            if not job.future.done():
+                job.future.set_result(result)
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def _route_bucket(self, route: str) -> TokenBucket:
+        bucket = self._routes.get(route)
+        if bucket is None:
+            if len(self._routes) >= 10000:
+                # Drop routes idle long enough to have refilled; a full bucket is the same as a new one.
+                now = time.monotonic()
+                self._routes = {
+                    key: b for key, b in self._routes.items() if now - b.timestamp < b.capacity / b.rate
+                }
+            bucket = TokenBucket(rate_per_minute=int(self.route_rate_per_second * 60), burst=self.route_burst)
+            self._routes[route] = bucket
+        return bucket
+
+    def _set_depth(self, lane: Lane, delta: int) -> None:
+        self._depth[lane] += delta
+        outbound_queue_depth.labels(lane=lane.name.lower()).set(self._depth[lane])
+
+
+outbound = OutboundQueue(
+    rate_per_second=settings.discord_outbound_rate_per_second,
+    burst=settings.discord_outbound_burst,
+    route_rate_per_second=settings.discord_route_rate_per_second,
+    route_burst=settings.discord_route_burst,
+    max_pending=settings.discord_outbound_max_pending,
+    concurrency=settings.discord_outbound_concurrency,
+)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .slots import Interval
+
+
+class RankedSlot(NamedTuple):
+    start: datetime
+    end: datetime
+    free_count: int
+    total: int
+    free_attendees: Tuple[str, ...]
+
+
+def busy_bitmap(
+    busy_by_attendee: Mapping[str, Sequence[Interval]],
+    window_start: datetime,
+    window_end: datetime,
+    slot_minutes: int = 15,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Rasterise busy intervals into an (attendees x slots) boolean array.
+
+    A slot is busy when any busy interval touches it. Built with a
+    difference array and one cumulative sum, so there is no per-slot Python loop.
+    """
+    attendees = list(busy_by_attendee)
+    slot = timedelta(minutes=slot_minutes)
+    n_slots = max(0, (window_end - window_start) // slot)
+    if not attendees or n_slots == 0:
+        return attendees, np.zeros((len(attendees), n_slots), dtype=bool)
+
+    rows: List[int] = []
+    starts: List[int] = []
+    ends: List[int] = []
+    for row, name in enumerate(attendees):
+        for busy_start, busy_end in busy_by_attendee[name]:
+            if busy_end <= window_start or busy_start >= window_end:
+                continue
+            rows.append(row)
+            starts.append((busy_start - window_start) // slot)
+            ends.append(-((window_start - busy_end) // slot))
+
+    diff = np.zeros((len(attendees), n_slots + 1), dtype=np.int32)
+    if rows:
+        row_idx = np.asarray(rows)
+        np.add.at(diff, (row_idx, np.clip(starts, 0, n_slots)), 1)
+        np.add.at(diff, (row_idx, np.clip(ends, 0, n_slots)), -1)
+    return attendees, np.cumsum(diff, axis=1)[:, :n_slots] > 0
+
+
+def rank_common_slots(
+    busy_by_attendee: Mapping[str, Sequence[Interval]],
+    window_start: datetime,
+    window_end: datetime,
+    duration_minutes: int,
+    slot_minutes: int = 15,
+    working_hours: Optional[Tuple[int, int]] = None,
+    min_free: Optional[int] = None,
+    limit: int = 10,
+) -> List[RankedSlot]:
+    """
+    Rank meeting starts by how many attendees are free for the whole meeting.
+
+    Starts lie on a ``slot_minutes`` grid from ``window_start``. A start is
+    feasible for an attendee when a sliding window of ``duration_minutes``
+    over their bitmap contains no busy slot. Results are ordered by free count
+    (descending) then start time, and only starts with at least ``min_free``
+    free attendees are returned (default: everyone). ``working_hours`` is
+    evaluated on the window's UTC offset, so pass UTC or fixed-offset times.
+    """
+    attendees, busy = busy_bitmap(busy_by_attendee, window_start, window_end, slot_minutes)
+    total = len(attendees)
+    span = -(-duration_minutes // slot_minutes)
+    n_starts = busy.shape[1] - span + 1
+    if total == 0 or n_starts <= 0:
+        return []
+
+    # Busy slots inside each window via prefix sums: free iff the window sum is zero.
+    prefix = np.zeros((total, busy.shape[1] + 1), dtype=np.int32)
+    prefix[:, 1:] = np.cumsum(busy, axis=1)
+    free = (prefix[:, span:] - prefix[:, :n_starts]) == 0
+    free_count = free.sum(axis=0)
+
+    feasible = free_count >= (total if min_free is None else max(1, min_free))
+    if working_hours:
+        offset = window_start.hour * 60 + window_start.minute
+        hours = ((offset + np.arange(n_starts) * slot_minutes) // 60) % 24
+        feasible &= (hours >= working_hours[0]) & (hours < working_hours[1])
+
+    candidates = np.flatnonzero(feasible)
+    if candidates.size == 0:
+        return []
+    order = candidates[np.lexsort((candidates, -free_count[candidates]))][:limit]
+
+    slot = timedelta(minutes=slot_minutes)
+    duration = timedelta(minutes=duration_minutes)
+    ranked: List[RankedSlot] = []
+    for j in order.tolist():
+        start = window_start + j * slot
+        ranked.append(RankedSlot(
+            start=start,
+            end=start + duration,
+            free_count=int(free_count[j]),
+            total=total,
+            free_attendees=tuple(attendees[i] for i in np.flatnonzero(free[:, j])),
+        ))
+    return ranked
@@ -3,8 +3,10 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import BigInteger, Integer, String, UniqueConstraint, DateTime, Boolean
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy import BigInteger, Integer, String, UniqueConstraint, DateTime, Boolean, Index, false, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
+
+from .titles import title_hash
 
 
 class Base(DeclarativeBase):
@@ -41,7 +43,19 @@ class Reminder(Base):
     remind_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     sent: Mapped[bool] = mapped_column(Boolean, default=False)
     retries: Mapped[int] = mapped_column(Integer, default=0)
-    __table_args__ = (UniqueConstraint("event_id", "remind_at", name="uq_reminder_event_at"),)
+    # Delivery lease: the worker sending this reminder and when its claim lapses
+    claimed_by: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    claimed_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (
+        UniqueConstraint("event_id", "remind_at", name="uq_reminder_event_at"),
+        # Only unsent reminders are ever polled, so keep sent rows out of the index
+        Index(
+            "ix_reminders_unsent_remind_at",
+            "remind_at",
+            postgresql_where=text("sent = false"),
+            sqlite_where=text("sent = 0"),
+        ),
+    )
 
 
 class Event(Base):
@@ -49,17 +63,61 @@ class Event(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(Integer, nullable=False)
     discord_user_id: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
-    google_event_id: Mapped[str] = mapped_column(String(128), nullable=False, unique=True, index=True)
+    # Unique per owner only: a shared event is mirrored once for each attendee who syncs it
+    google_event_id: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     title: Mapped[str] = mapped_column(String(256), nullable=False)
+    # SHA-256 of the normalized title, kept in sync by _sync_title_hash
+    title_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     description: Mapped[Optional[str]] = mapped_column(String(1024), nullable=True)
     location: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
     start_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     end_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     attendees: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)  # JSON string
     google_calendar_link: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
+    # Google's "transparent" (shown as free) events do not block time
+    transparency: Mapped[str] = mapped_column(String(16), nullable=False, default="opaque", server_default="opaque")
+    # The owner's own attendee responseStatus; None when they are not on the guest list
+    response_status: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    all_day: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, server_default=false())
     reminder_sent: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        UniqueConstraint("discord_user_id", "google_event_id", name="uq_events_user_google_event"),
+        Index("ix_events_discord_user_id_start_time", "discord_user_id", "start_time"),
+        Index("ix_events_user_id_start_time", "user_id", "start_time"),
+        Index("ix_events_discord_user_id_title_hash_start_time", "discord_user_id", "title_hash", "start_time"),
+    )
+
+    @validates("title")
+    def _sync_title_hash(self, key: str, value: str) -> str:
+        self.title_hash = title_hash(value) if value is not None else None
+        return value
+
+
+class CalendarSyncState(Base):
+    __tablename__ = "calendar_sync_state"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    discord_user_id: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    calendar_id: Mapped[str] = mapped_column(String(256), nullable=False, default="primary")
+    sync_token: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    last_full_sync_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Active events.watch push channel, if any
+    channel_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, unique=True, index=True)
+    channel_resource_id: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
+    channel_token: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    channel_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (UniqueConstraint("discord_user_id", "calendar_id", name="uq_sync_state_user_calendar"),)
+
+
+class SchedulerLease(Base):
+    """Leader lease for singleton background jobs on databases without advisory locks."""
+    __tablename__ = "scheduler_leases"
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
 
 class EventTemplate(Base):
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+Interval = Tuple[datetime, datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval], pad: timedelta = timedelta(0)) -> List[Interval]:
+    """
+    Sort and merge intervals in O(n log n).
+
+    Each interval is widened by ``pad`` on both sides first, so a buffer
+    between meetings becomes part of the busy time.
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        start, end = start - pad, end + pad
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def find_free_slots(
+    busy: Iterable[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    step: timedelta = timedelta(minutes=30),
+    buffer: timedelta = timedelta(0),
+    working_hours: Optional[Tuple[int, int]] = None,
+    limit: Optional[int] = 10,
+) -> List[Interval]:
+    """
+    Find free slots of ``duration`` starting on a ``step`` grid anchored at ``window_start``.
+
+    Busy intervals are merged once, then the gaps between them are swept in
+    order, so the cost is O(n log n + k) for n busy intervals and k results
+    instead of rescanning every busy interval at every step. A slot conflicts
+    when it overlaps a busy interval widened by ``buffer``. ``working_hours``
+    is an (start_hour, end_hour) pair the slot's start hour must fall in.
+    Stops as soon as ``limit`` slots are found.
+    """
+    if duration <= timedelta(0) or step <= timedelta(0) or window_end <= window_start:
+        return []
+    if working_hours and working_hours[0] >= working_hours[1]:
+        return []
+
+    slots: List[Interval] = []
+    gap_start = window_start
+    for busy_start, busy_end in merge_intervals(busy, buffer) + [(window_end, window_end)]:
+        gap_end = min(busy_start, window_end)
+        if gap_end - gap_start >= duration:
+            for slot in _slots_in_gap(gap_start, gap_end, window_start, duration, step, working_hours):
+                slots.append(slot)
+                if limit is not None and len(slots) >= limit:
+                    return slots
+        gap_start = max(gap_start, busy_end)
+        if gap_start >= window_end:
+            break
+    return slots
+
+
+def _slots_in_gap(
+    gap_start: datetime,
+    gap_end: datetime,
+    anchor: datetime,
+    duration: timedelta,
+    step: timedelta,
+    working_hours: Optional[Tuple[int, int]],
+) -> Iterable[Interval]:
+    current = _grid_ceil(gap_start, anchor, step)
+    while current + duration <= gap_end:
+        if working_hours and not working_hours[0] <= current.hour < working_hours[1]:
+            # Jump straight to the next working-hours start instead of stepping through the night.
+            day_start = current.replace(hour=working_hours[0], minute=0, second=0, microsecond=0)
+            if current.hour >= working_hours[1]:
+                day_start += timedelta(days=1)
+            current = _grid_ceil(day_start, anchor, step)
+            continue
+        yield current, current + duration
+        current += step
+
+
+def _grid_ceil(value: datetime, anchor: datetime, step: timedelta) -> datetime:
+    """Smallest ``anchor + k * step`` that is >= ``value``."""
+    if value <= anchor:
+        return anchor
+    return anchor - ((anchor - value) // step) * step
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+from difflib import SequenceMatcher
+
+
+def normalize_title(title: str) -> str:
+    """Casefold and collapse whitespace so trivially different titles compare equal."""
+    return " ".join(title.casefold().split())
+
+
+def title_hash(title: str) -> str:
+    """Hex SHA-256 of the normalized title, stored on events for indexed lookups."""
+    return hashlib.sha256(normalize_title(title).encode("utf-8")).hexdigest()
+
+
+def titles_similar(a: str, b: str, threshold: float = 0.85) -> bool:
+    """
+    Fuzzy title match used for duplicate detection.
+
+    Titles match when one normalized title contains the other (the old
+    ``ilike('%title%')`` behaviour) or their similarity ratio reaches
+    ``threshold``.
+    """
+    a, b = normalize_title(a), normalize_title(b)
+    if not a or not b:
+        return a == b
+    if a in b or b in a:
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= threshold
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+# Read paths only show a preview of the description; one extra character
+# tells the renderer whether the stored text was longer.
+DESCRIPTION_PREVIEW_CHARS = 200
+
+
+class EventView(NamedTuple):
+    """
+    Read-only projection of an events row for listings and reminders.
+
+    Field names match the ``Event`` model, so formatting code accepts either.
+    ``description`` holds at most ``DESCRIPTION_PREVIEW_CHARS + 1`` characters.
+    """
+    id: int
+    google_event_id: str
+    title: str
+    start_time: datetime
+    end_time: datetime
+    location: Optional[str]
+    description: Optional[str]
+    google_calendar_link: Optional[str]
+
+
+class UserView(NamedTuple):
+    """Immutable snapshot of a users row, safe to share across sessions and cache."""
+    id: int
+    discord_id: str
+    tz: Optional[str]
+    email: Optional[str]
+    google_sub: Optional[str]
+    token_ciphertext: Optional[str]
+
+
+class ReminderView(NamedTuple):
+    """A reminder hydrated with its owner's Discord ID and event, loaded in one joined query."""
+    id: int
+    user_id: int
+    event_id: Optional[str]
+    channel_id: Optional[str]
+    remind_at: datetime
+    discord_user_id: Optional[str]
+    retries: int
+    event: Optional[EventView]
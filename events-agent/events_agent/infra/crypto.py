@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+from functools import lru_cache
+
 from cryptography.fernet import Fernet, InvalidToken
 
 from .settings import settings
@@ -8,7 +12,13 @@ from .settings import settings
 def get_fernet() -> Fernet:
     if not settings.fernet_key:
         raise RuntimeError("FERNET_KEY not configured")
-    return Fernet(settings.fernet_key)
+    return _fernet_for(settings.fernet_key)
+
+
+@lru_cache(maxsize=4)
+def _fernet_for(key: str) -> Fernet:
+    # Parsing the key is the expensive part; Fernet instances are stateless and reusable.
+    return Fernet(key)
 
 
 def encrypt_text(plaintext: str) -> str:
@@ -31,3 +41,9 @@ def decrypt_token(encrypted_token: str) -> str:
     return decrypt_text(encrypted_token)
 
 
+def sign_bytes(purpose: str, data: bytes, size: int = 12) -> bytes:
+    """Truncated HMAC-SHA256 of ``data`` keyed by the Fernet key; ``purpose`` keeps tags for different uses apart."""
+    if not settings.fernet_key:
+        raise RuntimeError("FERNET_KEY not configured")
+    message = purpose.encode("utf-8") + b"\0" + data
+    return hmac.new(settings.fernet_key.encode("utf-8"), message, hashlib.sha256).digest()[:size]
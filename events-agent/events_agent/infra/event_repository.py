@@ -1,19 +1,102 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import hmac
 import json
-from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple
 
-from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy import Row, select, update, delete, and_, or_, func, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..domain.models import Event, User, Reminder, EventTemplate
+from ..adapters.gcal_pool import client_pool
+from ..domain.models import CalendarSyncState, Event, GuildSettings, User, Reminder, EventTemplate
+from ..domain.titles import title_hash, titles_similar
+from ..domain.views import DESCRIPTION_PREVIEW_CHARS, EventView, ReminderView, UserView
+from .crypto import sign_bytes
 from .logging import get_logger
+from .unit_of_work import UnitOfWorkRepository
+from .user_cache import user_cache
 
 logger = get_logger().bind(service="event_repository")
 
+# Rows per executemany call in bulk writes; SQLAlchemy batches each call into
+# multi-row INSERT ... RETURNING statements.
+BULK_CHUNK_SIZE = 500
 
-class EventRepository:
+# Columns a Google sync may overwrite on an existing row.
+_UPSERT_COLUMNS = (
+    "title", "title_hash", "description", "location", "start_time", "end_time",
+    "attendees", "google_calendar_link", "transparency", "response_status", "all_day",
+    "updated_at",
+)
+
+# Columns loaded for EventView; skips attendees and long descriptions and
+# returns plain rows instead of identity-mapped ORM objects.
+_EVENT_VIEW_COLUMNS = (
+    Event.id,
+    Event.google_event_id,
+    Event.title,
+    Event.start_time,
+    Event.end_time,
+    Event.location,
+    func.substr(Event.description, 1, DESCRIPTION_PREVIEW_CHARS + 1).label("description"),
+    Event.google_calendar_link,
+)
+
+# Rows that count as busy time, the same rule Google freebusy applies.
+_BLOCKS_TIME = and_(
+    Event.transparency != "transparent",
+    or_(Event.response_status.is_(None), Event.response_status != "declined"),
+)
+
+
+def _google_id_match(google_event_id: str, discord_user_id: Optional[str]) -> Any:
+    if discord_user_id is None:
+        return Event.google_event_id == google_event_id
+    return and_(Event.discord_user_id == discord_user_id, Event.google_event_id == google_event_id)
+
+
+class EventPage(NamedTuple):
+    events: List[EventView]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+
+_CURSOR_PURPOSE = "event-cursor"
+_CURSOR_TAG_BYTES = 12
+
+
+class InvalidCursor(ValueError):
+    """A page cursor that is malformed or was not issued by this deployment."""
+
+
+def encode_event_cursor(start_time: datetime, event_id: int) -> str:
+    """Opaque, signed keyset cursor for an event's (start_time, id) position."""
+    payload = f"{start_time.isoformat()}|{event_id}".encode()
+    raw = sign_bytes(_CURSOR_PURPOSE, payload, _CURSOR_TAG_BYTES) + payload
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_event_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Position encoded in ``cursor``; raises InvalidCursor if it is malformed or its signature does not match."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursor("malformed cursor") from e
+    tag, payload = raw[:_CURSOR_TAG_BYTES], raw[_CURSOR_TAG_BYTES:]
+    if not hmac.compare_digest(tag, sign_bytes(_CURSOR_PURPOSE, payload, _CURSOR_TAG_BYTES)):
+        raise InvalidCursor("cursor signature mismatch")
+    try:
+        start, event_id = payload.decode().rsplit("|", 1)
+        return datetime.fromisoformat(start), int(event_id)
+    except ValueError as e:
+        raise InvalidCursor("malformed cursor") from e
+
+
+class EventRepository(UnitOfWorkRepository):
     """Repository for managing calendar events in the database."""
     
     def __init__(self, session: AsyncSession):
@@ -53,48 +136,193 @@ class EventRepository:
             )
             
             self.session.add(event)
-            await self.session.commit()
-            await self.session.refresh(event)
+            await self._commit(event)
             
             logger.info("event_created", event_id=event.id, google_event_id=google_event_id)
             return event
             
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
+            logger.error("event_creation_failed", error=str(e))
+            raise
+    
+    async def upsert_event(
+        self,
+        user_id: int,
+        discord_user_id: str,
+        google_event_id: str,
+        title: str,
+        description: Optional[str],
+        location: Optional[str],
+        start_time: datetime,
+        end_time: datetime,
+        attendees: Optional[List[str]] = None,
+        google_calendar_link: Optional[str] = None
+    ) -> int:
+        """
+        Store an event just created in Google Calendar; returns its row ID.
+
+        A push-triggered sync may already have written the user's copy of the
+        event, so this goes through the same ON CONFLICT upsert as sync
+        instead of a plain INSERT.
+        """
+        try:
+            fields = {
+                "google_event_id": google_event_id,
+                "title": title,
+                "description": description,
+                "location": location,
+                "start_time": start_time,
+                "end_time": end_time,
+                "attendees": json.dumps(attendees) if attendees else None,
+                "google_calendar_link": google_calendar_link,
+            }
+            [event_id] = await self._upsert_rows(user_id, discord_user_id, [fields])
+            await self._commit()
+            
+            logger.info("event_created", event_id=event_id, google_event_id=google_event_id)
+            return event_id
+            
+        except Exception as e:
+            await self._rollback()
             logger.error("event_creation_failed", error=str(e))
             raise
     
-    async def get_event_by_google_id(self, google_event_id: str) -> Optional[Event]:
-        """Get an event by its Google Calendar ID."""
+    async def create_events_bulk(self, user_id: int, discord_user_id: str, events: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert many new events with batched INSERT ... RETURNING and a single commit.
+
+        ``events`` are Event column dicts (as produced by ``google_event_fields``).
+        Returns the new row IDs in input order. Use ``upsert_events_bulk`` when
+        some of the events may already be stored.
+        """
+        try:
+            ids: List[int] = []
+            rows = self._bulk_rows(user_id, discord_user_id, events)
+            for start in range(0, len(rows), BULK_CHUNK_SIZE):
+                result = await self.session.execute(
+                    self._insert().returning(Event.id, sort_by_parameter_order=True),
+                    rows[start:start + BULK_CHUNK_SIZE]
+                )
+                ids.extend(result.scalars().all())
+            await self._commit()
+            logger.info("events_bulk_created", count=len(ids), user_id=discord_user_id)
+            return ids
+        except Exception as e:
+            await self._rollback()
+            logger.error("events_bulk_create_failed", error=str(e))
+            raise
+    
+    async def upsert_events_bulk(self, user_id: int, discord_user_id: str, events: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert or update many of one user's events keyed on ``google_event_id``, then commit.
+
+        Returns one row ID per distinct Google ID, in order of first appearance.
+        """
+        try:
+            ids = await self._upsert_rows(user_id, discord_user_id, events)
+            await self._commit()
+            logger.info("events_bulk_upserted", count=len(ids), user_id=discord_user_id)
+            return ids
+        except Exception as e:
+            await self._rollback()
+            logger.error("events_bulk_upsert_failed", error=str(e))
+            raise
+    
+    async def _upsert_rows(self, user_id: int, discord_user_id: str, events: List[Dict[str, Any]]) -> List[int]:
+        """
+        Insert or update many of one user's events with batched
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING; returns the row IDs
+        without committing. This is the write path shared by sync,
+        ``upsert_events_bulk`` and ``upsert_event``.
+
+        Rows are unique per (owner, Google ID), so a shared event synced by
+        another attendee is kept as that attendee's own row.
+        """
+        ids: List[int] = []
+        # One statement cannot touch the same row twice, so keep the last payload per event.
+        latest = {fields["google_event_id"]: fields for fields in events}
+        rows = self._bulk_rows(user_id, discord_user_id, list(latest.values()))
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            stmt = self._insert()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Event.discord_user_id, Event.google_event_id],
+                set_={column: stmt.excluded[column] for column in _UPSERT_COLUMNS}
+            ).returning(Event.id, sort_by_parameter_order=True)
+            result = await self.session.execute(stmt, rows[start:start + BULK_CHUNK_SIZE])
+            ids.extend(result.scalars().all())
+        return ids
+    
+    def _insert(self):
+        """Dialect-specific INSERT so ON CONFLICT is available on Postgres and SQLite."""
+        if self.session.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(Event)
+        return sqlite.insert(Event)
+    
+    @staticmethod
+    def _bulk_rows(user_id: int, discord_user_id: str, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Core inserts bypass the ORM, so fill in defaults and the title hash here.
+        now = datetime.now(timezone.utc)
+        rows: List[Dict[str, Any]] = []
+        for fields in events:
+            row = {column: fields.get(column) for column in _UPSERT_COLUMNS}
+            row.update(
+                user_id=user_id,
+                discord_user_id=discord_user_id,
+                google_event_id=fields["google_event_id"],
+                title_hash=title_hash(fields["title"]),
+                transparency=fields.get("transparency") or "opaque",
+                all_day=bool(fields.get("all_day")),
+                reminder_sent=False,
+                created_at=now,
+                updated_at=now
+            )
+            rows.append(row)
+        return rows
+    
+    async def get_event_by_google_id(self, google_event_id: str, discord_user_id: Optional[str] = None) -> Optional[Event]:
+        """Get an event by its Google Calendar ID, optionally only the given user's copy."""
         try:
             result = await self.session.execute(
-                select(Event).where(Event.google_event_id == google_event_id)
+                select(Event).where(_google_id_match(google_event_id, discord_user_id)).limit(1)
             )
             return result.scalar_one_or_none()
         except Exception as e:
             logger.error("get_event_by_google_id_failed", error=str(e))
             return None
     
-    async def get_events_by_user(self, discord_user_id: str, limit: int = 10) -> List[Event]:
+    async def get_event_view_by_google_id(self, google_event_id: str, discord_user_id: Optional[str] = None) -> Optional[EventView]:
+        """Read-only projection of an event by Google ID, optionally only the given user's copy."""
+        try:
+            result = await self.session.execute(
+                select(*_EVENT_VIEW_COLUMNS).where(_google_id_match(google_event_id, discord_user_id)).limit(1)
+            )
+            row = result.first()
+            return EventView(*row) if row else None
+        except Exception as e:
+            logger.error("get_event_view_by_google_id_failed", error=str(e))
+            return None
+    
+    async def get_events_by_user(self, discord_user_id: str, limit: int = 10) -> List[EventView]:
         """Get events for a specific user."""
         try:
             result = await self.session.execute(
-                select(Event)
+                select(*_EVENT_VIEW_COLUMNS)
                 .where(Event.discord_user_id == discord_user_id)
                 .order_by(Event.start_time.desc())
                 .limit(limit)
             )
-            return list(result.scalars().all())
+            return [EventView(*row) for row in result.all()]
         except Exception as e:
             logger.error("get_events_by_user_failed", error=str(e))
             return []
     
-    async def get_upcoming_events(self, discord_user_id: str, limit: int = 5) -> List[Event]:
+    async def get_upcoming_events(self, discord_user_id: str, limit: int = 5) -> List[EventView]:
         """Get upcoming events for a user."""
         try:
             now = datetime.now(timezone.utc)
             result = await self.session.execute(
-                select(Event)
+                select(*_EVENT_VIEW_COLUMNS)
                 .where(
                     and_(
                         Event.discord_user_id == discord_user_id,
@@ -104,17 +332,67 @@ class EventRepository:
                 .order_by(Event.start_time.asc())
                 .limit(limit)
             )
-            return list(result.scalars().all())
+            return [EventView(*row) for row in result.all()]
         except Exception as e:
             logger.error("get_upcoming_events_failed", error=str(e))
             return []
     
-    async def list_events_for_user(self, user_id: int, limit: int = 10) -> List[Event]:
+    async def get_upcoming_events_page(
+        self,
+        discord_user_id: str,
+        limit: int = 5,
+        after: Optional[str] = None,
+        before: Optional[str] = None
+    ) -> EventPage:
+        """
+        One page of upcoming events, keyset-paginated on (start_time, id).
+
+        Pass ``after`` (a page's ``next_cursor``) to page forward or ``before``
+        (its ``prev_cursor``) to page back. Each page is a single index range
+        scan of ``limit + 1`` rows, so deep pages cost the same as the first.
+        Raises InvalidCursor for a cursor this deployment did not issue.
+        """
+        backwards = before is not None and after is None
+        position = tuple_(Event.start_time, Event.id)
+        conditions = [
+            Event.discord_user_id == discord_user_id,
+            Event.start_time > datetime.now(timezone.utc)
+        ]
+        if backwards:
+            conditions.append(position < tuple_(*decode_event_cursor(before)))
+            order = (Event.start_time.desc(), Event.id.desc())
+        else:
+            if after is not None:
+                conditions.append(position > tuple_(*decode_event_cursor(after)))
+            order = (Event.start_time.asc(), Event.id.asc())
+        
+        try:
+            result = await self.session.execute(
+                select(*_EVENT_VIEW_COLUMNS).where(and_(*conditions)).order_by(*order).limit(limit + 1)
+            )
+            events = [EventView(*row) for row in result.all()]
+            has_more = len(events) > limit
+            events = events[:limit]
+            if backwards:
+                events.reverse()
+            if not events:
+                return EventPage([], None, None)
+            
+            first = encode_event_cursor(events[0].start_time, events[0].id)
+            last = encode_event_cursor(events[-1].start_time, events[-1].id)
+            if backwards:
+                return EventPage(events, last, first if has_more else None)
+            return EventPage(events, last if has_more else None, first if after is not None else None)
+        except Exception as e:
+            logger.error("get_upcoming_events_page_failed", error=str(e))
+            return EventPage([], None, None)
+    
+    async def list_events_for_user(self, user_id: int, limit: int = 10) -> List[EventView]:
         """List events for a user by user ID."""
         try:
             now = datetime.now(timezone.utc)
             result = await self.session.execute(
-                select(Event)
+                select(*_EVENT_VIEW_COLUMNS)
                 .where(
                     and_(
                         Event.user_id == user_id,
@@ -124,11 +402,32 @@ class EventRepository:
                 .order_by(Event.start_time.asc())
                 .limit(limit)
             )
-            return list(result.scalars().all())
+            return [EventView(*row) for row in result.all()]
         except Exception as e:
             logger.error("list_events_for_user_failed", error=str(e))
             return []
     
+    async def find_overlapping_events(self, discord_user_id: str, start_time: datetime, end_time: datetime) -> List[Tuple[datetime, datetime]]:
+        """
+        Start/end of a user's time-blocking events overlapping [start_time, end_time).
+
+        Matches Google freebusy: events marked free and events the user
+        declined are left out.
+        """
+        result = await self.session.execute(
+            select(Event.start_time, Event.end_time)
+            .where(
+                and_(
+                    Event.discord_user_id == discord_user_id,
+                    Event.start_time < end_time,
+                    Event.end_time > start_time,
+                    _BLOCKS_TIME
+                )
+            )
+            .order_by(Event.start_time.asc())
+        )
+        return [(row.start_time, row.end_time) for row in result.all()]
+    
     async def check_duplicate_event(
         self,
         discord_user_id: str,
@@ -136,26 +435,97 @@ class EventRepository:
         start_time: datetime,
         end_time: datetime,
         tolerance_minutes: int = 15
-    ) -> Optional[Event]:
-        """Check if a similar event already exists within a time tolerance."""
+    ) -> Optional[Row]:
+        """
+        Check if a similar event already exists within a time tolerance.
+
+        The exact path looks the normalized title hash up on the
+        (discord_user_id, title_hash, start_time) index; only when that finds
+        nothing are the user's events inside the tolerance window range-scanned
+        and their titles compared fuzzily. Both queries load only (id, title,
+        title hash, times). Returns the matching row or None.
+        """
         try:
-            from datetime import timedelta
             tolerance = timedelta(minutes=tolerance_minutes)
+            columns = (Event.id, Event.title, Event.title_hash, Event.start_time, Event.end_time)
+            in_window = and_(
+                Event.discord_user_id == discord_user_id,
+                Event.start_time >= start_time - tolerance,
+                Event.start_time <= start_time + tolerance
+            )
+            result = await self.session.execute(
+                select(*columns)
+                .where(and_(in_window, Event.title_hash == title_hash(title)))
+                .order_by(Event.start_time.asc())
+                .limit(1)
+            )
+            exact = result.first()
+            if exact:
+                return exact
+            
+            result = await self.session.execute(
+                select(*columns).where(in_window).order_by(Event.start_time.asc())
+            )
+            return next((row for row in result.all() if titles_similar(title, row.title)), None)
+        except Exception as e:
+            logger.error("check_duplicate_event_failed", error=str(e))
+            return None
+    
+    async def apply_google_changes(
+        self,
+        user_id: int,
+        discord_user_id: str,
+        upserts: List[Dict[str, Any]],
+        cancelled_ids: List[str]
+    ) -> Tuple[int, int]:
+        """
+        Apply one page of Google Calendar changes for a user.
+
+        ``upserts`` are Event column dicts keyed on ``google_event_id``; other
+        users' copies of a shared event are never touched. Returns
+        (upserted, deleted).
+        """
+        try:
+            upserted = len(await self._upsert_rows(user_id, discord_user_id, upserts)) if upserts else 0
             
+            deleted = 0
+            if cancelled_ids:
+                result = await self.session.execute(
+                    delete(Event).where(
+                        and_(
+                            Event.discord_user_id == discord_user_id,
+                            Event.google_event_id.in_(cancelled_ids)
+                        )
+                    )
+                )
+                deleted = result.rowcount or 0
+            
+            await self._commit()
+            return upserted, deleted
+            
+        except Exception as e:
+            await self._rollback()
+            logger.error("apply_google_changes_failed", error=str(e))
+            raise
+    
+    async def prune_unsynced_events(self, discord_user_id: str, window_start: datetime, synced_since: datetime) -> int:
+        """Delete a user's events in the sync window that a full import did not touch."""
+        try:
             result = await self.session.execute(
-                select(Event).where(
+                delete(Event).where(
                     and_(
                         Event.discord_user_id == discord_user_id,
-                        Event.title.ilike(f"%{title}%"),
-                        Event.start_time >= start_time - tolerance,
-                        Event.start_time <= start_time + tolerance
+                        Event.end_time >= window_start,
+                        Event.updated_at < synced_since
                     )
                 )
             )
-            return result.scalar_one_or_none()
+            await self._commit()
+            return result.rowcount or 0
         except Exception as e:
-            logger.error("check_duplicate_event_failed", error=str(e))
-            return None
+            await self._rollback()
+            logger.error("prune_unsynced_events_failed", error=str(e))
+            return 0
     
     async def update_event_reminder_sent(self, event_id: int) -> bool:
         """Mark an event's reminder as sent."""
@@ -165,28 +535,28 @@ class EventRepository:
                 .where(Event.id == event_id)
                 .values(reminder_sent=True, updated_at=datetime.now(timezone.utc))
             )
-            await self.session.commit()
+            await self._commit()
             return True
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("update_event_reminder_sent_failed", error=str(e))
             return False
     
-    async def delete_event(self, google_event_id: str) -> bool:
-        """Delete an event from the database."""
+    async def delete_event(self, google_event_id: str, discord_user_id: Optional[str] = None) -> bool:
+        """Delete an event from the database; every user's copy unless ``discord_user_id`` is given."""
         try:
             await self.session.execute(
-                delete(Event).where(Event.google_event_id == google_event_id)
+                delete(Event).where(_google_id_match(google_event_id, discord_user_id))
             )
-            await self.session.commit()
+            await self._commit()
             return True
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("delete_event_failed", error=str(e))
             return False
 
 
-class UserRepository:
+class UserRepository(UnitOfWorkRepository):
     """Repository for managing users in the database."""
     
     def __init__(self, session: AsyncSession):
@@ -203,6 +573,51 @@ class UserRepository:
             logger.error("get_user_by_discord_id_failed", error=str(e))
             return None
     
+    async def get_user_view(self, discord_id: str) -> Optional[UserView]:
+        """Read-only user snapshot, served from the in-process user cache when possible."""
+        cached = user_cache.get(discord_id)
+        if cached is not None:
+            return cached
+        try:
+            result = await self.session.execute(
+                select(
+                    User.id, User.discord_id, User.tz, User.email, User.google_sub, User.token_ciphertext
+                ).where(User.discord_id == discord_id)
+            )
+            row = result.first()
+            if row is None:
+                return None
+            user = UserView(*row)
+            user_cache.put(user)
+            return user
+        except Exception as e:
+            logger.error("get_user_view_failed", error=str(e))
+            return None
+    
+    async def get_connected_discord_ids(self) -> List[str]:
+        """Discord IDs of every user with a stored Google token."""
+        try:
+            result = await self.session.execute(
+                select(User.discord_id).where(User.token_ciphertext.is_not(None))
+            )
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error("get_connected_discord_ids_failed", error=str(e))
+            return []
+    
+    async def get_connected_users(self) -> List[UserView]:
+        """Snapshots of every user with a stored Google token."""
+        try:
+            result = await self.session.execute(
+                select(
+                    User.id, User.discord_id, User.tz, User.email, User.google_sub, User.token_ciphertext
+                ).where(User.token_ciphertext.is_not(None))
+            )
+            return [UserView(*row) for row in result.all()]
+        except Exception as e:
+            logger.error("get_connected_users_failed", error=str(e))
+            return []
+    
     async def create_user(self, discord_id: str, username: str, email: Optional[str] = None) -> User:
         """Create a new user."""
         try:
@@ -215,14 +630,13 @@ class UserRepository:
             )
             
             self.session.add(user)
-            await self.session.commit()
-            await self.session.refresh(user)
+            await self._commit(user)
             
             logger.info("user_created", user_id=user.id, discord_id=discord_id)
             return user
             
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("create_user_failed", error=str(e))
             raise
     
@@ -245,14 +659,13 @@ class UserRepository:
             )
             
             self.session.add(user)
-            await self.session.commit()
-            await self.session.refresh(user)
+            await self._commit(user)
             
             logger.info("user_created", user_id=user.id, discord_id=discord_id)
             return user
             
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("get_or_create_user_failed", error=str(e))
             raise
     
@@ -264,25 +677,28 @@ class UserRepository:
                 .where(User.discord_id == discord_id)
                 .values(tz=timezone)
             )
-            await self.session.commit()
+            await self._commit()
+            user_cache.invalidate(discord_id)
             return True
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("update_user_timezone_failed", error=str(e))
             return False
     
-    async def update_user_token(self, discord_id: str, token_ciphertext: str, google_sub: str) -> bool:
-        """Update a user's encrypted Google token."""
+    async def update_user_token(self, discord_id: str, token_ciphertext: str, google_sub: Optional[str]) -> bool:
+        """Update a user's encrypted Google token; ``google_sub`` is stored as given, including None."""
         try:
             await self.session.execute(
                 update(User)
                 .where(User.discord_id == discord_id)
                 .values(token_ciphertext=token_ciphertext, google_sub=google_sub)
             )
-            await self.session.commit()
+            await self._commit()
+            client_pool.invalidate(discord_id)
+            user_cache.invalidate(discord_id)
             return True
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("update_user_token_failed", error=str(e))
             return False
     
@@ -294,15 +710,16 @@ class UserRepository:
                 .where(User.id == user_id)
                 .values(**kwargs)
             )
-            await self.session.commit()
+            await self._commit()
+            user_cache.invalidate_user_id(user_id)
             return True
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("update_user_failed", error=str(e))
             return False
 
 
-class ReminderRepository:
+class ReminderRepository(UnitOfWorkRepository):
     """Repository for managing reminders in the database."""
     
     def __init__(self, session: AsyncSession):
@@ -328,14 +745,13 @@ class ReminderRepository:
             )
             
             self.session.add(reminder)
-            await self.session.commit()
-            await self.session.refresh(reminder)
+            await self._commit(reminder)
             
             logger.info("reminder_created", reminder_id=reminder.id, remind_at=remind_at)
             return reminder
             
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("reminder_creation_failed", error=str(e))
             raise
     
@@ -349,12 +765,152 @@ class ReminderRepository:
                         Reminder.remind_at <= current_time
                     )
                 )
+                .order_by(Reminder.remind_at.asc())
             )
             return list(result.scalars().all())
         except Exception as e:
             logger.error("get_due_reminders_failed", error=str(e))
             return []
     
+    async def get_pending_reminders(self, until: datetime, max_retries: int) -> List[Tuple[int, datetime]]:
+        """
+        (id, due time) of unsent reminders due at or before ``until``, earliest first.
+
+        A reminder that is held (claimed, or backing off after a failed
+        attempt) is due when its hold ends. Reminders that used up their
+        retries are left out.
+        """
+        try:
+            result = await self.session.execute(
+                select(Reminder.id, Reminder.remind_at, Reminder.claimed_until)
+                .where(
+                    and_(
+                        Reminder.sent == False,
+                        Reminder.remind_at <= until,
+                        Reminder.retries < max_retries
+                    )
+                )
+                .order_by(Reminder.remind_at.asc())
+            )
+            pending = []
+            for row in result.all():
+                due = row.remind_at
+                if row.claimed_until is not None and row.claimed_until > due:
+                    due = row.claimed_until
+                pending.append((row.id, due))
+            return pending
+        except Exception as e:
+            logger.error("get_pending_reminders_failed", error=str(e))
+            return []
+    
+    async def claim_reminders(
+        self,
+        worker_id: str,
+        lease_seconds: int,
+        due_before: datetime,
+        max_retries: int,
+        reminder_ids: Optional[List[int]] = None,
+        limit: int = 500
+    ) -> List[ReminderView]:
+        """
+        Atomically claim up to ``limit`` due, unsent reminders for ``worker_id``.
+
+        A reminder is claimable when it has retries left and no live hold;
+        expired leases (a worker that crashed mid-send) are reclaimed, and a
+        failed reminder becomes claimable again once its backoff ends. The claim is one
+        ``UPDATE ... WHERE id IN (SELECT ...) RETURNING id``: on Postgres the
+        subquery takes ``FOR UPDATE SKIP LOCKED`` so workers claim disjoint
+        batches without blocking, and on SQLite the single writer makes the
+        conditional update atomic. The claim is committed before returning
+        the hydrated reminders, so other workers see it immediately.
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            claimable = and_(
+                Reminder.sent == False,
+                Reminder.remind_at <= due_before,
+                Reminder.retries < max_retries,
+                or_(Reminder.claimed_until.is_(None), Reminder.claimed_until < now)
+            )
+            candidates = select(Reminder.id).where(claimable)
+            if reminder_ids is not None:
+                candidates = candidates.where(Reminder.id.in_(reminder_ids))
+            candidates = candidates.order_by(Reminder.remind_at.asc()).limit(limit)
+            if self.session.get_bind().dialect.name == "postgresql":
+                candidates = candidates.with_for_update(skip_locked=True)
+            
+            result = await self.session.execute(
+                update(Reminder)
+                .where(and_(Reminder.id.in_(candidates.scalar_subquery()), claimable))
+                .values(claimed_by=worker_id, claimed_until=now + timedelta(seconds=lease_seconds))
+                .returning(Reminder.id)
+                .execution_options(synchronize_session=False)
+            )
+            claimed_ids = list(result.scalars().all())
+            await self._commit()
+        except Exception as e:
+            await self._rollback()
+            logger.error("claim_reminders_failed", error=str(e))
+            return []
+        
+        if not claimed_ids:
+            return []
+        return await self._reminder_views(Reminder.id.in_(claimed_ids))
+    
+    async def reschedule_reminders(self, retry_at: Dict[int, datetime]) -> bool:
+        """
+        Record a failed delivery attempt for each reminder and hold it until its retry time.
+
+        The claim is dropped but ``claimed_until`` is set to the retry time,
+        so no worker claims the reminder again before its backoff ends.
+        """
+        if not retry_at:
+            return True
+        by_time: Dict[datetime, List[int]] = {}
+        for reminder_id, when in retry_at.items():
+            by_time.setdefault(when, []).append(reminder_id)
+        try:
+            for when, reminder_ids in by_time.items():
+                await self.session.execute(
+                    update(Reminder)
+                    .where(Reminder.id.in_(reminder_ids))
+                    .values(retries=Reminder.retries + 1, claimed_by=None, claimed_until=when)
+                )
+            await self._commit()
+            return True
+        except Exception as e:
+            await self._rollback()
+            logger.error("reschedule_reminders_failed", error=str(e))
+            return False
+    
+    async def _reminder_views(self, condition: Any) -> List[ReminderView]:
+        try:
+            result = await self.session.execute(
+                select(
+                    Reminder.id,
+                    Reminder.user_id,
+                    Reminder.event_id,
+                    Reminder.channel_id,
+                    Reminder.remind_at,
+                    User.discord_id,
+                    Reminder.retries,
+                    *_EVENT_VIEW_COLUMNS
+                )
+                .select_from(Reminder)
+                .outerjoin(User, User.id == Reminder.user_id)
+                .outerjoin(Event, and_(Event.google_event_id == Reminder.event_id, Event.user_id == Reminder.user_id))
+                .where(and_(Reminder.sent == False, condition))
+                .order_by(Reminder.remind_at.asc())
+            )
+            views = []
+            for row in result.all():
+                event = EventView(*row[7:]) if row[7] is not None else None
+                views.append(ReminderView(*row[:7], event=event))
+            return views
+        except Exception as e:
+            logger.error("get_reminder_views_failed", error=str(e))
+            return []
+    
     async def mark_reminder_sent(self, reminder_id: int) -> bool:
         """Mark a reminder as sent."""
         try:
@@ -363,13 +919,30 @@ class ReminderRepository:
                 .where(Reminder.id == reminder_id)
                 .values(sent=True)
             )
-            await self.session.commit()
+            await self._commit()
             return True
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("mark_reminder_sent_failed", error=str(e))
             return False
     
+    async def mark_reminders_sent(self, reminder_ids: List[int]) -> bool:
+        """Mark many reminders as sent with one UPDATE."""
+        if not reminder_ids:
+            return True
+        try:
+            await self.session.execute(
+                update(Reminder)
+                .where(Reminder.id.in_(reminder_ids))
+                .values(sent=True)
+            )
+            await self._commit()
+            return True
+        except Exception as e:
+            await self._rollback()
+            logger.error("mark_reminders_sent_failed", error=str(e))
+            return False
+    
     async def increment_reminder_retries(self, reminder_id: int) -> bool:
         """Increment the retry count for a reminder."""
         try:
@@ -378,9 +951,157 @@ class ReminderRepository:
                 .where(Reminder.id == reminder_id)
                 .values(retries=Reminder.retries + 1)
             )
-            await self.session.commit()
+            await self._commit()
             return True
         except Exception as e:
-            await self.session.rollback()
+            await self._rollback()
             logger.error("increment_reminder_retries_failed", error=str(e))
             return False
+
+
+class GuildSettingsRepository(UnitOfWorkRepository):
+    """Repository for per-guild settings."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get_default_channel_id(self, guild_id: str) -> Optional[str]:
+        """Get the channel a guild has configured for reminder delivery, if any."""
+        try:
+            result = await self.session.execute(
+                select(GuildSettings.default_channel_id).where(GuildSettings.guild_id == guild_id)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error("get_default_channel_id_failed", error=str(e))
+            return None
+
+
+class SyncStateRepository(UnitOfWorkRepository):
+    """Repository for per-user calendar sync watermarks."""
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get_state(self, discord_user_id: str, calendar_id: str = "primary") -> Optional[CalendarSyncState]:
+        """Get the sync state for a user's calendar."""
+        try:
+            result = await self.session.execute(
+                select(CalendarSyncState).where(
+                    and_(
+                        CalendarSyncState.discord_user_id == discord_user_id,
+                        CalendarSyncState.calendar_id == calendar_id
+                    )
+                )
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error("get_sync_state_failed", error=str(e))
+            return None
+    
+    async def get_state_by_channel(self, channel_id: str) -> Optional[CalendarSyncState]:
+        """Get the sync state owning a push notification channel."""
+        try:
+            result = await self.session.execute(
+                select(CalendarSyncState).where(CalendarSyncState.channel_id == channel_id)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error("get_sync_state_by_channel_failed", error=str(e))
+            return None
+    
+    async def list_states(self) -> List[CalendarSyncState]:
+        """Get every sync state row."""
+        try:
+            result = await self.session.execute(select(CalendarSyncState))
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error("list_sync_states_failed", error=str(e))
+            return []
+    
+    async def save_channel(
+        self,
+        user_id: int,
+        discord_user_id: str,
+        channel_id: Optional[str],
+        resource_id: Optional[str],
+        channel_token: Optional[str],
+        expires_at: Optional[datetime],
+        calendar_id: str = "primary"
+    ) -> bool:
+        """Record (or clear, with None values) the push channel for a user's calendar."""
+        try:
+            state = await self.get_state(discord_user_id, calendar_id)
+            if state is None:
+                state = CalendarSyncState(
+                    user_id=user_id,
+                    discord_user_id=discord_user_id,
+                    calendar_id=calendar_id
+                )
+                self.session.add(state)
+            
+            state.channel_id = channel_id
+            state.channel_resource_id = resource_id
+            state.channel_token = channel_token
+            state.channel_expires_at = expires_at
+            
+            await self._commit()
+            return True
+            
+        except Exception as e:
+            await self._rollback()
+            logger.error("save_channel_failed", error=str(e))
+            return False
+    
+    async def save_state(
+        self,
+        user_id: int,
+        discord_user_id: str,
+        sync_token: Optional[str],
+        synced_at: datetime,
+        full_sync: bool,
+        calendar_id: str = "primary"
+    ) -> CalendarSyncState:
+        """Store the latest sync token and watermark for a user's calendar."""
+        try:
+            state = await self.get_state(discord_user_id, calendar_id)
+            if state is None:
+                state = CalendarSyncState(
+                    user_id=user_id,
+                    discord_user_id=discord_user_id,
+                    calendar_id=calendar_id
+                )
+                self.session.add(state)
+            
+            state.sync_token = sync_token
+            state.last_synced_at = synced_at
+            if full_sync:
+                state.last_full_sync_at = synced_at
+            
+            await self._commit()
+            return state
+            
+        except Exception as e:
+            await self._rollback()
+            logger.error("save_sync_state_failed", error=str(e))
+            raise
+    
+    async def clear_sync_token(self, discord_user_id: str, calendar_id: str = "primary") -> bool:
+        """Forget a sync token so the next sync does a full import."""
+        try:
+            await self.session.execute(
+                update(CalendarSyncState)
+                .where(
+                    and_(
+                        CalendarSyncState.discord_user_id == discord_user_id,
+                        CalendarSyncState.calendar_id == calendar_id
+                    )
+                )
+                .values(sync_token=None)
+            )
+            await self._commit()
+            return True
+        except Exception as e:
+            await self._rollback()
+            logger.error("clear_sync_token_failed", error=str(e))
+            return False
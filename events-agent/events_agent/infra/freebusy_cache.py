@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .metrics import freebusy_cache_requests_total
+from .settings import settings
+
+Interval = Tuple[datetime, datetime]
+BusyFetcher = Callable[[datetime, datetime], Awaitable[List[Interval]]]
+
+
+@dataclass
+class _Coverage:
+    start: datetime
+    end: datetime
+    busy: List[Interval]
+    expires_at: float
+
+
+class FreeBusyCache:
+    """
+    TTL cache of busy intervals per calendar.
+
+    Each fetch stores the window it covered, so any later request for a
+    sub-window is answered locally until the entry expires. Misses fetch a
+    window extended by the TTL, because callers usually ask for "now + N
+    days" and now moves forward. Concurrent requests for a window that is
+    already being fetched wait on that fetch instead of calling Google again.
+    """
+
+    def __init__(self, ttl_seconds: float = 120.0, max_keys: int = 1024, max_windows_per_key: int = 4):
+        self.ttl = ttl_seconds
+        self.max_keys = max_keys
+        self.max_windows_per_key = max_windows_per_key
+        self._coverage: "OrderedDict[str, List[_Coverage]]" = OrderedDict()
+        self._inflight: Dict[str, List[Tuple[datetime, datetime, asyncio.Future]]] = {}
+        self._generation: Dict[str, int] = {}
+
+    async def get_busy(self, key: str, time_min: datetime, time_max: datetime, fetch: BusyFetcher) -> List[Interval]:
+        """Busy intervals overlapping [time_min, time_max) for ``key``, fetching on a miss."""
+        cached = self._lookup(key, time_min, time_max)
+        if cached is not None:
+            freebusy_cache_requests_total.labels(result="hit").inc()
+            return cached
+
+        for start, end, future in self._inflight.get(key, []):
+            if start <= time_min and time_max <= end:
+                freebusy_cache_requests_total.labels(result="coalesced").inc()
+                return _clip(await asyncio.shield(future), time_min, time_max)
+
+        freebusy_cache_requests_total.labels(result="miss").inc()
+        fetch_end = time_max + timedelta(seconds=self.ttl)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight.setdefault(key, []).append((time_min, fetch_end, future))
+        generation = self._generation.get(key, 0)
+        try:
+            busy = sorted(await fetch(time_min, fetch_end))
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Waiters get the exception; mark it retrieved so an unawaited future does not warn.
+                future.exception()
+            raise
+        else:
+            future.set_result(busy)
+            # Skip storing if the key was invalidated while the fetch was running.
+            if self._generation.get(key, 0) == generation:
+                self._store(key, _Coverage(time_min, fetch_end, busy, time.monotonic() + self.ttl))
+            return _clip(busy, time_min, time_max)
+        finally:
+            entries = [e for e in self._inflight.get(key, []) if e[2] is not future]
+            if entries:
+                self._inflight[key] = entries
+            else:
+                self._inflight.pop(key, None)
+
+    def invalidate(self, key: str) -> None:
+        """Forget cached coverage for ``key``; in-flight fetches will not be stored."""
+        self._coverage.pop(key, None)
+        self._inflight.pop(key, None)
+        self._generation[key] = self._generation.get(key, 0) + 1
+
+    def clear(self) -> None:
+        for key in list(self._coverage) + list(self._inflight):
+            self.invalidate(key)
+
+    def _lookup(self, key: str, time_min: datetime, time_max: datetime) -> Optional[List[Interval]]:
+        entries = self._coverage.get(key)
+        if not entries:
+            return None
+        now = time.monotonic()
+        live = [c for c in entries if c.expires_at > now]
+        if len(live) != len(entries):
+            if live:
+                self._coverage[key] = live
+            else:
+                del self._coverage[key]
+        for coverage in live:
+            if coverage.start <= time_min and time_max <= coverage.end:
+                self._coverage.move_to_end(key)
+                return _clip(coverage.busy, time_min, time_max)
+        return None
+
+    def _store(self, key: str, coverage: _Coverage) -> None:
+        entries = self._coverage.setdefault(key, [])
+        entries.append(coverage)
+        del entries[:-self.max_windows_per_key]
+        self._coverage.move_to_end(key)
+        while len(self._coverage) > self.max_keys:
+            self._coverage.popitem(last=False)
+
+
+def _clip(busy: List[Interval], time_min: datetime, time_max: datetime) -> List[Interval]:
+    """Busy periods overlapping the window, clipped to it (as Google's freebusy does)."""
+    return [(max(s, time_min), min(e, time_max)) for s, e in busy if s < time_max and e > time_min]
+
+
+freebusy_cache = FreeBusyCache(ttl_seconds=settings.freebusy_cache_ttl_seconds)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from prometheus_client import CollectorRegistry, Counter
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
 
 
 registry = CollectorRegistry()
@@ -10,3 +10,61 @@ reminders_sent_total = Counter("reminders_sent_total", "Number of reminders sent
 gcal_errors_total = Counter("gcal_errors_total", "Number of Google Calendar errors", registry=registry)
 
 
+calendar_sync_runs_total = Counter(
+    "calendar_sync_runs_total", "Number of calendar sync runs", ["mode"], registry=registry
+)
+calendar_sync_events_total = Counter(
+    "calendar_sync_events_total", "Number of event rows upserted or deleted by calendar sync", registry=registry
+)
+calendar_push_notifications_total = Counter(
+    "calendar_push_notifications_total", "Number of Google Calendar push notifications received", ["outcome"], registry=registry
+)
+calendar_push_sync_lag_seconds = Histogram(
+    "calendar_push_sync_lag_seconds",
+    "Time from a push notification arriving to its incremental sync being committed",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    registry=registry,
+)
+freebusy_cache_requests_total = Counter(
+    "freebusy_cache_requests_total", "Freebusy cache lookups by result (hit, miss, coalesced)", ["result"], registry=registry
+)
+availability_checks_total = Counter(
+    "availability_checks_total", "Availability checks by data source (local, google)", ["source"], registry=registry
+)
+user_cache_requests_total = Counter(
+    "user_cache_requests_total", "User cache lookups by kind (user, token) and result (hit, miss)", ["kind", "result"], registry=registry
+)
+user_cache_evictions_total = Counter(
+    "user_cache_evictions_total", "User cache evictions by reason (capacity, expired, invalidated)", ["reason"], registry=registry
+)
+dm_cache_requests_total = Counter(
+    "dm_cache_requests_total", "Discord DM channel cache lookups by result (hit, miss, coalesced, forbidden)", ["result"], registry=registry
+)
+token_refresh_total = Counter(
+    "token_refresh_total", "Background OAuth token refreshes by outcome (refreshed, failed)", ["outcome"], registry=registry
+)
+reminder_lateness_seconds = Histogram(
+    "reminder_lateness_seconds",
+    "Delay between a reminder's remind_at and its delivery",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+    registry=registry,
+)
+reminder_earliness_seconds = Histogram(
+    "reminder_earliness_seconds",
+    "How long before its remind_at a reminder was delivered",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    registry=registry,
+)
+scheduler_is_leader = Gauge(
+    "scheduler_is_leader", "1 while this process holds the scheduler leadership", registry=registry
+)
+outbound_queue_depth = Gauge(
+    "outbound_queue_depth", "Discord messages waiting in the outbound queue by lane", ["lane"], registry=registry
+)
+outbound_queue_wait_seconds = Histogram(
+    "outbound_queue_wait_seconds",
+    "Time Discord messages wait in the outbound queue before sending, by lane",
+    ["lane"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+    registry=registry,
+)
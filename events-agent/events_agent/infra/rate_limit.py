@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from typing import Dict
 
@@ -20,6 +21,11 @@ class TokenBucket:
             return True
         return False
 
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        while not self.allow():
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
 
 _buckets: Dict[str, TokenBucket] = {}
 
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from .db import session_scope
+from .event_repository import ReminderRepository
+from .logging import get_logger
+from .settings import settings
+
+logger = get_logger().bind(service="reminder_dispatcher")
+
+Deliver = Callable[[List[int]], Awaitable[None]]
+
+
+class ReminderDispatcher:
+    """
+    Fires reminders at their due time instead of polling the database.
+
+    Unsent reminders due within ``horizon_seconds`` are held in a min-heap
+    keyed on ``remind_at``; the run loop sleeps until the earliest one is due
+    (or a newly created reminder becomes the earliest) and hands due IDs to
+    the delivery callback. ``reconcile`` reloads the horizon from the
+    database, which picks up reminders created by other processes, overdue
+    reminders after a restart and failed deliveries awaiting retry.
+    A due reminder is held for ``coalesce_seconds`` so reminders falling due
+    meanwhile are handed over with it and can be sent as one digest;
+    reminders are never handed over before they are due.
+    """
+
+    def __init__(self, horizon_seconds: float = 900.0, coalesce_seconds: float = 0.0):
+        self.horizon = timedelta(seconds=horizon_seconds)
+        self.coalesce = timedelta(seconds=coalesce_seconds)
+        self._heap: List[Tuple[datetime, int]] = []
+        self._queued: Set[int] = set()
+        self._inflight: Set[int] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._deliver: Optional[Deliver] = None
+        self._task: Optional[asyncio.Task] = None
+        self._deliveries: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, deliver: Deliver) -> None:
+        """Start the run loop on the current event loop; ``deliver`` receives lists of due reminder IDs."""
+        if self.running:
+            return
+        self._deliver = deliver
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        logger.info("reminder_dispatcher_started", horizon_seconds=self.horizon.total_seconds())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    def notify(self, reminder_id: int, remind_at: datetime) -> None:
+        """Schedule a just-created reminder; ones beyond the horizon are left for reconcile."""
+        if not self.running or reminder_id in self._queued or reminder_id in self._inflight:
+            return
+        remind_at = _as_utc(remind_at)
+        if remind_at > datetime.now(timezone.utc) + self.horizon:
+            return
+        self._push(reminder_id, remind_at)
+
+    async def reconcile(self) -> None:
+        """Load every unsent reminder due within the horizon that is not already scheduled."""
+        until = datetime.now(timezone.utc) + self.horizon
+        async for session in session_scope():
+            pending = await ReminderRepository(session).get_pending_reminders(until, settings.reminder_max_retries)
+            break
+
+        added = 0
+        for reminder_id, remind_at in pending:
+            if reminder_id in self._queued or reminder_id in self._inflight:
+                continue
+            self._push(reminder_id, _as_utc(remind_at))
+            added += 1
+        logger.info("reminder_dispatcher_reconciled", pending=len(pending), added=added, queued=len(self._queued))
+
+    def _push(self, reminder_id: int, remind_at: datetime) -> None:
+        heapq.heappush(self._heap, (remind_at, reminder_id))
+        self._queued.add(reminder_id)
+        if self._wakeup is not None and self._heap[0][1] == reminder_id:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        try:
+            await self.reconcile()
+        except Exception as e:
+            logger.error("reminder_dispatcher_reconcile_failed", error=str(e))
+
+        while True:
+            self._wakeup.clear()
+            now = datetime.now(timezone.utc)
+            due: List[int] = []
+            # Once the earliest reminder has been held for the window, take everything due by now.
+            if self._heap and self._heap[0][0] + self.coalesce <= now:
+                while self._heap and self._heap[0][0] <= now:
+                    _, reminder_id = heapq.heappop(self._heap)
+                    self._queued.discard(reminder_id)
+                    due.append(reminder_id)
+            if due:
+                self._dispatch(due)
+
+            timeout = (self._heap[0][0] + self.coalesce - now).total_seconds() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _dispatch(self, reminder_ids: List[int]) -> None:
+        self._inflight.update(reminder_ids)
+        task = asyncio.create_task(self._deliver_batch(reminder_ids))
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+    async def _deliver_batch(self, reminder_ids: List[int]) -> None:
+        try:
+            await self._deliver(reminder_ids)
+        except Exception as e:
+            # Undelivered reminders stay unsent in the database and come back on the next reconcile.
+            logger.error("reminder_delivery_failed", count=len(reminder_ids), error=str(e))
+        finally:
+            self._inflight.difference_update(reminder_ids)
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+reminder_dispatcher = ReminderDispatcher(settings.reminder_horizon_seconds, settings.reminder_digest_window_seconds)
@@ -1,20 +1,140 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
-from typing import Optional
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import delete, or_, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection
 
-from .metrics import reminders_sent_total
+from ..domain.models import SchedulerLease
+from .db import get_engine, session_scope
+from .reminder_dispatcher import reminder_dispatcher
 from .logging import get_logger
+from .metrics import scheduler_is_leader
+from .settings import settings
 
 
 logger = get_logger().bind(service="scheduler")
 
-# Global reminder service instance
+# Global service instances
 _reminder_service = None
+_sync_service = None
+_channel_manager = None
+_token_refresher = None
+
+
+class LeaderElector:
+    """
+    Elects one process to run the singleton background jobs.
+
+    On Postgres the leader holds a session-level advisory lock on a
+    dedicated connection; if the process dies its connection closes and the
+    lock is released at once. Other databases use a row in
+    ``scheduler_leases`` that the leader renews every heartbeat and any
+    process may take over once it expires. ``heartbeat`` runs every
+    ``scheduler_leader_heartbeat_seconds`` on every process, so a standby
+    takes over within a heartbeat (advisory lock) or a lease (lease row).
+    """
+
+    def __init__(self, name: str = "scheduler", worker_id: Optional[str] = None, lease_seconds: Optional[int] = None):
+        self.name = name
+        self.worker_id = worker_id or settings.worker_id
+        self.lease = timedelta(seconds=lease_seconds or settings.scheduler_leader_lease_seconds)
+        self.lock_key = zlib.crc32(name.encode("utf-8"))
+        self.is_leader = False
+        self._conn: Optional[AsyncConnection] = None
+
+    async def heartbeat(self) -> bool:
+        """Acquire or renew leadership; returns whether this process is the leader."""
+        try:
+            if get_engine().dialect.name == "postgresql":
+                leader = await self._advisory_heartbeat()
+            else:
+                leader = await self._lease_heartbeat()
+        except Exception as e:
+            # Without a confirmed lock or lease, step down rather than risk two leaders.
+            logger.error("leader_heartbeat_failed", error=str(e))
+            leader = False
+        self._set_leader(leader)
+        return leader
+
+    async def resign(self) -> None:
+        """Give up leadership on shutdown so a standby takes over without waiting."""
+        try:
+            if self._conn is not None:
+                await self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+                await self._conn.close()
+                self._conn = None
+            elif self.is_leader:
+                async for session in session_scope():
+                    await session.execute(
+                        delete(SchedulerLease).where(
+                            SchedulerLease.name == self.name, SchedulerLease.holder == self.worker_id
+                        )
+                    )
+                    await session.commit()
+                    break
+        except Exception as e:
+            logger.warning("leader_resign_failed", error=str(e))
+        self._set_leader(False)
+
+    async def _advisory_heartbeat(self) -> bool:
+        if self._conn is None:
+            conn = await get_engine().connect()
+            # Autocommit keeps the held connection out of an idle transaction.
+            self._conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        try:
+            if self.is_leader:
+                await self._conn.execute(text("SELECT 1"))
+                return True
+            acquired = bool(await self._conn.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key}))
+        except Exception:
+            # Never hand a connection that may still hold the lock back to the pool.
+            await self._conn.invalidate()
+            self._conn = None
+            raise
+        if not acquired:
+            await self._conn.close()
+            self._conn = None
+        return acquired
+
+    async def _lease_heartbeat(self) -> bool:
+        now = datetime.now(timezone.utc)
+        async for session in session_scope():
+            result = await session.execute(
+                update(SchedulerLease)
+                .where(
+                    SchedulerLease.name == self.name,
+                    or_(SchedulerLease.holder == self.worker_id, SchedulerLease.expires_at < now),
+                )
+                .values(holder=self.worker_id, expires_at=now + self.lease)
+            )
+            if result.rowcount:
+                await session.commit()
+                return True
+            # No lease row yet, or another process holds a live lease.
+            try:
+                session.add(SchedulerLease(name=self.name, holder=self.worker_id, expires_at=now + self.lease))
+                await session.commit()
+                return True
+            except IntegrityError:
+                await session.rollback()
+                return False
+        return False
+
+    def _set_leader(self, leader: bool) -> None:
+        if leader != self.is_leader:
+            logger.info("leadership_acquired" if leader else "leadership_lost", worker_id=self.worker_id)
+        self.is_leader = leader
+        scheduler_is_leader.set(1 if leader else 0)
+
+
+leader_elector = LeaderElector()
 
 
 def set_reminder_service(reminder_service):
@@ -23,22 +143,117 @@ def set_reminder_service(reminder_service):
     _reminder_service = reminder_service
 
 
-async def _process_due_reminders() -> None:
-    """Process due reminders using the reminder service."""
+def set_sync_service(sync_service):
+    """Set the calendar sync service instance."""
+    global _sync_service
+    _sync_service = sync_service
+
+
+def set_channel_manager(channel_manager):
+    """Set the push channel manager instance."""
+    global _channel_manager
+    _channel_manager = channel_manager
+
+
+def set_token_refresher(token_refresher):
+    """Set the background token refresher instance."""
+    global _token_refresher
+    _token_refresher = token_refresher
+
+
+async def _reconcile_reminders() -> None:
+    """Reload upcoming reminders into the dispatcher, or poll for due ones if it is not running."""
     try:
-        if _reminder_service:
+        if reminder_dispatcher.running:
+            await reminder_dispatcher.reconcile()
+        elif _reminder_service:
             await _reminder_service.process_due_reminders()
-            reminders_sent_total.inc()
         else:
             logger.warning("reminder_service_not_available")
     except Exception as e:
-        logger.error("process_due_reminders_failed", error=str(e))
+        logger.error("reconcile_reminders_failed", error=str(e))
+
+
+async def _sync_calendars() -> None:
+    """Pull calendar deltas for every connected user."""
+    try:
+        if _sync_service:
+            await _sync_service.sync_all()
+        else:
+            logger.warning("sync_service_not_available")
+    except Exception as e:
+        logger.error("sync_calendars_failed", error=str(e))
+
+
+async def _renew_watch_channels() -> None:
+    """Register missing push channels and renew those about to expire."""
+    try:
+        if _channel_manager:
+            await _channel_manager.renew_all()
+    except Exception as e:
+        logger.error("renew_watch_channels_failed", error=str(e))
+
+
+async def _refresh_tokens() -> None:
+    """Refresh Google access tokens that are about to expire."""
+    try:
+        if _token_refresher:
+            await _token_refresher.refresh_due()
+    except Exception as e:
+        logger.error("refresh_tokens_failed", error=str(e))
+
+
+def _leader_only(job: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Wrap a singleton job so it only runs on the elected leader."""
+    async def run() -> None:
+        if leader_elector.is_leader:
+            await job()
+    run.__name__ = job.__name__
+    return run
+
+
+async def _elect_leader() -> None:
+    """Heartbeat the leader election; a newly elected leader reconciles reminders straight away."""
+    was_leader = leader_elector.is_leader
+    if await leader_elector.heartbeat() and not was_leader:
+        await _reconcile_reminders()
 
 
 def start_scheduler() -> AsyncIOScheduler:
-    """Start the scheduler for processing reminders."""
+    """Start the scheduler for processing reminders and calendar sync."""
     scheduler = AsyncIOScheduler()
-    scheduler.add_job(_process_due_reminders, IntervalTrigger(seconds=60))
+    scheduler.add_job(
+        _elect_leader,
+        IntervalTrigger(seconds=settings.scheduler_leader_heartbeat_seconds),
+        next_run_time=datetime.now(timezone.utc),
+        max_instances=1,
+        coalesce=True,
+    )
+    # Singleton jobs: every replica schedules them, only the leader runs them
+    scheduler.add_job(
+        _leader_only(_reconcile_reminders),
+        IntervalTrigger(seconds=settings.reminder_reconcile_interval_seconds),
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _leader_only(_sync_calendars),
+        IntervalTrigger(seconds=settings.calendar_sync_interval_seconds),
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _leader_only(_renew_watch_channels),
+        IntervalTrigger(seconds=settings.calendar_watch_renew_interval_seconds),
+        max_instances=1,
+        coalesce=True,
+    )
+    scheduler.add_job(
+        _leader_only(_refresh_tokens),
+        IntervalTrigger(seconds=settings.token_refresh_interval_seconds),
+        max_instances=1,
+        coalesce=True,
+    )
     
     # Only start if we're in an event loop
     try:
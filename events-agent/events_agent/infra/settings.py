@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import socket
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +13,8 @@ class Settings(BaseSettings):
     http_port: int = int(os.getenv("PORT", "8000"))  # Use Railway's PORT or default to 8000
     default_tz: str = "Australia/Melbourne"
     base_url: str | None = None  # Set this for production (e.g., https://your-app.railway.app)
+    # Identifies this process in reminder claims and leader leases
+    worker_id: str = f"{socket.gethostname()}:{os.getpid()}"
 
     # Discord
     discord_token: str | None = None
@@ -27,6 +30,84 @@ class Settings(BaseSettings):
     google_client_secret: str | None = None
     oauth_redirect_uri: str | None = None
 
+    # Google Calendar transport: "discovery" (googleapiclient + httplib2 in worker
+    # threads) or "httpx" (asyncio-native REST client with keep-alive pooling)
+    gcal_transport: str = "discovery"
+    gcal_api_base_url: str = "https://www.googleapis.com/calendar/v3"
+    google_token_uri: str = "https://oauth2.googleapis.com/token"
+    gcal_http_max_connections: int = 100
+    gcal_http_max_keepalive: int = 20
+    gcal_http_timeout_seconds: float = 30.0
+    gcal_freebusy_concurrency: int = 8
+    freebusy_cache_ttl_seconds: float = 120.0
+
+    # Google Calendar client pool
+    gcal_pool_max_users: int = 256
+    gcal_pool_max_idle_per_user: int = 4
+    gcal_pool_idle_ttl_seconds: float = 900.0
+
+    # In-process cache of user rows and decrypted tokens. Invalidation is
+    # per process, so rows carrying a token (which other replicas refresh)
+    # expire sooner to bound how long a stale token is used.
+    user_cache_max_entries: int = 1024
+    user_cache_ttl_seconds: float = 300.0
+    user_cache_token_ttl_seconds: float = 30.0
+
+    # Background OAuth token refresh
+    token_refresh_interval_seconds: int = 300
+    token_refresh_margin_seconds: int = 900
+    token_refresh_batch_size: int = 50
+    token_refresh_concurrency: int = 5
+
+    # Reminder dispatch: reminders due within the horizon are held in memory
+    # and fired on time; reconcile reloads the horizon from the database
+    reminder_horizon_seconds: float = 900.0
+    reminder_reconcile_interval_seconds: int = 300
+    # Concurrent reminder sends per delivery batch (the send rate is set by the outbound queue)
+    reminder_delivery_concurrency: int = 20
+    # Workers claim reminders before sending; a crashed worker's claims expire after the lease
+    reminder_lease_seconds: int = 120
+    reminder_claim_batch_size: int = 500
+    # Failed sends are retried with exponential backoff, then given up on
+    reminder_max_retries: int = 5
+    reminder_retry_backoff_seconds: float = 30.0
+    reminder_retry_backoff_max_seconds: float = 900.0
+    # Due reminders are held this long so others for the same user or channel falling
+    # due meanwhile go out in the same digest message (adds at most this much lateness)
+    reminder_digest_window_seconds: float = 10.0
+    # Cached DM channels for reminder delivery; users with closed DMs are skipped for the TTL
+    dm_cache_max_entries: int = 2048
+    dm_forbidden_ttl_seconds: float = 86400.0
+    # Outbound Discord queue: global send rate (Discord allows ~50 requests/s),
+    # per-route buckets (~5 messages per 5s per channel or webhook) and per-lane backlog
+    discord_outbound_rate_per_second: float = 40.0
+    discord_outbound_burst: int = 10
+    discord_route_rate_per_second: float = 1.0
+    discord_route_burst: int = 5
+    discord_outbound_max_pending: int = 1000
+    discord_outbound_concurrency: int = 20
+
+    # Scheduler leader election: only the leader runs singleton background jobs
+    scheduler_leader_heartbeat_seconds: int = 2
+    scheduler_leader_lease_seconds: int = 6
+
+    # Calendar sync
+    calendar_sync_interval_seconds: int = 900
+    calendar_sync_concurrency: int = 4
+    calendar_sync_page_size: int = 250
+    calendar_sync_lookback_days: int = 30
+    calendar_sync_push_backstop_seconds: int = 21600
+    # Without a push channel, answer availability from the events table only
+    # if the last sync is at most this old; unset means one sync interval
+    # plus the slack below, so polled users are not sent to freebusy between syncs
+    local_availability_max_staleness_seconds: int | None = None
+    local_availability_staleness_slack_seconds: int = 120
+
+    # Calendar push notifications (events.watch); needs an https base_url
+    calendar_watch_ttl_seconds: int = 604800
+    calendar_watch_renew_interval_seconds: int = 3600
+    calendar_watch_renew_margin_seconds: int = 86400
+
     # Supabase
     supabase_url: str | None = None
     supabase_key: str | None = None
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .logging import get_logger
+
+logger = get_logger().bind(service="unit_of_work")
+
+_SESSION_KEY = "unit_of_work"
+
+
+class UnitOfWork:
+    """
+    One transaction spanning a whole service operation.
+
+    While a unit of work is open on a session, repositories flush instead of
+    committing; the single commit happens when the outermost block exits
+    cleanly. An exception, or a repository reporting a failed write, rolls
+    everything back. Nested blocks on the same session join the outer one.
+    Callbacks registered with ``after_commit`` run once the commit succeeds
+    and are dropped on rollback.
+
+        async with UnitOfWork(session) as uow:
+            await event_repo.upsert_event(...)
+            reminder = await reminder_repo.create_reminder(...)
+            uow.after_commit(reminder_dispatcher.notify, reminder.id, reminder.remind_at)
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.failed = False
+        self._outer: Optional[UnitOfWork] = None
+        self._after_commit: List[Tuple[Callable[..., Any], Tuple[Any, ...]]] = []
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._outer = current_unit_of_work(self.session)
+        if self._outer is None:
+            self.session.info[_SESSION_KEY] = self
+        return self
+
+    def after_commit(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Call ``callback(*args)`` after the outermost block commits; never if it rolls back."""
+        if self._outer is not None:
+            self._outer.after_commit(callback, *args)
+            return
+        self._after_commit.append((callback, args))
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if self._outer is not None:
+            if exc_type is not None:
+                self._outer.failed = True
+            return
+
+        self.session.info.pop(_SESSION_KEY, None)
+        if exc_type is not None or self.failed:
+            await self.session.rollback()
+            logger.warning("unit_of_work_rolled_back", error=str(exc) if exc else None)
+            return
+        try:
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        for callback, args in self._after_commit:
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error("after_commit_callback_failed", error=str(e))
+
+
+def current_unit_of_work(session: AsyncSession) -> Optional[UnitOfWork]:
+    return session.info.get(_SESSION_KEY)
+
+
+class UnitOfWorkRepository:
+    """Commit/rollback helpers for repositories that may run inside a UnitOfWork."""
+
+    session: AsyncSession
+
+    async def _commit(self, *refresh: Any) -> None:
+        """Commit (and refresh ``refresh``), or only flush when a unit of work owns the transaction."""
+        if current_unit_of_work(self.session) is not None:
+            await self.session.flush()
+            return
+        await self.session.commit()
+        for instance in refresh:
+            await self.session.refresh(instance)
+
+    async def _rollback(self) -> None:
+        """Roll back now, or mark the enclosing unit of work so it rolls back on exit."""
+        uow = current_unit_of_work(self.session)
+        if uow is not None:
+            uow.failed = True
+            return
+        await self.session.rollback()
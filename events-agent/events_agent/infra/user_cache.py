@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from ..domain.views import UserView
+from .crypto import decrypt_token
+from .metrics import user_cache_evictions_total, user_cache_requests_total
+from .settings import settings
+
+
+@dataclass
+class _Entry:
+    user: UserView
+    expires_at: float
+    # Decrypted token for user.token_ciphertext, filled on first use
+    token: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+
+class UserCache:
+    """
+    Bounded LRU + TTL cache of user snapshots and their decrypted tokens.
+
+    Keyed by Discord ID. Only users that exist are cached, so creating a
+    user needs no invalidation; every write to a users row must call
+    ``invalidate``. That only reaches this process, so users holding a token
+    are kept for ``token_ttl_seconds`` instead: a token refreshed or
+    reconnected on another replica is picked up within that bound. Decrypted
+    tokens are handed out as copies so an evicted entry's token dict can be
+    cleared without breaking in-flight requests.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0, token_ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.token_ttl = min(ttl_seconds, token_ttl_seconds) if token_ttl_seconds is not None else ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, discord_id: str) -> Optional[UserView]:
+        with self._lock:
+            entry = self._live_entry(discord_id)
+            user_cache_requests_total.labels(kind="user", result="hit" if entry else "miss").inc()
+            return entry.user if entry else None
+
+    def put(self, user: UserView) -> None:
+        with self._lock:
+            old = self._entries.pop(user.discord_id, None)
+            if old is not None:
+                _scrub(old)
+            ttl = self.token_ttl if user.token_ciphertext else self.ttl
+            self._entries[user.discord_id] = _Entry(user, time.monotonic() + ttl)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                _scrub(evicted)
+                user_cache_evictions_total.labels(reason="capacity").inc()
+
+    def token(self, user: UserView) -> Dict[str, Any]:
+        """Decrypted token dict for ``user``, decrypting at most once per cached ciphertext."""
+        if not user.token_ciphertext:
+            raise ValueError("No token found for user")
+        with self._lock:
+            entry = self._live_entry(user.discord_id)
+            if entry and entry.token is not None and entry.user.token_ciphertext == user.token_ciphertext:
+                user_cache_requests_total.labels(kind="token", result="hit").inc()
+                return dict(entry.token)
+        user_cache_requests_total.labels(kind="token", result="miss").inc()
+
+        token = json.loads(decrypt_token(user.token_ciphertext))
+        with self._lock:
+            entry = self._entries.get(user.discord_id)
+            if entry and entry.user.token_ciphertext == user.token_ciphertext:
+                entry.token = token
+        return dict(token)
+
+    def invalidate(self, discord_id: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(discord_id, None)
+            if entry is not None:
+                _scrub(entry)
+                user_cache_evictions_total.labels(reason="invalidated").inc()
+
+    def invalidate_user_id(self, user_id: int) -> None:
+        with self._lock:
+            discord_ids = [key for key, entry in self._entries.items() if entry.user.id == user_id]
+        for discord_id in discord_ids:
+            self.invalidate(discord_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                _scrub(entry)
+            self._entries.clear()
+
+    def _live_entry(self, discord_id: str) -> Optional[_Entry]:
+        entry = self._entries.get(discord_id)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[discord_id]
+            _scrub(entry)
+            user_cache_evictions_total.labels(reason="expired").inc()
+            return None
+        self._entries.move_to_end(discord_id)
+        return entry
+
+
+def _scrub(entry: _Entry) -> None:
+    # Python strings cannot be zeroed in place; dropping the cache's only
+    # references is the best we can do to shorten the plaintext's lifetime.
+    if entry.token is not None:
+        entry.token.clear()
+        entry.token = None
+
+
+user_cache = UserCache(
+    settings.user_cache_max_entries, settings.user_cache_ttl_seconds, settings.user_cache_token_ttl_seconds
+)
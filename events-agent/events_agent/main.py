@@ -7,10 +7,16 @@ from .app.http import create_app
 from .bot.discord_bot import run_discord_bot, build_bot
 from .infra.logging import configure_logging, get_logger
 from .infra.settings import settings
-from .infra.scheduler import start_scheduler, set_reminder_service
+from .infra.scheduler import leader_elector, start_scheduler, set_reminder_service, set_sync_service, set_channel_manager, set_token_refresher
 from .infra.db import get_engine
+from .adapters.gcal_http import async_transport
+from .infra.reminder_dispatcher import reminder_dispatcher
+from .bot.outbound import outbound
 from .domain.models import Base
 from .services.reminder_service import ReminderService
+from .services.sync_service import CalendarSyncService
+from .services.channel_service import WatchChannelManager
+from .services.token_refresher import TokenRefresher, save_refreshed_token
 
 
 async def main_async() -> None:
@@ -27,8 +33,16 @@ async def main_async() -> None:
         await conn.run_sync(Base.metadata.create_all)
     logger.info("database_tables_created")
 
+    # Mirror connected calendars into the events table, driven by push notifications
+    sync_service = CalendarSyncService()
+    set_sync_service(sync_service)
+    channel_manager = WatchChannelManager(sync_service)
+    set_channel_manager(channel_manager)
+    set_token_refresher(TokenRefresher())
+    async_transport.on_token_refreshed = save_refreshed_token
+
     # Create FastAPI app
-    app = create_app()
+    app = create_app(channel_manager)
     
     # Build Discord bot
     discord_client = build_bot()
@@ -36,6 +50,7 @@ async def main_async() -> None:
     # Create reminder service with Discord client
     reminder_service = ReminderService(discord_client)
     set_reminder_service(reminder_service)
+    reminder_dispatcher.start(reminder_service.deliver_reminders)
     
     # Start scheduler
     scheduler = start_scheduler()
@@ -80,6 +95,10 @@ async def main_async() -> None:
     finally:
         logger.info("shutting_down")
         scheduler.shutdown()
+        await leader_elector.resign()
+        await reminder_dispatcher.stop()
+        await outbound.stop()
+        await async_transport.aclose()
 
 
 def main() -> None:
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
-import asyncio
-import json
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
 
+from ..adapters import gcal
+from ..infra.freebusy_cache import freebusy_cache
 from ..infra.logging import get_logger
-from ..infra.crypto import encrypt_token, decrypt_token
-from ..infra.event_repository import EventRepository, UserRepository, ReminderRepository
-from ..domain.models import User, Event
+from ..infra.event_repository import (
+    EventRepository, GuildSettingsRepository, InvalidCursor, UserRepository, ReminderRepository, SyncStateRepository
+)
+from ..infra.metrics import availability_checks_total
+from ..infra.reminder_dispatcher import reminder_dispatcher
+from ..infra.unit_of_work import UnitOfWork
+from ..infra.user_cache import user_cache
+from ..domain.views import UserView
+from ..domain.slots import find_free_slots, merge_intervals
+from .sync_service import is_sync_fresh
 
 logger = get_logger().bind(service="calendar_service")
 
@@ -21,30 +26,19 @@ logger = get_logger().bind(service="calendar_service")
 class GoogleCalendarService:
     """Service for managing Google Calendar operations."""
     
-    def __init__(self, user_repo: UserRepository, event_repo: EventRepository, reminder_repo: ReminderRepository):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        event_repo: EventRepository,
+        reminder_repo: ReminderRepository,
+        sync_repo: Optional[SyncStateRepository] = None,
+        guild_repo: Optional[GuildSettingsRepository] = None
+    ):
         self.user_repo = user_repo
         self.event_repo = event_repo
         self.reminder_repo = reminder_repo
-    
-    def _build_client(self, token: Dict[str, Any]) -> Any:
-        """Build Google Calendar API client from token."""
-        try:
-            creds = Credentials(
-                token=token.get("access_token"),
-                refresh_token=token.get("refresh_token"),
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=token.get("client_id"),
-                client_secret=token.get("client_secret"),
-                scopes=[
-                    "openid",
-                    "email",
-                    "https://www.googleapis.com/auth/calendar",
-                ],
-            )
-            return build("calendar", "v3", credentials=creds, cache_discovery=False)
-        except Exception as e:
-            logger.error("build_client_failed", error=str(e))
-            raise
+        self.sync_repo = sync_repo or SyncStateRepository(event_repo.session)
+        self.guild_repo = guild_repo or GuildSettingsRepository(event_repo.session)
     
     @retry(
         retry=retry_if_exception_type((HttpError, Exception)),
@@ -61,11 +55,15 @@ class GoogleCalendarService:
         description: Optional[str] = None,
         location: Optional[str] = None,
         attendees: Optional[List[str]] = None,
-        reminder_minutes: Optional[int] = None
+        reminder_minutes: Optional[int] = None,
+        guild_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a calendar event and store it in the database.
         
+        When the event is created from a guild with a default channel
+        configured, its reminder is delivered to that channel instead of by DM.
+        
         Returns:
             Dict containing event details and confirmation message
         """
@@ -119,38 +117,40 @@ class GoogleCalendarService:
                 }
             
             # Create event in Google Calendar
-            service = self._build_client(token)
-            google_event = await asyncio.to_thread(
-                service.events().insert(calendarId="primary", body=event_body).execute
-            )
-            
-            # Store event in database
-            db_event = await self.event_repo.create_event(
-                user_id=user.id,
-                discord_user_id=discord_user_id,
-                google_event_id=google_event["id"],
-                title=title,
-                description=description,
-                location=location,
-                start_time=start_time,
-                end_time=end_time,
-                attendees=attendees,
-                google_calendar_link=google_event.get("htmlLink")
-            )
-            
-            # Create reminder if specified
-            if reminder_minutes:
-                reminder_time = start_time - timedelta(minutes=reminder_minutes)
-                if reminder_time > datetime.now(timezone.utc):
-                    await self.reminder_repo.create_reminder(
-                        user_id=user.id,
-                        event_id=google_event["id"],
-                        channel_id=None,  # Will be set when sending reminder
-                        remind_at=reminder_time
-                    )
+            google_event = await gcal.create_event(token, event_body, user_key=discord_user_id)
+            freebusy_cache.invalidate(discord_user_id)
+            
+            # Store the event and its reminder in one transaction
+            async with UnitOfWork(self.event_repo.session) as uow:
+                event_id = await self.event_repo.upsert_event(
+                    user_id=user.id,
+                    discord_user_id=discord_user_id,
+                    google_event_id=google_event["id"],
+                    title=title,
+                    description=description,
+                    location=location,
+                    start_time=start_time,
+                    end_time=end_time,
+                    attendees=attendees,
+                    google_calendar_link=google_event.get("htmlLink")
+                )
+                
+                # Create reminder if specified
+                if reminder_minutes:
+                    reminder_time = start_time - timedelta(minutes=reminder_minutes)
+                    if reminder_time > datetime.now(timezone.utc):
+                        channel_id = await self.guild_repo.get_default_channel_id(guild_id) if guild_id else None
+                        reminder = await self.reminder_repo.create_reminder(
+                            user_id=user.id,
+                            event_id=google_event["id"],
+                            channel_id=channel_id,  # None means deliver by DM
+                            remind_at=reminder_time
+                        )
+                        # Only schedule the reminder once it is committed
+                        uow.after_commit(reminder_dispatcher.notify, reminder.id, reminder.remind_at)
             
             logger.info("event_created_successfully", 
-                       event_id=db_event.id, 
+                       event_id=event_id, 
                        google_event_id=google_event["id"],
                        user_id=discord_user_id)
             
@@ -158,7 +158,7 @@ class GoogleCalendarService:
                 "success": True,
                 "message": f"✅ Event '{title}' created successfully!",
                 "event": {
-                    "id": db_event.id,
+                    "id": event_id,
                     "google_id": google_event["id"],
                     "title": title,
                     "start_time": start_time.isoformat(),
@@ -205,17 +205,7 @@ class GoogleCalendarService:
                 }
             
             # Format events for display
-            events = []
-            for event in db_events:
-                events.append({
-                    "id": event.id,
-                    "title": event.title,
-                    "start_time": event.start_time.isoformat(),
-                    "end_time": event.end_time.isoformat(),
-                    "location": event.location,
-                    "description": event.description,
-                    "calendar_link": event.google_calendar_link
-                })
+            events = [_event_dict(event) for event in db_events]
             
             return {
                 "success": True,
@@ -230,6 +220,44 @@ class GoogleCalendarService:
                 "message": f"❌ Failed to list events: {str(e)}"
             }
     
+    async def list_events_page(
+        self,
+        discord_user_id: str,
+        limit: int = 5,
+        after: Optional[str] = None,
+        before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """List one page of upcoming events; pass a returned cursor to move between pages."""
+        try:
+            user = await self._get_user_with_token(discord_user_id)
+            if not user:
+                return {
+                    "success": False,
+                    "message": "User not found or not connected to Google Calendar"
+                }
+            
+            page = await self.event_repo.get_upcoming_events_page(discord_user_id, limit, after=after, before=before)
+            return {
+                "success": True,
+                "message": f"Found {len(page.events)} upcoming events:" if page.events else "No upcoming events found.",
+                "events": [_event_dict(event) for event in page.events],
+                "next_cursor": page.next_cursor,
+                "prev_cursor": page.prev_cursor
+            }
+            
+        except InvalidCursor as e:
+            logger.warning("invalid_event_cursor", error=str(e), user_id=discord_user_id)
+            return {
+                "success": False,
+                "message": "❌ That page is no longer valid. Run /myevents again."
+            }
+        except Exception as e:
+            logger.error("list_events_page_failed", error=str(e), user_id=discord_user_id)
+            return {
+                "success": False,
+                "message": f"❌ Failed to list events: {str(e)}"
+            }
+    
     async def check_availability(
         self,
         discord_user_id: str,
@@ -245,31 +273,24 @@ class GoogleCalendarService:
                     "message": "User not found or not connected to Google Calendar"
                 }
             
-            token = await self._get_valid_token(user)
-            service = self._build_client(token)
-            
-            # Check free/busy
-            time_min = start_time.astimezone(timezone.utc).isoformat()
-            time_max = end_time.astimezone(timezone.utc).isoformat()
-            
-            freebusy_body = {
-                "timeMin": time_min,
-                "timeMax": time_max,
-                "items": [{"id": "primary"}]
-            }
+            time_min = start_time.astimezone(timezone.utc)
+            time_max = end_time.astimezone(timezone.utc)
             
-            freebusy_result = await asyncio.to_thread(
-                service.freebusy().query(body=freebusy_body).execute
-            )
-            
-            busy_periods = freebusy_result.get("calendars", {}).get("primary", {}).get("busy", [])
+            # Answer from the synced events table when it is fresh; otherwise ask Google
+            busy_periods = await self._get_local_busy_periods(discord_user_id, time_min, time_max)
+            if busy_periods is None:
+                token = await self._get_valid_token(user)
+                busy_periods = await self._get_busy_periods(discord_user_id, token, time_min, time_max)
+                availability_checks_total.labels(source="google").inc()
+            else:
+                availability_checks_total.labels(source="local").inc()
             
             if busy_periods:
                 conflicts = []
-                for period in busy_periods:
+                for busy_start, busy_end in busy_periods:
                     conflicts.append({
-                        "start": period["start"],
-                        "end": period["end"]
+                        "start": busy_start.isoformat(),
+                        "end": busy_end.isoformat()
                     })
                 
                 return {
@@ -299,9 +320,17 @@ class GoogleCalendarService:
         duration_minutes: int = 60,
         days_ahead: int = 7,
         preferred_start_hour: int = 9,
-        preferred_end_hour: int = 17
+        preferred_end_hour: int = 17,
+        attendee_discord_ids: Optional[List[str]] = None,
+        min_attendees: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Suggest optimal meeting times for a user."""
+        """
+        Suggest optimal meeting times for a user.
+        
+        With ``attendee_discord_ids`` the organizer's and attendees' calendars
+        are ranked together by how many people are free; ``min_attendees``
+        also admits slots where only that many are free.
+        """
         try:
             user = await self._get_user_with_token(discord_user_id)
             if not user:
@@ -311,27 +340,26 @@ class GoogleCalendarService:
                 }
             
             token = await self._get_valid_token(user)
-            service = self._build_client(token)
+            
+            attendee_ids = [a for a in dict.fromkeys(attendee_discord_ids or []) if a != discord_user_id]
+            if attendee_ids:
+                return await self._suggest_group_meeting_times(
+                    discord_user_id, token, attendee_ids, duration_minutes, days_ahead,
+                    preferred_start_hour, preferred_end_hour, min_attendees
+                )
             
             # Calculate time range
-            now = datetime.now(timezone.utc)
-            time_min = now.isoformat()
-            time_max = (now + timedelta(days=days_ahead)).isoformat()
+            time_min = datetime.now(timezone.utc)
+            time_max = time_min + timedelta(days=days_ahead)
             
             # Get free/busy data
-            freebusy_body = {
-                "timeMin": time_min,
-                "timeMax": time_max,
-                "items": [{"id": "primary"}]
-            }
-            
-            freebusy_result = await asyncio.to_thread(
-                service.freebusy().query(body=freebusy_body).execute
-            )
+            busy_periods = await self._get_busy_periods(discord_user_id, token, time_min, time_max)
             
             # Find available slots
             suggestions = self._find_available_slots(
-                freebusy_result,
+                busy_periods,
+                time_min,
+                time_max,
                 duration_minutes,
                 preferred_start_hour,
                 preferred_end_hour
@@ -350,65 +378,125 @@ class GoogleCalendarService:
                 "message": f"❌ Failed to suggest meeting times: {str(e)}"
             }
     
+    async def _suggest_group_meeting_times(
+        self,
+        discord_user_id: str,
+        token: Dict[str, Any],
+        attendee_ids: List[str],
+        duration_minutes: int,
+        days_ahead: int,
+        preferred_start_hour: int,
+        preferred_end_hour: int,
+        min_attendees: Optional[int]
+    ) -> Dict[str, Any]:
+        """Rank slots across the organizer and every connected attendee."""
+        attendee_tokens: List[Dict[str, Any]] = []
+        not_connected: List[str] = []
+        for attendee_id in attendee_ids:
+            attendee = await self._get_user_with_token(attendee_id)
+            if attendee is None:
+                not_connected.append(attendee_id)
+                continue
+            attendee_tokens.append({**user_cache.token(attendee), "attendee": attendee_id})
+        
+        suggestions = await gcal.suggest_quorum_meeting_times(
+            {**token, "attendee": discord_user_id},
+            attendee_tokens,
+            duration_minutes,
+            days_ahead,
+            preferred_start_hour,
+            preferred_end_hour,
+            min_attendees=min_attendees
+        )
+        return {
+            "success": True,
+            "suggestions": suggestions,
+            "not_connected": not_connected,
+            "message": f"Found {len(suggestions)} time slots for {len(attendee_tokens) + 1} people."
+        }
+    
+    async def _get_local_busy_periods(
+        self,
+        discord_user_id: str,
+        time_min: datetime,
+        time_max: datetime
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        """
+        Busy periods from the events table, or None when the user's sync state is stale.
+
+        Free and declined events are skipped, so the result matches freebusy.
+        """
+        try:
+            state = await self.sync_repo.get_state(discord_user_id)
+            if not is_sync_fresh(state):
+                return None
+            events = await self.event_repo.find_overlapping_events(discord_user_id, time_min, time_max)
+            return [
+                (max(_as_utc(start), time_min), min(_as_utc(end), time_max))
+                for start, end in merge_intervals(events)
+            ]
+        except Exception as e:
+            logger.warning("local_availability_failed", error=str(e), user_id=discord_user_id)
+            return None
+    
+    async def _get_busy_periods(
+        self,
+        discord_user_id: str,
+        token: Dict[str, Any],
+        time_min: datetime,
+        time_max: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """Busy periods on the user's primary calendar, served from the freebusy cache."""
+        async def fetch(fetch_min: datetime, fetch_max: datetime) -> List[Tuple[datetime, datetime]]:
+            freebusy_body = {
+                "timeMin": fetch_min.isoformat(),
+                "timeMax": fetch_max.isoformat(),
+                "items": [{"id": "primary"}]
+            }
+            freebusy_result = await gcal.freebusy_query(token, freebusy_body, user_key=discord_user_id)
+            busy_periods = freebusy_result.get("calendars", {}).get("primary", {}).get("busy", [])
+            return [
+                (
+                    datetime.fromisoformat(period["start"].replace("Z", "+00:00")),
+                    datetime.fromisoformat(period["end"].replace("Z", "+00:00"))
+                )
+                for period in busy_periods
+            ]
+        
+        return await freebusy_cache.get_busy(discord_user_id, time_min, time_max, fetch)
+    
     def _find_available_slots(
         self,
-        freebusy_data: Dict[str, Any],
+        busy_times: List[Tuple[datetime, datetime]],
+        time_min: datetime,
+        time_max: datetime,
         duration_minutes: int,
         preferred_start_hour: int,
         preferred_end_hour: int
     ) -> List[Dict[str, Any]]:
-        """Find available time slots from free/busy data."""
-        suggestions = []
-        
-        # Get busy periods
-        busy_periods = freebusy_data.get("calendars", {}).get("primary", {}).get("busy", [])
-        
-        # Convert to datetime objects
-        busy_times = []
-        for period in busy_periods:
-            start = datetime.fromisoformat(period["start"].replace("Z", "+00:00"))
-            end = datetime.fromisoformat(period["end"].replace("Z", "+00:00"))
-            busy_times.append((start, end))
-        
-        # Sort busy times
-        busy_times.sort(key=lambda x: x[0])
-        
-        # Find time range
-        time_min = datetime.fromisoformat(freebusy_data["timeMin"].replace("Z", "+00:00"))
-        time_max = datetime.fromisoformat(freebusy_data["timeMax"].replace("Z", "+00:00"))
-        
-        # Generate potential slots
-        current = time_min
-        duration = timedelta(minutes=duration_minutes)
+        """Find available time slots from busy periods."""
+        slots = find_free_slots(
+            busy_times,
+            time_min,
+            time_max,
+            timedelta(minutes=duration_minutes),
+            working_hours=(preferred_start_hour, preferred_end_hour),
+            limit=10,
+        )
         
-        while current + duration <= time_max:
-            # Check if within preferred hours
-            if preferred_start_hour <= current.hour < preferred_end_hour:
-                slot_end = current + duration
-                
-                # Check for conflicts
-                has_conflict = False
-                for busy_start, busy_end in busy_times:
-                    if current < busy_end and slot_end > busy_start:
-                        has_conflict = True
-                        break
-                
-                if not has_conflict:
-                    suggestions.append({
-                        "start_time": current.isoformat(),
-                        "end_time": slot_end.isoformat(),
-                        "duration_minutes": duration_minutes
-                    })
-            
-            # Move to next slot (30-minute increments)
-            current += timedelta(minutes=30)
-        
-        return suggestions[:10]  # Return top 10 suggestions
+        return [
+            {
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+                "duration_minutes": duration_minutes
+            }
+            for start, end in slots
+        ]
     
-    async def _get_user_with_token(self, discord_user_id: str) -> Optional[User]:
+    async def _get_user_with_token(self, discord_user_id: str) -> Optional[UserView]:
         """Get user with valid token."""
         try:
-            user = await self.user_repo.get_user_by_discord_id(discord_user_id)
+            user = await self.user_repo.get_user_view(discord_user_id)
             if user and user.token_ciphertext:
                 return user
             return None
@@ -416,15 +504,11 @@ class GoogleCalendarService:
             logger.error("get_user_with_token_failed", error=str(e))
             return None
     
-    async def _get_valid_token(self, user: User) -> Dict[str, Any]:
+    async def _get_valid_token(self, user: UserView) -> Dict[str, Any]:
         """Get and validate user's Google token."""
         try:
-            if not user.token_ciphertext:
-                raise ValueError("No token found for user")
-            
-            # Decrypt token
-            token_data = decrypt_token(user.token_ciphertext)
-            token = json.loads(token_data)
+            # Decrypt token (cached per ciphertext)
+            token = user_cache.token(user)
             
             # Validate token has required fields
             required_fields = ["access_token", "refresh_token", "client_id", "client_secret"]
@@ -437,3 +521,20 @@ class GoogleCalendarService:
         except Exception as e:
             logger.error("get_valid_token_failed", error=str(e))
             raise ValueError(f"Invalid or expired token: {str(e)}")
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes; everything is stored in UTC.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _event_dict(event: Any) -> Dict[str, Any]:
+    return {
+        "id": event.id,
+        "title": event.title,
+        "start_time": event.start_time.isoformat(),
+        "end_time": event.end_time.isoformat(),
+        "location": event.location,
+        "description": event.description,
+        "calendar_link": event.google_calendar_link
+    }
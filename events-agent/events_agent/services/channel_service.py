@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Mapping, Optional
+
+from ..adapters import gcal
+from ..infra.db import session_scope
+from ..infra.event_repository import SyncStateRepository, UserRepository
+from ..infra.logging import get_logger
+from ..infra.metrics import calendar_push_notifications_total, calendar_push_sync_lag_seconds
+from ..infra.settings import settings
+from ..infra.user_cache import user_cache
+from .sync_service import CalendarSyncService
+
+logger = get_logger().bind(service="calendar_channels")
+
+WEBHOOK_PATH = "/webhooks/google/calendar"
+
+
+class WatchChannelManager:
+    """
+    Manages Google Calendar ``events.watch`` push channels.
+
+    Each connected user gets one channel on their primary calendar. Channels
+    are renewed before they expire, and each notification triggers an
+    incremental sync for just that user. Notifications that arrive while a
+    sync is running are folded into one follow-up sync.
+    """
+
+    def __init__(self, sync_service: CalendarSyncService):
+        self.sync_service = sync_service
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._received_at: Dict[str, float] = {}
+
+    @property
+    def webhook_address(self) -> Optional[str]:
+        if not settings.base_url:
+            return None
+        return f"{settings.base_url.rstrip('/')}{WEBHOOK_PATH}"
+
+    async def renew_all(self) -> None:
+        """Register channels for connected users and renew those close to expiry."""
+        if not self.webhook_address or not self.webhook_address.startswith("https://"):
+            logger.info("calendar_watch_disabled", reason="base_url must be an https URL")
+            return
+
+        renew_before = datetime.now(timezone.utc) + timedelta(seconds=settings.calendar_watch_renew_margin_seconds)
+        async for session in session_scope():
+            discord_ids = await UserRepository(session).get_connected_discord_ids()
+            states = {s.discord_user_id: s for s in await SyncStateRepository(session).list_states()}
+            break
+
+        renewed = 0
+        for discord_id in discord_ids:
+            state = states.get(discord_id)
+            expires_at = _as_utc(state.channel_expires_at) if state else None
+            if expires_at and expires_at > renew_before:
+                continue
+            if await self.register(discord_id):
+                renewed += 1
+        logger.info("calendar_watch_renewal_complete", users=len(discord_ids), renewed=renewed)
+
+    async def register(self, discord_user_id: str) -> bool:
+        """Open a new channel for a user, replacing (and stopping) any existing one."""
+        try:
+            async for session in session_scope():
+                user = await UserRepository(session).get_user_view(discord_user_id)
+                if not user or not user.token_ciphertext:
+                    return False
+                token = user_cache.token(user)
+                sync_repo = SyncStateRepository(session)
+                old = await sync_repo.get_state(discord_user_id)
+
+                channel_token = secrets.token_urlsafe(32)
+                response = await gcal.watch_events(
+                    token,
+                    {
+                        "id": str(uuid.uuid4()),
+                        "type": "web_hook",
+                        "address": self.webhook_address,
+                        "token": channel_token,
+                        "params": {"ttl": str(settings.calendar_watch_ttl_seconds)},
+                    },
+                    user_key=discord_user_id,
+                )
+                expires_at = None
+                if response.get("expiration"):
+                    expires_at = datetime.fromtimestamp(int(response["expiration"]) / 1000, tz=timezone.utc)
+
+                if old and old.channel_id and old.channel_resource_id:
+                    await self._stop(token, discord_user_id, old.channel_id, old.channel_resource_id)
+
+                await sync_repo.save_channel(
+                    user_id=user.id,
+                    discord_user_id=discord_user_id,
+                    channel_id=response["id"],
+                    resource_id=response.get("resourceId"),
+                    channel_token=channel_token,
+                    expires_at=expires_at,
+                )
+                logger.info("calendar_watch_registered", user_id=discord_user_id, expires_at=expires_at)
+                return True
+        except Exception as e:
+            logger.error("calendar_watch_register_failed", user_id=discord_user_id, error=str(e))
+        return False
+
+    async def expire(self, discord_user_id: str) -> bool:
+        """Stop a user's channel and forget it, e.g. when they disconnect."""
+        try:
+            async for session in session_scope():
+                sync_repo = SyncStateRepository(session)
+                state = await sync_repo.get_state(discord_user_id)
+                if not state or not state.channel_id:
+                    return False
+                user = await UserRepository(session).get_user_view(discord_user_id)
+                if user and user.token_ciphertext and state.channel_resource_id:
+                    token = user_cache.token(user)
+                    await self._stop(token, discord_user_id, state.channel_id, state.channel_resource_id)
+                return await sync_repo.save_channel(state.user_id, discord_user_id, None, None, None, None)
+        except Exception as e:
+            logger.error("calendar_watch_expire_failed", user_id=discord_user_id, error=str(e))
+        return False
+
+    async def handle_notification(self, headers: Mapping[str, str]) -> bool:
+        """
+        Handle one push notification.
+
+        Returns False when the channel token does not match, so the webhook can
+        reject forged requests; unknown channels are acknowledged and ignored.
+        """
+        received = time.monotonic()
+        channel_id = headers.get("x-goog-channel-id")
+        resource_state = headers.get("x-goog-resource-state", "")
+        if not channel_id:
+            return False
+
+        async for session in session_scope():
+            state = await SyncStateRepository(session).get_state_by_channel(channel_id)
+            break
+
+        if state is None:
+            calendar_push_notifications_total.labels(outcome="unknown_channel").inc()
+            logger.info("calendar_push_unknown_channel", channel_id=channel_id)
+            return True
+        if not hmac.compare_digest(headers.get("x-goog-channel-token", ""), state.channel_token or ""):
+            calendar_push_notifications_total.labels(outcome="bad_token").inc()
+            logger.warning("calendar_push_bad_token", channel_id=channel_id)
+            return False
+        if resource_state == "sync":
+            # Handshake sent when the channel is created; nothing changed yet.
+            calendar_push_notifications_total.labels(outcome="sync").inc()
+            return True
+
+        calendar_push_notifications_total.labels(outcome="accepted").inc()
+        self._received_at.setdefault(state.discord_user_id, received)
+        task = self._tasks.get(state.discord_user_id)
+        if task is None or task.done():
+            self._tasks[state.discord_user_id] = asyncio.create_task(self._drain(state.discord_user_id))
+        return True
+
+    async def _drain(self, discord_user_id: str) -> None:
+        """Run incremental syncs until no notification is left unserved."""
+        try:
+            while discord_user_id in self._received_at:
+                received = self._received_at.pop(discord_user_id)
+                result = await self.sync_service.sync_user(discord_user_id)
+                if result.get("success"):
+                    calendar_push_sync_lag_seconds.observe(time.monotonic() - received)
+        finally:
+            self._tasks.pop(discord_user_id, None)
+
+    async def _stop(self, token: Dict[str, Any], discord_user_id: str, channel_id: str, resource_id: str) -> None:
+        try:
+            await gcal.stop_channel(token, channel_id, resource_id, user_key=discord_user_id)
+        except Exception as e:
+            # Channels expire on their own; a failed stop only costs stray notifications.
+            logger.warning("calendar_watch_stop_failed", user_id=discord_user_id, error=str(e))
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
@@ -2,17 +2,28 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 
 import discord
 
+from ..bot.dm_cache import dm_cache
+from ..bot.outbound import Lane, outbound
 from ..infra.logging import get_logger
-from ..infra.event_repository import EventRepository, UserRepository, ReminderRepository
-from ..domain.models import Reminder, Event, User
+from ..infra.event_repository import UserRepository, ReminderRepository
+from ..domain.views import EventView, ReminderView
 from ..infra.db import session_scope
+from ..infra.reminder_dispatcher import reminder_dispatcher
+from ..infra.metrics import reminder_earliness_seconds, reminder_lateness_seconds, reminders_sent_total
+from ..infra.settings import settings
+from ..infra.unit_of_work import UnitOfWork
 
 logger = get_logger().bind(service="reminder")
 
+# Discord embeds hold at most 25 fields (one per event in a digest), and mentions
+# must fit the 2000-character message and 1024-character field limits
+DIGEST_MAX_EVENTS = 25
+DIGEST_MAX_REMINDERS = 40
+
 
 class ReminderService:
     """Service for managing event reminders and Discord notifications."""
@@ -21,93 +32,209 @@ class ReminderService:
         self.discord_client = discord_client
     
     async def process_due_reminders(self) -> None:
-        """Process all due reminders and send Discord notifications."""
+        """Claim and send due reminders in batches until none are left."""
         try:
             async for session in session_scope():
                 reminder_repo = ReminderRepository(session)
-                event_repo = EventRepository(session)
-                user_repo = UserRepository(session)
-                
-                # Get all due reminders
-                now = datetime.now(timezone.utc)
-                due_reminders = await reminder_repo.get_due_reminders(now)
-                
-                logger.info("processing_reminders", count=len(due_reminders))
-                
-                for reminder in due_reminders:
-                    try:
-                        await self._send_reminder_notification(reminder, event_repo, user_repo)
-                        await reminder_repo.mark_reminder_sent(reminder.id)
-                        
-                    except Exception as e:
-                        logger.error("reminder_send_failed", 
-                                   reminder_id=reminder.id, 
-                                   error=str(e))
-                        
-                        # Increment retry count
-                        await reminder_repo.increment_reminder_retries(reminder.id)
+                # A reminder is attempted at most once per pass; failures wait out their backoff
+                attempted: Set[int] = set()
                 
+                while True:
+                    # Only reminders this worker claims are sent, so replicas never double-send
+                    claimed = await reminder_repo.claim_reminders(
+                        settings.worker_id,
+                        settings.reminder_lease_seconds,
+                        datetime.now(timezone.utc),
+                        settings.reminder_max_retries,
+                        limit=settings.reminder_claim_batch_size
+                    )
+                    due_reminders = [reminder for reminder in claimed if reminder.id not in attempted]
+                    if not due_reminders:
+                        break
+                    attempted.update(reminder.id for reminder in due_reminders)
+                    logger.info("processing_reminders", count=len(due_reminders))
+                    await self._deliver(due_reminders, reminder_repo)
                 break
                 
         except Exception as e:
             logger.error("process_due_reminders_failed", error=str(e))
     
-    async def _send_reminder_notification(
-        self, 
-        reminder: Reminder, 
-        event_repo: EventRepository, 
-        user_repo: UserRepository
-    ) -> None:
-        """Send a reminder notification to Discord."""
+    async def deliver_reminders(self, reminder_ids: List[int]) -> None:
+        """Claim and send the given reminders; used by the reminder dispatcher."""
+        async for session in session_scope():
+            reminder_repo = ReminderRepository(session)
+            reminders = await reminder_repo.claim_reminders(
+                settings.worker_id,
+                settings.reminder_lease_seconds,
+                datetime.now(timezone.utc),
+                settings.reminder_max_retries,
+                reminder_ids=reminder_ids,
+                limit=len(reminder_ids)
+            )
+            await self._deliver(reminders, reminder_repo)
+            break
+    
+    async def _deliver(self, reminders: List[ReminderView], reminder_repo: ReminderRepository) -> None:
+        """
+        Send a batch of reminders as digests and record the results in bulk.
+
+        Reminders arrive fully hydrated, so sends do no database reads. They
+        are grouped per delivery target (the guild channel they are routed to,
+        otherwise the user's DMs) and each group goes out as one message;
+        groups fan out under a semaphore through the outbound queue. Results
+        are tracked per recipient, so a retry never re-sends to a user who
+        already got the message. Successes and failures are written in a
+        single transaction.
+        """
+        if not reminders:
+            return
+        
+        semaphore = asyncio.Semaphore(settings.reminder_delivery_concurrency)
+        groups = _group_reminders(reminders)
+        
+        async def _send(group: List[ReminderView]) -> List[ReminderView]:
+            async with semaphore:
+                try:
+                    return await self._send_digest(group)
+                except Exception as e:
+                    logger.error("reminder_send_failed", 
+                               reminder_ids=[reminder.id for reminder in group], 
+                               error=str(e))
+                    return []
+        
+        results = await asyncio.gather(*(_send(group) for group in groups))
+        sent = [reminder for done in results for reminder in done]
+        sent_ids = {reminder.id for reminder in sent}
+        failed = [reminder for reminder in reminders if reminder.id not in sent_ids]
+        
+        now = datetime.now(timezone.utc)
+        async with UnitOfWork(reminder_repo.session):
+            await reminder_repo.mark_reminders_sent([reminder.id for reminder in sent])
+            # Failed reminders stay unsent and are held until their backoff ends
+            await reminder_repo.reschedule_reminders({
+                reminder.id: now + _retry_backoff(reminder.retries) for reminder in failed
+            })
+        
+        abandoned = [reminder.id for reminder in failed if reminder.retries + 1 >= settings.reminder_max_retries]
+        if abandoned:
+            logger.warning("reminders_abandoned", reminder_ids=abandoned, retries=settings.reminder_max_retries)
+        
+        reminders_sent_total.inc(len(sent))
+        for reminder in sent:
+            remind_at = reminder.remind_at if reminder.remind_at.tzinfo else reminder.remind_at.replace(tzinfo=timezone.utc)
+            lateness = (now - remind_at).total_seconds()
+            if lateness >= 0:
+                reminder_lateness_seconds.observe(lateness)
+            else:
+                # Only clock skew between workers should send a reminder early; make it visible.
+                reminder_earliness_seconds.observe(-lateness)
+        logger.info("reminders_delivered", sent=len(sent), failed=len(failed), messages=len(groups))
+    
+    async def _send_digest(self, reminders: List[ReminderView]) -> List[ReminderView]:
+        """
+        Send one group of reminders to its guild channel, or by DM to each user.
+
+        Returns the reminders that are done with: delivered, or undeliverable
+        for good (DMs closed, unknown user). The rest should be retried.
+        """
+        if not self.discord_client:
+            raise RuntimeError("Discord client not available")
+        
+        channel_id = reminders[0].channel_id
+        if channel_id and await self._send_channel_reminders(channel_id, reminders):
+            return reminders
+        
+        # DM delivery, also the fallback when the guild channel cannot be used
+        by_user: Dict[Optional[str], List[ReminderView]] = {}
+        for reminder in reminders:
+            by_user.setdefault(reminder.discord_user_id, []).append(reminder)
+        results = await asyncio.gather(*(
+            self._send_reminder_notification(discord_user_id, user_reminders)
+            for discord_user_id, user_reminders in by_user.items()
+        ), return_exceptions=True)
+        
+        done: List[ReminderView] = []
+        for user_reminders, result in zip(by_user.values(), results):
+            if isinstance(result, Exception):
+                logger.error("reminder_send_failed",
+                           reminder_ids=[reminder.id for reminder in user_reminders],
+                           error=str(result))
+            else:
+                done.extend(user_reminders)
+        return done
+    
+    async def _send_channel_reminders(self, channel_id: str, reminders: List[ReminderView]) -> bool:
+        """Post reminders to a guild channel, mentioning their users; False if the channel is unusable."""
         try:
-            if not self.discord_client:
-                logger.warning("discord_client_not_available")
-                return
+            channel = self.discord_client.get_channel(int(channel_id))
+            if channel is None:
+                channel = await self.discord_client.fetch_channel(int(channel_id))
+            
+            if len(reminders) == 1:
+                embed = await self._create_reminder_embed(reminders[0], reminders[0].event)
+            else:
+                embed = _create_digest_embed(reminders, mention_users=True)
+            mentions = " ".join(sorted({f"<@{r.discord_user_id}>" for r in reminders if r.discord_user_id}))
             
-            # Get user
-            from sqlalchemy import select
-            result = await user_repo.session.execute(
-                select(User).where(User.id == reminder.user_id)
+            await outbound.send(
+                f"channel:{channel_id}",
+                Lane.REMINDER,
+                lambda: channel.send(
+                    content=mentions or None,
+                    embed=embed,
+                    allowed_mentions=discord.AllowedMentions(everyone=False, roles=False, users=True)
+                )
             )
-            user_data = result.scalar_one_or_none()
+            logger.info("channel_reminders_sent", channel_id=channel_id, count=len(reminders))
+            return True
             
-            if not user_data:
-                logger.warning("user_not_found", user_id=reminder.user_id)
+        except (discord.Forbidden, discord.NotFound) as e:
+            logger.warning("reminder_channel_unavailable", channel_id=channel_id, error=str(e))
+            return False
+    
+    async def _send_reminder_notification(self, discord_user_id: Optional[str], reminders: List[ReminderView]) -> None:
+        """
+        Send a user's reminders to Discord as one DM.
+
+        Returns normally when the reminders are done with, including users who
+        cannot be reached by DM; raises on failures that are worth retrying.
+        """
+        try:
+            if not discord_user_id:
+                logger.warning("user_not_found", user_id=reminders[0].user_id)
                 return
             
-            discord_user_id = user_data.discord_id
-            
-            # Get event details if available
-            event_details = None
-            if reminder.event_id:
-                event = await event_repo.get_event_by_google_id(reminder.event_id)
-                if event:
-                    event_details = {
-                        "title": event.title,
-                        "start_time": event.start_time,
-                        "end_time": event.end_time,
-                        "location": event.location,
-                        "description": event.description
-                    }
-            
             # Create reminder message
-            embed = await self._create_reminder_embed(reminder, event_details)
+            if len(reminders) == 1:
+                embed = await self._create_reminder_embed(reminders[0], reminders[0].event)
+            else:
+                embed = _create_digest_embed(reminders)
             
             # Send DM to user
+            user_id = int(discord_user_id)
+            if dm_cache.is_forbidden(user_id):
+                logger.info("reminder_skipped_dms_closed", count=len(reminders), user_id=discord_user_id)
+                return
             try:
-                user_obj = await self.discord_client.fetch_user(int(discord_user_id))
-                if user_obj:
-                    await user_obj.send(embed=embed)
-                    logger.info("reminder_sent_successfully", 
-                              reminder_id=reminder.id, 
-                              user_id=discord_user_id)
-                else:
-                    logger.warning("discord_user_not_found", discord_user_id=discord_user_id)
+                channel = await dm_cache.get_channel(self.discord_client, user_id)
+                if channel is None:
+                    return
+                # Reminders queue behind interactive replies and drain at the shared Discord rate
+                await outbound.send(f"channel:{channel.id}", Lane.REMINDER, lambda: channel.send(embed=embed))
+                logger.info("reminder_sent_successfully", 
+                          reminder_ids=[reminder.id for reminder in reminders], 
+                          user_id=discord_user_id)
                     
             except discord.Forbidden:
+                dm_cache.mark_forbidden(user_id)
                 logger.warning("cannot_send_dm", user_id=discord_user_id)
+            except discord.NotFound:
+                dm_cache.invalidate(user_id)
+                logger.warning("discord_user_not_found", discord_user_id=discord_user_id)
             except Exception as e:
+                # Transient failure: let the caller reschedule the reminder
                 logger.error("discord_send_failed", error=str(e))
+                raise
                 
         except Exception as e:
             logger.error("send_reminder_notification_failed", error=str(e))
@@ -115,8 +242,8 @@ class ReminderService:
     
     async def _create_reminder_embed(
         self, 
-        reminder: Reminder, 
-        event_details: Optional[Dict[str, Any]]
+        reminder: ReminderView, 
+        event_details: Optional[EventView]
     ) -> discord.Embed:
         """Create a Discord embed for the reminder."""
         embed = discord.Embed(
@@ -127,26 +254,26 @@ class ReminderService:
         if event_details:
             embed.add_field(
                 name="📅 Event", 
-                value=event_details["title"], 
+                value=event_details.title, 
                 inline=False
             )
             
-            start_time = event_details["start_time"]
+            start_time = event_details.start_time
             embed.add_field(
                 name="🕐 Time", 
                 value=start_time.strftime('%A, %B %d at %I:%M %p'), 
                 inline=True
             )
             
-            if event_details.get("location"):
+            if event_details.location:
                 embed.add_field(
                     name="📍 Location", 
-                    value=event_details["location"], 
+                    value=event_details.location, 
                     inline=True
                 )
             
-            if event_details.get("description"):
-                desc = event_details["description"][:200] + "..." if len(event_details["description"]) > 200 else event_details["description"]
+            if event_details.description:
+                desc = event_details.description[:200] + "..." if len(event_details.description) > 200 else event_details.description
                 embed.add_field(
                     name="📄 Description", 
                     value=desc, 
@@ -187,12 +314,13 @@ class ReminderService:
                 
                 # Only create reminder if it's in the future
                 if reminder_time > datetime.now(timezone.utc):
-                    await reminder_repo.create_reminder(
+                    reminder = await reminder_repo.create_reminder(
                         user_id=user_id,
                         event_id=event_id,
                         channel_id=None,
                         remind_at=reminder_time
                     )
+                    reminder_dispatcher.notify(reminder.id, reminder.remind_at)
                     
                     logger.info("event_reminder_created", 
                               user_id=user_id, 
@@ -251,3 +379,66 @@ class ReminderService:
         except Exception as e:
             logger.error("cancel_reminder_failed", error=str(e))
             return False
+
+
+def _retry_backoff(retries: int) -> timedelta:
+    """Delay before the next attempt of a reminder that has already failed ``retries`` times."""
+    delay = settings.reminder_retry_backoff_seconds * (2 ** retries)
+    return timedelta(seconds=min(delay, settings.reminder_retry_backoff_max_seconds))
+
+
+def _group_reminders(reminders: List[ReminderView]) -> List[List[ReminderView]]:
+    """Group reminders by delivery target (guild channel, else user), in chunks that fit one message."""
+    groups: Dict[Tuple[str, Optional[str]], List[ReminderView]] = {}
+    for reminder in sorted(reminders, key=lambda r: r.remind_at):
+        key = ("channel", reminder.channel_id) if reminder.channel_id else ("user", reminder.discord_user_id)
+        groups.setdefault(key, []).append(reminder)
+    
+    chunks: List[List[ReminderView]] = []
+    for group in groups.values():
+        chunk: List[ReminderView] = []
+        events: set = set()
+        for reminder in group:
+            event_key = _digest_key(reminder)
+            full = len(chunk) >= DIGEST_MAX_REMINDERS or (
+                event_key not in events and len(events) >= DIGEST_MAX_EVENTS
+            )
+            if full:
+                chunks.append(chunk)
+                chunk, events = [], set()
+            chunk.append(reminder)
+            events.add(event_key)
+        chunks.append(chunk)
+    return chunks
+
+
+def _digest_key(reminder: ReminderView) -> Tuple[str, datetime]:
+    """Reminders with the same key (e.g. guild members attending one event) share a digest entry."""
+    event = reminder.event
+    return (event.title, event.start_time) if event else ("Event details not available", reminder.remind_at)
+
+
+def _create_digest_embed(reminders: List[ReminderView], mention_users: bool = False) -> discord.Embed:
+    """Create one Discord embed listing several reminders; the same event for many users is listed once."""
+    entries: Dict[Tuple[str, datetime], List[ReminderView]] = {}
+    for reminder in reminders:
+        entries.setdefault(_digest_key(reminder), []).append(reminder)
+    
+    embed = discord.Embed(
+        title="⏰ Upcoming Events",
+        description=f"{len(entries)} events starting soon",
+        color=0xff9900
+    )
+    for (title, start_time), entry_reminders in entries.items():
+        lines = [f"🕐 {start_time.strftime('%A, %B %d at %I:%M %p')}"]
+        event = entry_reminders[0].event
+        if event and event.location:
+            lines.append(f"📍 {event.location}")
+        if mention_users:
+            lines.append(" ".join(sorted({f"<@{r.discord_user_id}>" for r in entry_reminders if r.discord_user_id})))
+        embed.add_field(name=f"📅 {title}"[:256], value="\n".join(lines)[:1024], inline=False)
+    
+    embed.set_footer(text="Calendar Agent Reminder")
+    embed.timestamp = datetime.now(timezone.utc)
+    
+    return embed
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+from googleapiclient.errors import HttpError
+
+from ..adapters import gcal
+from ..infra.db import session_scope
+from ..infra.freebusy_cache import freebusy_cache
+from ..infra.event_repository import EventRepository, SyncStateRepository, UserRepository
+from ..infra.logging import get_logger
+from ..infra.metrics import calendar_sync_events_total, calendar_sync_runs_total
+from ..infra.settings import settings
+from ..infra.user_cache import user_cache
+
+logger = get_logger().bind(service="calendar_sync")
+
+
+class CalendarSyncService:
+    """
+    Mirrors users' Google calendars into the events table.
+
+    The first sync for a user is a full paginated import that ends with a
+    ``nextSyncToken``; later syncs send that token and only receive deltas.
+    A 410 GONE from Google means the token expired, so the user is resynced
+    from scratch.
+    """
+
+    def __init__(self, page_size: Optional[int] = None, lookback_days: Optional[int] = None):
+        self.page_size = page_size or settings.calendar_sync_page_size
+        self.lookback_days = lookback_days if lookback_days is not None else settings.calendar_sync_lookback_days
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def sync_all(self) -> None:
+        """Incrementally sync every connected user with bounded concurrency."""
+        async for session in session_scope():
+            discord_ids = await UserRepository(session).get_connected_discord_ids()
+            states = {s.discord_user_id: s for s in await SyncStateRepository(session).list_states()}
+            break
+
+        # Users with a live push channel are synced on notification; the sweep
+        # only backstops them when they have been quiet for a long time.
+        now = datetime.now(timezone.utc)
+        backstop = now - timedelta(seconds=settings.calendar_sync_push_backstop_seconds)
+        discord_ids = [d for d in discord_ids if not _push_covered(states.get(d), now, backstop)]
+
+        semaphore = asyncio.Semaphore(settings.calendar_sync_concurrency)
+
+        async def _run(discord_id: str) -> None:
+            async with semaphore:
+                await self.sync_user(discord_id)
+
+        await asyncio.gather(*(_run(d) for d in discord_ids))
+        logger.info("calendar_sync_sweep_complete", users=len(discord_ids))
+
+    async def sync_user(self, discord_user_id: str, force_full: bool = False) -> Dict[str, Any]:
+        """Sync one user's primary calendar; serialised per user."""
+        lock = self._locks.setdefault(discord_user_id, asyncio.Lock())
+        async with lock:
+            try:
+                return await self._sync_user(discord_user_id, force_full)
+            except Exception as e:
+                logger.error("calendar_sync_failed", user_id=discord_user_id, error=str(e))
+                return {"success": False, "message": f"Sync failed: {str(e)}"}
+
+    async def _sync_user(self, discord_user_id: str, force_full: bool) -> Dict[str, Any]:
+        async for session in session_scope():
+            user_repo = UserRepository(session)
+            event_repo = EventRepository(session)
+            sync_repo = SyncStateRepository(session)
+
+            user = await user_repo.get_user_view(discord_user_id)
+            if not user or not user.token_ciphertext:
+                return {"success": False, "message": "User not found or not connected to Google Calendar"}
+            token = user_cache.token(user)
+
+            state = await sync_repo.get_state(discord_user_id)
+            sync_token = None if force_full or state is None else state.sync_token
+
+            if sync_token:
+                try:
+                    counts, next_token = await self._pull(
+                        token, {"syncToken": sync_token}, user.id, discord_user_id, event_repo
+                    )
+                    mode = "incremental"
+                except HttpError as e:
+                    if e.resp.status != 410:
+                        raise
+                    logger.warning("calendar_sync_token_expired", user_id=discord_user_id)
+                    await sync_repo.clear_sync_token(discord_user_id)
+                    sync_token = None
+
+            if not sync_token:
+                counts, next_token = await self._full_import(token, user.id, discord_user_id, event_repo)
+                mode = "full"
+
+            await sync_repo.save_state(
+                user_id=user.id,
+                discord_user_id=discord_user_id,
+                sync_token=next_token,
+                synced_at=datetime.now(timezone.utc),
+                full_sync=mode == "full"
+            )
+
+            if counts[0] or counts[1]:
+                freebusy_cache.invalidate(discord_user_id)
+            calendar_sync_runs_total.labels(mode=mode).inc()
+            logger.info("calendar_synced", user_id=discord_user_id, mode=mode,
+                        upserted=counts[0], deleted=counts[1])
+            return {"success": True, "mode": mode, "upserted": counts[0], "deleted": counts[1]}
+
+        return {"success": False, "message": "No database session available"}
+
+    async def _full_import(
+        self,
+        token: Dict[str, Any],
+        user_id: int,
+        discord_user_id: str,
+        event_repo: EventRepository
+    ) -> Tuple[Tuple[int, int], Optional[str]]:
+        started_at = datetime.now(timezone.utc)
+        window_start = started_at - timedelta(days=self.lookback_days)
+        counts, next_token = await self._pull(
+            token, {"timeMin": window_start.isoformat()}, user_id, discord_user_id, event_repo
+        )
+        # Rows the import did not touch were deleted in Google while we had no token.
+        pruned = await event_repo.prune_unsynced_events(discord_user_id, window_start, started_at)
+        return (counts[0], counts[1] + pruned), next_token
+
+    async def _pull(
+        self,
+        token: Dict[str, Any],
+        params: Dict[str, Any],
+        user_id: int,
+        discord_user_id: str,
+        event_repo: EventRepository
+    ) -> Tuple[Tuple[int, int], Optional[str]]:
+        """Page through events.list, applying each page; returns counts and nextSyncToken."""
+        upserted = deleted = 0
+        page_token: Optional[str] = None
+        while True:
+            page_params = {"singleEvents": True, "maxResults": self.page_size, **params}
+            if page_token:
+                page_params["pageToken"] = page_token
+            page = await gcal.list_events_raw(token, page_params, user_key=discord_user_id)
+
+            upserts, cancelled = _split_items(page.get("items", []), page.get("timeZone"))
+            u, d = await event_repo.apply_google_changes(user_id, discord_user_id, upserts, cancelled)
+            upserted += u
+            deleted += d
+            calendar_sync_events_total.inc(u + d)
+
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return (upserted, deleted), page.get("nextSyncToken")
+
+
+def is_sync_fresh(state: Any, now: Optional[datetime] = None) -> bool:
+    """
+    Whether the events table can stand in for Google for this user.
+
+    Requires a completed full import, then either a live push channel
+    (changes arrive within seconds) or a recent enough incremental sync.
+    """
+    if state is None or not state.last_full_sync_at or not state.last_synced_at:
+        return False
+    now = now or datetime.now(timezone.utc)
+    if _push_covered(state, now, now - timedelta(seconds=settings.calendar_sync_push_backstop_seconds)):
+        return True
+    return _as_utc(state.last_synced_at) >= now - _local_max_staleness()
+
+
+def _local_max_staleness() -> timedelta:
+    """How old a polled sync may be for availability checks; defaults to one sync interval plus slack."""
+    if settings.local_availability_max_staleness_seconds is not None:
+        return timedelta(seconds=settings.local_availability_max_staleness_seconds)
+    return timedelta(
+        seconds=settings.calendar_sync_interval_seconds + settings.local_availability_staleness_slack_seconds
+    )
+
+
+def _push_covered(state: Any, now: datetime, backstop: datetime) -> bool:
+    if state is None or not state.channel_id or not state.channel_expires_at or not state.last_synced_at:
+        return False
+    return _as_utc(state.channel_expires_at) > now and _as_utc(state.last_synced_at) > backstop
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _split_items(items: List[Dict[str, Any]], calendar_tz: Optional[str] = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Split a page of Google events into Event column dicts and cancelled IDs."""
+    upserts: List[Dict[str, Any]] = []
+    cancelled: List[str] = []
+    for item in items:
+        if item.get("status") == "cancelled":
+            cancelled.append(item["id"])
+            continue
+        fields = google_event_fields(item, calendar_tz)
+        if fields:
+            upserts.append(fields)
+    return upserts, cancelled
+
+
+def google_event_fields(item: Dict[str, Any], calendar_tz: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Map a Google Calendar event resource onto Event columns.
+
+    Whether the event blocks the user's time is kept as Google reports it
+    (``transparency`` and the user's own ``responseStatus``) so busy-time
+    queries can skip free and declined events the way freebusy does.
+    All-day dates are anchored at midnight in ``calendar_tz``, the calendar's
+    time zone from the events.list response.
+    """
+    start = _parse_event_time(item.get("start") or {}, calendar_tz)
+    end = _parse_event_time(item.get("end") or {}, calendar_tz)
+    if start is None or end is None:
+        return None
+
+    own = next((a for a in item.get("attendees", []) if a.get("self")), None)
+    attendees = [a["email"] for a in item.get("attendees", []) if a.get("email")]
+    attendees_json = None
+    while attendees:
+        attendees_json = json.dumps(attendees)
+        if len(attendees_json) <= 512:
+            break
+        attendees.pop()
+        attendees_json = None
+
+    return {
+        "google_event_id": item["id"],
+        "title": (item.get("summary") or "(No title)")[:256],
+        "description": (item.get("description") or None) and item["description"][:1024],
+        "location": (item.get("location") or None) and item["location"][:256],
+        "start_time": start,
+        "end_time": end,
+        "attendees": attendees_json,
+        "google_calendar_link": (item.get("htmlLink") or None) and item["htmlLink"][:512],
+        "transparency": item.get("transparency") or "opaque",
+        "response_status": own.get("responseStatus") if own else None,
+        "all_day": not item["start"].get("dateTime"),
+    }
+
+
+def _parse_event_time(value: Dict[str, Any], calendar_tz: Optional[str] = None) -> Optional[datetime]:
+    # Normalised to UTC: SQLite keeps the wall-clock time and drops the offset.
+    if value.get("dateTime"):
+        return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00")).astimezone(timezone.utc)
+    if value.get("date"):
+        # All-day events carry a bare date: midnight in the event's or calendar's zone.
+        midnight = _zone(value.get("timeZone") or calendar_tz).localize(datetime.fromisoformat(value["date"]))
+        return midnight.astimezone(timezone.utc)
+    return None
+
+
+def _zone(name: Optional[str]) -> Any:
+    if name:
+        try:
+            return pytz.timezone(name)
+        except pytz.exceptions.UnknownTimeZoneError:
+            logger.warning("calendar_sync_unknown_timezone", tz=name)
+    return pytz.utc
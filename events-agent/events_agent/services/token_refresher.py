@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.gcal_http import AsyncCalendarTransport, async_transport
+from ..adapters.gcal_pool import token_expiry
+from ..domain.views import UserView
+from ..infra.crypto import encrypt_token
+from ..infra.db import session_scope
+from ..infra.event_repository import UserRepository
+from ..infra.logging import get_logger
+from ..infra.metrics import token_refresh_total
+from ..infra.settings import settings
+from ..infra.user_cache import user_cache
+
+logger = get_logger().bind(service="token_refresher")
+
+
+class TokenRefresher:
+    """
+    Refreshes Google access tokens before they expire.
+
+    Stored tokens carry an ``expiry``; any token expiring within the margin
+    (or with no recorded expiry yet, which the first refresh records) is
+    refreshed against the token endpoint and written back through
+    ``UserRepository.update_user_token``, so
+    interactive commands find a valid access token instead of refreshing
+    inline. Refreshes run in batches with bounded concurrency.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[AsyncCalendarTransport] = None,
+        margin_seconds: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.transport = transport or async_transport
+        self.margin = timedelta(seconds=margin_seconds or settings.token_refresh_margin_seconds)
+        self.batch_size = batch_size or settings.token_refresh_batch_size
+        self.concurrency = concurrency or settings.token_refresh_concurrency
+
+    async def refresh_due(self) -> int:
+        """Refresh every connected user's token that is close to expiry; returns how many succeeded."""
+        async for session in session_scope():
+            users = await UserRepository(session).get_connected_users()
+            break
+
+        due = self._due(users, datetime.now(timezone.utc) + self.margin)
+        if not due:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _run(user: UserView) -> bool:
+            async with semaphore:
+                return await self.refresh_user(user)
+
+        refreshed = 0
+        for start in range(0, len(due), self.batch_size):
+            results = await asyncio.gather(*(_run(user) for user in due[start:start + self.batch_size]))
+            refreshed += sum(results)
+        logger.info("token_refresh_complete", due=len(due), refreshed=refreshed)
+        return refreshed
+
+    async def refresh_user(self, user: UserView) -> bool:
+        """Refresh one user's access token and persist it."""
+        try:
+            token = user_cache.token(user)
+            refreshed = await self.transport.refresh_access_token(token)
+            saved = await _store_token(user.discord_id, refreshed, user.google_sub)
+            token_refresh_total.labels(outcome="refreshed" if saved else "failed").inc()
+            return saved
+        except Exception as e:
+            token_refresh_total.labels(outcome="failed").inc()
+            logger.warning("token_refresh_failed", user_id=user.discord_id, error=str(e))
+            return False
+
+    def _due(self, users: List[UserView], refresh_before: datetime) -> List[UserView]:
+        ranked: List[Tuple[datetime, UserView]] = []
+        for user in users:
+            try:
+                token = user_cache.token(user)
+            except Exception as e:
+                logger.warning("token_unreadable", user_id=user.discord_id, error=str(e))
+                continue
+            if not token.get("refresh_token"):
+                continue
+            expiry = token_expiry(token)
+            if expiry is None or expiry <= refresh_before:
+                ranked.append((expiry or datetime.min.replace(tzinfo=timezone.utc), user))
+        # Soonest-expiring first, so a slow run still saves the most urgent tokens.
+        ranked.sort(key=lambda item: item[0])
+        return [user for _, user in ranked]
+
+
+async def save_refreshed_token(discord_id: str, token: Dict[str, Any]) -> bool:
+    """Persist a token the transport refreshed inline after a 401, keeping the user's google_sub."""
+    async for session in session_scope():
+        user = await UserRepository(session).get_user_view(discord_id)
+        break
+    if user is None:
+        return False
+    return await _store_token(discord_id, token, user.google_sub)
+
+
+async def _store_token(discord_id: str, token: Dict[str, Any], google_sub: Optional[str]) -> bool:
+    async for session in session_scope():
+        return await UserRepository(session).update_user_token(discord_id, encrypt_token(json.dumps(token)), google_sub)
+    return False
@@ -0,0 +1,115 @@
+"""
+Shared test setup.
+
+Settings are read once at import time, so the database URL and Fernet key
+are pointed at a throwaway SQLite file before ``events_agent`` is imported.
+Async code is driven with ``asyncio.run`` so no pytest plugin is needed.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator
+
+import pytest
+from cryptography.fernet import Fernet
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="events-agent-tests-"))
+DB_PATH = _TMP_DIR / "test.db"
+
+# Exported so processes spawned by tests use the same database.
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ.setdefault("FERNET_KEY", Fernet.generate_key().decode())
+sys.path.insert(0, str(PROJECT_DIR))
+
+from events_agent.bot.dm_cache import dm_cache  # noqa: E402
+from events_agent.domain.models import Base  # noqa: E402
+from events_agent.infra import db  # noqa: E402
+from events_agent.infra.settings import settings  # noqa: E402
+from events_agent.infra.user_cache import user_cache  # noqa: E402
+
+# Another test module may have loaded the settings before this file ran.
+settings.database_url = os.environ["DATABASE_URL"]
+settings.fernet_key = os.environ["FERNET_KEY"]
+db._engine = None
+db._session_factory = None
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list) -> None:
+    """Skip ``@pytest.mark.benchmark`` tests unless RUN_BENCHMARKS is set."""
+    if os.environ.get("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="benchmark; set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+async def _reset_schema() -> None:
+    engine = db.get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    # Release pooled connections so other processes see a quiet database file.
+    await engine.dispose()
+
+
+@pytest.fixture
+def database() -> Path:
+    """A freshly created schema in the test SQLite file; returns the file path."""
+    asyncio.run(_reset_schema())
+    user_cache.clear()
+    dm_cache.clear()
+    return DB_PATH
+
+
+@pytest.fixture
+def run(database: Path) -> Callable[[Awaitable[Any]], Any]:
+    """Run a coroutine on a fresh event loop, disposing the engine's connections afterwards."""
+    async def _run(coro: Awaitable[Any]) -> Any:
+        try:
+            return await coro
+        finally:
+            await db.get_engine().dispose()
+
+    return lambda coro: asyncio.run(_run(coro))
+
+
+def _alembic(command_name: str, revision: str) -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(PROJECT_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_DIR / "alembic"))
+    getattr(command, command_name)(config, revision)
+
+
+@pytest.fixture
+def postgres_url(run: Callable[[Awaitable[Any]], Any], monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """
+    Point the app at the scratch Postgres in ``TEST_POSTGRES_URL``, migrated to head.
+
+    Skipped when the variable is unset. The schema is built with the real
+    migrations (including the CONCURRENTLY index builds) and torn down with
+    them afterwards, so the database must be disposable.
+    """
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    pytest.importorskip("asyncpg")
+
+    monkeypatch.setattr(settings, "database_url", url)
+    db._engine = None
+    db._session_factory = None
+    _alembic("downgrade", "base")
+    _alembic("upgrade", "head")
+    try:
+        yield url
+    finally:
+        _alembic("downgrade", "base")
+        db._engine = None
+        db._session_factory = None
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from events_agent.domain.availability import busy_bitmap, rank_common_slots
+
+T0 = datetime(2026, 10, 20, 9, 0, tzinfo=timezone.utc)
+
+
+def _at(minutes: int) -> datetime:
+    return T0 + timedelta(minutes=minutes)
+
+
+def test_bitmap_marks_every_slot_an_interval_touches() -> None:
+    busy = {
+        "alice": [(_at(20), _at(35))],  # inside slots 1 and 2
+        "bob": [(_at(-30), _at(15)), (_at(45), _at(60))],  # clipped at the start; ends on a slot boundary
+        "carol": [(_at(-60), _at(0)), (_at(60), _at(90))],  # both outside the window
+    }
+
+    attendees, bitmap = busy_bitmap(busy, _at(0), _at(60))
+
+    assert attendees == ["alice", "bob", "carol"]
+    assert bitmap.tolist() == [
+        [False, True, True, False],
+        [True, False, False, True],
+        [False, False, False, False],
+    ]
+
+
+def test_bitmap_drops_a_partial_trailing_slot() -> None:
+    _, bitmap = busy_bitmap({"alice": [(_at(60), _at(70))]}, _at(0), _at(70))
+
+    assert bitmap.shape == (1, 4)
+    assert not bitmap.any()
+
+
+def test_starts_are_aligned_to_the_window_edges() -> None:
+    # 70-minute window, 60-minute meeting: only the 9:00 start fits whole slots.
+    ranked = rank_common_slots({"alice": [], "bob": []}, _at(0), _at(70), 60)
+
+    assert [(slot.start, slot.end) for slot in ranked] == [(_at(0), _at(60))]
+
+    # The last start ends exactly at the window end.
+    ranked = rank_common_slots({"alice": []}, _at(0), _at(120), 60, limit=100)
+    assert ranked[-1].end == _at(120)
+    assert [slot.start for slot in ranked] == [_at(m) for m in range(0, 61, 15)]
+
+
+def test_duration_rounds_up_to_whole_slots() -> None:
+    # A 20-minute meeting needs two 15-minute slots, so a free 15-minute slot is not enough.
+    busy = {"alice": [(_at(15), _at(30)), (_at(45), _at(60))]}
+
+    ranked = rank_common_slots(busy, _at(0), _at(60), 20, limit=100)
+
+    assert ranked == []
+
+
+def test_all_busy_participant_blocks_everyone_by_default() -> None:
+    busy = {"alice": [], "bob": [(_at(0), _at(120))], "carol": []}
+
+    assert rank_common_slots(busy, _at(0), _at(120), 30) == []
+
+    ranked = rank_common_slots(busy, _at(0), _at(120), 30, min_free=2, limit=3)
+    assert [(slot.start, slot.free_count, slot.total) for slot in ranked] == [
+        (_at(0), 2, 3), (_at(15), 2, 3), (_at(30), 2, 3)
+    ]
+    assert all(slot.free_attendees == ("alice", "carol") for slot in ranked)
+
+
+def test_ties_rank_by_free_count_then_start_time() -> None:
+    busy = {
+        "alice": [(_at(0), _at(30))],
+        "bob": [(_at(60), _at(90))],
+        "carol": [],
+    }
+
+    ranked = rank_common_slots(busy, _at(0), _at(120), 30, min_free=1, limit=100)
+
+    # Everyone is free at 9:30 and 10:30; the two-attendee starts follow in time order.
+    assert [(slot.start, slot.free_count) for slot in ranked] == [
+        (_at(30), 3), (_at(90), 3),
+        (_at(0), 2), (_at(15), 2), (_at(45), 2), (_at(60), 2), (_at(75), 2),
+    ]
+    assert ranked[2].free_attendees == ("bob", "carol")
+
+
+def test_working_hours_filter_starts() -> None:
+    window_start = datetime(2026, 10, 20, 16, 0, tzinfo=timezone.utc)
+
+    ranked = rank_common_slots({"alice": []}, window_start, window_start + timedelta(hours=18), 60,
+                               slot_minutes=60, working_hours=(9, 17), limit=100)
+
+    assert [slot.start.hour for slot in ranked] == [16, 9]
+
+
+def test_no_attendees_or_empty_window() -> None:
+    assert rank_common_slots({}, _at(0), _at(60), 30) == []
+    assert rank_common_slots({"alice": []}, _at(0), _at(0), 30) == []
+    attendees, bitmap = busy_bitmap({"alice": []}, _at(60), _at(0))
+    assert attendees == ["alice"] and bitmap.shape == (1, 0) and bitmap.dtype == np.bool_
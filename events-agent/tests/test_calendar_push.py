@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import insert, select
+
+from events_agent.adapters import gcal
+from events_agent.app.http import create_app
+from events_agent.domain.models import Event, Reminder, User
+from events_agent.infra.crypto import encrypt_token
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import (
+    EventRepository, ReminderRepository, SyncStateRepository, UserRepository
+)
+from events_agent.infra.settings import settings
+from events_agent.services.calendar_service import GoogleCalendarService
+from events_agent.services.channel_service import WEBHOOK_PATH, WatchChannelManager
+from events_agent.services.sync_service import CalendarSyncService
+
+TOKEN = {"access_token": "access", "refresh_token": "refresh", "client_id": "cid", "client_secret": "secret"}
+
+
+class StandInCalendar:
+    """Local stand-in for one Google calendar: events.list with sync tokens, and events.watch."""
+
+    def __init__(self) -> None:
+        self.version = 0
+        self.items: List[Dict[str, Any]] = []
+        self.list_calls: List[Dict[str, Any]] = []
+
+    def change(self, event_id: str, summary: str) -> None:
+        self.version += 1
+        self.items.append({
+            "id": event_id,
+            "summary": summary,
+            "start": {"dateTime": "2026-10-20T15:00:00Z"},
+            "end": {"dateTime": "2026-10-20T16:00:00Z"},
+            "_version": self.version,
+        })
+
+    async def list_events_raw(self, token: Dict[str, Any], params: Dict[str, Any], calendar_id: str = "primary",
+                              user_key: Optional[str] = None) -> Dict[str, Any]:
+        self.list_calls.append(params)
+        since = int(params["syncToken"]) if "syncToken" in params else 0
+        await asyncio.sleep(0.02)  # Google round trip
+        items = [{k: v for k, v in item.items() if k != "_version"} for item in self.items if item["_version"] > since]
+        return {"items": items, "nextSyncToken": str(self.version)}
+
+    async def watch_events(self, token: Dict[str, Any], body: Dict[str, Any], calendar_id: str = "primary",
+                           user_key: Optional[str] = None) -> Dict[str, Any]:
+        self.channel = body
+        return {"id": body["id"], "resourceId": "resource-1", "expiration": str(int((time.time() + 3600) * 1000))}
+
+    async def create_event_raced_by_push(self, token: Dict[str, Any], body: Dict[str, Any],
+                                         calendar_id: str = "primary", user_key: Optional[str] = None) -> Dict[str, Any]:
+        """events.insert whose push notification is synced before the response reaches the caller."""
+        self.change("evt1", body["summary"])
+        await CalendarSyncService().sync_user(user_key)
+        return {**body, "id": "evt1", "htmlLink": "https://calendar.test/evt1"}
+
+
+async def _event_titles() -> List[str]:
+    async for session in session_scope():
+        result = await session.execute(select(Event.title).order_by(Event.id))
+        return list(result.scalars().all())
+
+
+async def _scenario(calendar: StandInCalendar) -> Dict[str, Any]:
+    async for session in session_scope():
+        await session.execute(insert(User), [
+            {"id": 1, "discord_id": "42", "token_ciphertext": encrypt_token(json.dumps(TOKEN))},
+        ])
+        await session.commit()
+        break
+
+    manager = WatchChannelManager(CalendarSyncService())
+    assert await manager.register("42")
+    calendar.change("evt1", "Kickoff")
+    assert (await manager.sync_service.sync_user("42"))["mode"] == "full"
+    async for session in session_scope():
+        state = await SyncStateRepository(session).get_state("42")
+        break
+
+    headers = {
+        "X-Goog-Channel-ID": state.channel_id,
+        "X-Goog-Channel-Token": state.channel_token,
+        "X-Goog-Resource-ID": "resource-1",
+        "X-Goog-Resource-State": "exists",
+    }
+    transport = httpx.ASGITransport(app=create_app(manager))
+    async with httpx.AsyncClient(transport=transport, base_url="https://bot.test") as client:
+        forged = await client.post(WEBHOOK_PATH, headers={**headers, "X-Goog-Channel-Token": "wrong"})
+        handshake = await client.post(WEBHOOK_PATH, headers={**headers, "X-Goog-Resource-State": "sync"})
+
+        calendar.change("evt2", "Retro")
+        started = time.perf_counter()
+        notified = await client.post(WEBHOOK_PATH, headers=headers)
+        while "Retro" not in await _event_titles():
+            assert time.perf_counter() - started < 5, "notification never reached the events table"
+            await asyncio.sleep(0.005)
+        lag = time.perf_counter() - started
+        await asyncio.gather(*list(manager._tasks.values()))
+
+    return {
+        "forged": forged.status_code,
+        "handshake": handshake.status_code,
+        "notified": notified.status_code,
+        "lag": lag,
+        "titles": await _event_titles(),
+    }
+
+
+def test_push_notification_refreshes_events_table(run, monkeypatch) -> None:
+    calendar = StandInCalendar()
+    monkeypatch.setattr(gcal, "list_events_raw", calendar.list_events_raw)
+    monkeypatch.setattr(gcal, "watch_events", calendar.watch_events)
+    monkeypatch.setattr(settings, "base_url", "https://bot.test")
+
+    result = run(_scenario(calendar))
+
+    print(f"\nnotification -> fresh row: {result['lag'] * 1000:.0f}ms")
+    assert calendar.channel["address"] == "https://bot.test" + WEBHOOK_PATH
+    assert (result["forged"], result["handshake"], result["notified"]) == (403, 200, 200)
+    assert result["titles"] == ["Kickoff", "Retro"]
+    # One full import, then one incremental sync driven by the notification.
+    assert [("syncToken" in params) for params in calendar.list_calls] == [False, True]
+
+
+async def _create_event() -> Dict[str, Any]:
+    async for session in session_scope():
+        await session.execute(insert(User), [
+            {"id": 1, "discord_id": "42", "token_ciphertext": encrypt_token(json.dumps(TOKEN))},
+        ])
+        await session.commit()
+        break
+
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    async for session in session_scope():
+        events = EventRepository(session)
+        service = GoogleCalendarService(UserRepository(session), events, ReminderRepository(session))
+        result = await service.create_event("42", "Kickoff", start, start + timedelta(hours=1), reminder_minutes=10)
+        break
+
+    async for session in session_scope():
+        rows = (await session.execute(select(Event.id, Event.google_calendar_link))).all()
+        reminders = (await session.execute(select(Reminder.event_id))).scalars().all()
+        break
+    return {"result": result, "rows": rows, "reminders": list(reminders)}
+
+
+def test_create_event_survives_a_push_sync_of_the_same_event(run, monkeypatch) -> None:
+    calendar = StandInCalendar()
+    monkeypatch.setattr(gcal, "list_events_raw", calendar.list_events_raw)
+    monkeypatch.setattr(gcal, "create_event", calendar.create_event_raced_by_push)
+
+    result = run(_create_event())
+
+    assert result["result"]["success"], result["result"]
+    assert result["rows"] == [(result["result"]["event"]["id"], "https://calendar.test/evt1")]
+    assert result["reminders"] == ["evt1"]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytz
+from sqlalchemy import select
+
+from events_agent.domain.models import Event
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import EventRepository
+from events_agent.services.sync_service import google_event_fields
+
+
+def _item(**overrides) -> dict:
+    item = {
+        "id": "shared123",
+        "status": "confirmed",
+        "summary": "Design review",
+        "start": {"dateTime": "2026-10-20T15:00:00Z"},
+        "end": {"dateTime": "2026-10-20T16:00:00Z"},
+        "attendees": [
+            {"email": "alice@example.com", "responseStatus": "accepted", "organizer": True},
+            {"email": "bob@example.com", "responseStatus": "declined", "self": True},
+        ],
+    }
+    item.update(overrides)
+    return item
+
+
+def test_fields_record_transparency_and_own_response() -> None:
+    fields = google_event_fields(_item(transparency="transparent"))
+
+    assert fields["transparency"] == "transparent"
+    assert fields["response_status"] == "declined"
+    assert fields["all_day"] is False
+
+
+def test_fields_default_to_blocking_when_not_a_guest() -> None:
+    fields = google_event_fields(_item(attendees=[]))
+
+    assert fields["transparency"] == "opaque"
+    assert fields["response_status"] is None
+
+
+def test_all_day_events_anchor_in_calendar_time_zone() -> None:
+    fields = google_event_fields(
+        _item(start={"date": "2026-10-20"}, end={"date": "2026-10-21"}), "America/New_York"
+    )
+
+    zone = pytz.timezone("America/New_York")
+    assert fields["all_day"] is True
+    assert fields["start_time"] == zone.localize(datetime(2026, 10, 20))
+    assert fields["end_time"] == zone.localize(datetime(2026, 10, 21))
+
+
+def test_all_day_events_fall_back_to_utc() -> None:
+    fields = google_event_fields(_item(start={"date": "2026-10-20"}, end={"date": "2026-10-21"}))
+
+    assert fields["start_time"] == datetime(2026, 10, 20, tzinfo=timezone.utc)
+
+
+def test_shared_event_is_stored_for_each_syncing_user(run) -> None:
+    async def scenario() -> list:
+        async for session in session_scope():
+            repo = EventRepository(session)
+            alice = google_event_fields(_item(attendees=[
+                {"email": "alice@example.com", "responseStatus": "accepted", "self": True},
+            ]))
+            bob = google_event_fields(_item())
+            assert await repo.apply_google_changes(1, "111", [alice], []) == (1, 0)
+            assert await repo.apply_google_changes(2, "222", [bob], []) == (1, 0)
+            # Re-syncing updates the user's own row only.
+            assert await repo.apply_google_changes(2, "222", [{**bob, "title": "Moved"}], []) == (1, 0)
+            result = await session.execute(
+                select(Event.discord_user_id, Event.title, Event.response_status).order_by(Event.discord_user_id)
+            )
+            return [tuple(row) for row in result.all()]
+
+    assert run(scenario()) == [
+        ("111", "Design review", "accepted"),
+        ("222", "Moved", "declined"),
+    ]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from events_agent.bot.dm_cache import DMChannelCache
+
+
+class FakeUser:
+    def __init__(self, user_id: int, client: "FakeClient") -> None:
+        self.id = user_id
+        self.dm_channel: Optional[Any] = None
+        self._client = client
+
+    async def create_dm(self) -> Any:
+        self._client.create_dm_calls.append(self.id)
+        await asyncio.sleep(self._client.latency)
+        self.dm_channel = f"dm-{self.id}"
+        return self.dm_channel
+
+
+class FakeClient:
+    """Gateway cache holding ``cached`` users; everyone else needs a fetch_user round trip."""
+
+    def __init__(self, cached: List[int] = (), latency: float = 0.0) -> None:
+        self.latency = latency
+        self.users: Dict[int, FakeUser] = {}
+        self.cached = set(cached)
+        self.fetch_user_calls: List[int] = []
+        self.create_dm_calls: List[int] = []
+
+    def _user(self, user_id: int) -> FakeUser:
+        return self.users.setdefault(user_id, FakeUser(user_id, self))
+
+    def get_user(self, user_id: int) -> Optional[FakeUser]:
+        return self._user(user_id) if user_id in self.cached else None
+
+    async def fetch_user(self, user_id: int) -> FakeUser:
+        self.fetch_user_calls.append(user_id)
+        await asyncio.sleep(self.latency)
+        return self._user(user_id)
+
+
+def test_gateway_user_skips_fetch_user() -> None:
+    client = FakeClient(cached=[1])
+    cache = DMChannelCache()
+
+    async def scenario() -> List[Any]:
+        return [await cache.get_channel(client, 1), await cache.get_channel(client, 2), await cache.get_channel(client, 1)]
+
+    channels = asyncio.run(scenario())
+
+    assert channels == ["dm-1", "dm-2", "dm-1"]
+    assert client.fetch_user_calls == [2]
+    # The third lookup was a cache hit: no second create_dm for user 1.
+    assert client.create_dm_calls == [1, 2]
+
+
+def test_concurrent_misses_share_one_lookup() -> None:
+    client = FakeClient(latency=0.01)
+    cache = DMChannelCache()
+
+    async def scenario() -> List[Any]:
+        return await asyncio.gather(*(cache.get_channel(client, 7) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["dm-7"] * 5
+    assert client.fetch_user_calls == [7]
+    assert client.create_dm_calls == [7]
+
+
+def test_forbidden_user_is_skipped_until_the_ttl_runs_out() -> None:
+    client = FakeClient(cached=[1])
+    cache = DMChannelCache(forbidden_ttl_seconds=0.05)
+
+    async def scenario() -> Dict[str, Any]:
+        await cache.get_channel(client, 1)
+        cache.mark_forbidden(1)
+        while_forbidden = await cache.get_channel(client, 1)
+        calls_while_forbidden = list(client.create_dm_calls)
+        await asyncio.sleep(0.06)
+        client.users[1].dm_channel = None
+        after_ttl = await cache.get_channel(client, 1)
+        return {"while": while_forbidden, "calls": calls_while_forbidden, "after": after_ttl}
+
+    result = asyncio.run(scenario())
+
+    assert result["while"] is None
+    assert result["calls"] == [1]
+    # Marking dropped the cached channel, so after the TTL the DM is opened again.
+    assert result["after"] == "dm-1"
+    assert client.create_dm_calls == [1, 1]
+    assert not cache.is_forbidden(1)
+
+
+def test_channels_and_forbidden_users_are_bounded() -> None:
+    client = FakeClient(cached=[1, 2, 3])
+    cache = DMChannelCache(max_entries=2)
+
+    async def scenario() -> None:
+        for user_id in (1, 2, 3, 1):
+            await cache.get_channel(client, user_id)
+
+    asyncio.run(scenario())
+
+    # User 1 was evicted by user 3, then looked up again, which evicted user 2.
+    assert list(cache._channels) == [3, 1]
+
+    for user_id in range(100, 105):
+        cache.mark_forbidden(user_id)
+
+    assert [user_id for user_id in range(100, 105) if cache.is_forbidden(user_id)] == [103, 104]
+    assert len(cache._forbidden) == 2
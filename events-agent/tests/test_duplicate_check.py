@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import event, insert
+
+from events_agent.domain.models import Event
+from events_agent.domain.titles import title_hash
+from events_agent.infra.db import get_engine, session_scope
+from events_agent.infra.event_repository import EventRepository
+
+START = datetime(2026, 10, 20, 15, 0, tzinfo=timezone.utc)
+
+
+async def _seed() -> None:
+    titles = ["Weekly planning", "Design review", "1:1 with Sam"]
+    async for session in session_scope():
+        await session.execute(insert(Event), [
+            {
+                "user_id": 1,
+                "discord_user_id": "42",
+                "google_event_id": f"evt{i}",
+                "title": title,
+                "title_hash": title_hash(title),
+                "start_time": START + timedelta(minutes=5 * i),
+                "end_time": START + timedelta(minutes=5 * i + 30),
+            }
+            for i, title in enumerate(titles)
+        ])
+        await session.commit()
+        break
+
+
+async def _check(title: str, statements: List[str]) -> Optional[str]:
+    await _seed()
+    engine = get_engine()
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async for session in session_scope():
+            duplicate = await EventRepository(session).check_duplicate_event("42", title, START, START + timedelta(hours=1))
+            return duplicate.title if duplicate else None
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_exact_title_match_is_found(run) -> None:
+    statements: List[str] = []
+    assert run(_check("design  REVIEW", statements)) == "Design review"
+    # Answered by the title-hash index alone.
+    assert len(statements) == 1
+    assert "title_hash = " in statements[0]
+
+
+def test_fuzzy_title_match_is_found(run) -> None:
+    statements: List[str] = []
+    assert run(_check("Weekly planing", statements)) == "Weekly planning"
+    # The exact lookup misses, then one range scan over the tolerance window.
+    assert len(statements) == 2
+
+
+def test_non_duplicate_loads_no_full_rows(run) -> None:
+    statements: List[str] = []
+    assert run(_check("Quarterly board meeting", statements)) is None
+    assert len(statements) == 2
+    for statement in statements:
+        assert "attendees" not in statement and "description" not in statement
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import and_, func, select
+
+from events_agent.domain.models import Event
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import EventRepository
+
+ROWS = 10_000
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _fields(i: int, title: str) -> Dict[str, Any]:
+    return {
+        "google_event_id": f"evt{i:05d}",
+        "title": f"{title} {i}",
+        "description": None,
+        "location": "Room 1",
+        "start_time": START + timedelta(hours=i),
+        "end_time": START + timedelta(hours=i, minutes=30),
+        "attendees": None,
+        "google_calendar_link": f"https://calendar.test/evt{i:05d}",
+        "transparency": "opaque",
+        "response_status": None,
+        "all_day": False,
+    }
+
+
+async def _per_row_upsert(session: Any, discord_user_id: str, upserts: List[Dict[str, Any]]) -> None:
+    """The previous sync write path: load existing ORM rows, then add or mutate one row at a time."""
+    now = datetime.now(timezone.utc)
+    ids = [u["google_event_id"] for u in upserts]
+    existing = {}
+    for start in range(0, len(ids), 500):
+        result = await session.execute(select(Event).where(and_(
+            Event.discord_user_id == discord_user_id, Event.google_event_id.in_(ids[start:start + 500])
+        )))
+        existing.update({e.google_event_id: e for e in result.scalars().all()})
+    for fields in upserts:
+        event = existing.get(fields["google_event_id"])
+        if event is None:
+            session.add(Event(user_id=1, discord_user_id=discord_user_id, reminder_sent=False,
+                              created_at=now, updated_at=now, **fields))
+        else:
+            for key, value in fields.items():
+                setattr(event, key, value)
+            event.updated_at = now
+    await session.commit()
+
+
+async def _timed_sync(bulk: bool, discord_user_id: str) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    for phase, title in (("import", "Meeting"), ("resync", "Renamed")):
+        upserts = [_fields(i, title) for i in range(ROWS)]
+        async for session in session_scope():
+            started = time.perf_counter()
+            if bulk:
+                await EventRepository(session).apply_google_changes(1, discord_user_id, upserts, [])
+            else:
+                await _per_row_upsert(session, discord_user_id, upserts)
+            timings[phase] = time.perf_counter() - started
+            break
+    return timings
+
+
+async def _counts(discord_user_id: str) -> int:
+    async for session in session_scope():
+        result = await session.execute(
+            select(func.count()).where(and_(Event.discord_user_id == discord_user_id, Event.title.like("Renamed %")))
+        )
+        return result.scalar_one()
+
+
+def test_bulk_sync_benchmark(run) -> None:
+    """10k-row import and re-sync: per-row ORM writes vs the batched upsert used by sync."""
+    per_row = run(_timed_sync(bulk=False, discord_user_id="1"))
+    bulk = run(_timed_sync(bulk=True, discord_user_id="2"))
+
+    for phase in ("import", "resync"):
+        print(f"\n{phase}: per-row {per_row[phase]:.2f}s, bulk {bulk[phase]:.2f}s "
+              f"({per_row[phase] / bulk[phase]:.1f}x)")
+    assert run(_counts("1")) == ROWS
+    assert run(_counts("2")) == ROWS
+
+
+async def _import_then_upsert() -> Dict[str, Any]:
+    async for session in session_scope():
+        events = EventRepository(session)
+        created = await events.create_events_bulk(1, "42", [_fields(i, "Meeting") for i in range(1200)])
+        # Re-import a window overlapping the first one: 600 updates, 600 new events and a repeated payload.
+        upserts = [_fields(i, "Renamed") for i in range(600, 1800)] + [_fields(700, "Moved")]
+        upserted = await events.upsert_events_bulk(1, "42", upserts)
+        break
+
+    async for session in session_scope():
+        result = await session.execute(select(Event.id, Event.google_event_id, Event.title).order_by(Event.id))
+        rows = {row.google_event_id: (row.id, row.title) for row in result.all()}
+        break
+    return {"created": created, "upserted": upserted, "rows": rows}
+
+
+def test_bulk_create_and_upsert_return_ids_in_input_order(run) -> None:
+    result = run(_import_then_upsert())
+    rows = result["rows"]
+
+    assert len(rows) == 1800
+    assert result["created"] == [rows[f"evt{i:05d}"][0] for i in range(1200)]
+    # Existing events keep their row IDs, new ones get fresh IDs, one per distinct Google ID.
+    assert result["upserted"] == [rows[f"evt{i:05d}"][0] for i in range(600, 1800)]
+    assert result["upserted"][:600] == result["created"][600:]
+    assert rows["evt00100"][1] == "Meeting 100"
+    assert rows["evt00650"][1] == "Renamed 650"
+    assert rows["evt00700"][1] == "Moved 700"
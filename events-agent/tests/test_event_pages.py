@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import insert
+
+from events_agent.bot.discord_bot import EventPagesView
+from events_agent.domain.models import Event, User
+from events_agent.infra.crypto import encrypt_token
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import (
+    EventPage, EventRepository, InvalidCursor, ReminderRepository, UserRepository, decode_event_cursor,
+    encode_event_cursor
+)
+from events_agent.services.calendar_service import GoogleCalendarService
+
+START = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+
+
+async def _seed() -> None:
+    async for session in session_scope():
+        await session.execute(insert(User), [{"id": 1, "discord_id": "42", "token_ciphertext": encrypt_token(json.dumps({}))}])
+        rows = []
+        for i in range(13):
+            # Three events share each start time, so pages split inside runs of equal start_time.
+            rows.append({"discord_user_id": "42", "google_event_id": f"evt{i}", "title": f"Event {i}",
+                         "start_time": START + timedelta(hours=i // 3)})
+        rows.append({"discord_user_id": "42", "google_event_id": "past", "title": "Past",
+                     "start_time": START - timedelta(days=2)})
+        rows.append({"discord_user_id": "43", "google_event_id": "other", "title": "Someone else's",
+                     "start_time": START})
+        await session.execute(insert(Event), [
+            {"user_id": 1, "end_time": row["start_time"] + timedelta(minutes=30), **row} for row in rows
+        ])
+        await session.commit()
+        break
+
+
+async def _page(after: Optional[str] = None, before: Optional[str] = None) -> EventPage:
+    async for session in session_scope():
+        return await EventRepository(session).get_upcoming_events_page("42", limit=5, after=after, before=before)
+
+
+def _titles(page: EventPage) -> List[str]:
+    return [event.title for event in page.events]
+
+
+def test_pages_forward_over_duplicate_start_times(run) -> None:
+    async def scenario() -> List[EventPage]:
+        await _seed()
+        pages = [await _page()]
+        while pages[-1].next_cursor:
+            pages.append(await _page(after=pages[-1].next_cursor))
+        return pages
+
+    pages = run(scenario())
+
+    assert [_titles(page) for page in pages] == [
+        [f"Event {i}" for i in range(0, 5)],
+        [f"Event {i}" for i in range(5, 10)],
+        [f"Event {i}" for i in range(10, 13)],
+    ]
+    assert pages[0].prev_cursor is None
+    assert pages[-1].next_cursor is None
+    assert all(page.prev_cursor for page in pages[1:])
+
+
+def test_pages_back_to_the_first_page(run) -> None:
+    async def scenario() -> Tuple[List[EventPage], List[EventPage]]:
+        await _seed()
+        forward = [await _page()]
+        while forward[-1].next_cursor:
+            forward.append(await _page(after=forward[-1].next_cursor))
+        backward = [forward[-1]]
+        while backward[-1].prev_cursor:
+            backward.append(await _page(before=backward[-1].prev_cursor))
+        return forward, backward
+
+    forward, backward = run(scenario())
+
+    assert [_titles(page) for page in reversed(backward)] == [_titles(page) for page in forward]
+    # Back on the first page there is nothing before it, and Next works again.
+    assert backward[-1].prev_cursor is None
+    assert backward[-1].next_cursor == forward[0].next_cursor
+
+
+def test_cursor_round_trips() -> None:
+    position = (START, 17)
+
+    assert decode_event_cursor(encode_event_cursor(*position)) == position
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor!", base64.urlsafe_b64encode(b"2026-10-20T10:00:00|3").decode()])
+def test_malformed_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(InvalidCursor):
+        decode_event_cursor(cursor)
+
+
+def test_tampered_cursor_is_rejected(run) -> None:
+    cursor = encode_event_cursor(START, 3)
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    tampered = base64.urlsafe_b64encode(raw[:-1] + b"9").decode().rstrip("=")
+
+    with pytest.raises(InvalidCursor):
+        decode_event_cursor(tampered)
+
+    async def scenario() -> Dict[str, Any]:
+        await _seed()
+        async for session in session_scope():
+            service = GoogleCalendarService(UserRepository(session), EventRepository(session), ReminderRepository(session))
+            return await service.list_events_page("42", limit=5, after=tampered)
+
+    result = run(scenario())
+
+    assert result["success"] is False
+    assert "no longer valid" in result["message"]
+
+
+class FakeInteraction:
+    def __init__(self, user_id: int) -> None:
+        self.user = SimpleNamespace(id=user_id)
+        self.edits: List[Dict[str, Any]] = []
+        self.messages: List[str] = []
+        self.response = SimpleNamespace(edit_message=self._edit, send_message=self._send)
+
+    async def _edit(self, **kwargs: Any) -> None:
+        self.edits.append(kwargs)
+
+    async def _send(self, content: str, **kwargs: Any) -> None:
+        self.messages.append(content)
+
+
+def test_view_buttons_follow_the_cursors(run) -> None:
+    async def scenario() -> Dict[str, Any]:
+        await _seed()
+        view = EventPagesView("42", 5)
+        async for session in session_scope():
+            service = GoogleCalendarService(UserRepository(session), EventRepository(session), ReminderRepository(session))
+            view.update(await service.list_events_page("42", limit=5))
+            break
+        states = [(view.page, view.prev_button.disabled, view.next_button.disabled)]
+
+        owner = FakeInteraction(42)
+        for button in (view.next_button, view.next_button, view.prev_button, view.prev_button):
+            await button.callback(owner)
+            states.append((view.page, view.prev_button.disabled, view.next_button.disabled))
+
+        stranger = FakeInteraction(7)
+        await view.next_button.callback(stranger)
+        return {"states": states, "owner": owner, "stranger": stranger}
+
+    result = run(scenario())
+
+    assert result["states"] == [
+        (1, True, False), (2, False, False), (3, False, True), (2, False, False), (1, True, False)
+    ]
+    assert len(result["owner"].edits) == 4
+    assert result["stranger"].messages == ["❌ These aren't your events."]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import insert, select
+
+from events_agent.domain.models import Event, User
+from events_agent.domain.views import DESCRIPTION_PREVIEW_CHARS, EventView
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import _EVENT_VIEW_COLUMNS, EventRepository
+
+logger = logging.getLogger(__name__)
+
+START = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+
+
+async def _seed(count: int) -> None:
+    attendees = json.dumps([f"guest{i}@example.com" for i in range(12)])
+    async for session in session_scope():
+        await session.execute(insert(User), [{"id": 1, "discord_id": "42"}])
+        for offset in range(0, count, 5000):
+            await session.execute(insert(Event), [
+                {
+                    "user_id": 1,
+                    "discord_user_id": "42",
+                    "google_event_id": f"evt{i:06d}",
+                    "title": f"Event {i}",
+                    "description": "Agenda. " * 120,
+                    "location": "Room 1",
+                    "start_time": START + timedelta(minutes=i),
+                    "end_time": START + timedelta(minutes=i + 30),
+                    "attendees": attendees,
+                    "google_calendar_link": f"https://calendar.test/evt{i:06d}",
+                }
+                for i in range(offset, min(offset + 5000, count))
+            ])
+        await session.commit()
+        break
+
+
+def test_listings_return_event_views(run) -> None:
+    async def scenario() -> Tuple[List[Any], List[Any]]:
+        await _seed(3)
+        async for session in session_scope():
+            repo = EventRepository(session)
+            return await repo.list_events_for_user(1), await repo.get_events_by_user("42")
+
+    upcoming, recent = run(scenario())
+
+    assert [event.title for event in upcoming] == ["Event 0", "Event 1", "Event 2"]
+    assert [event.title for event in recent] == ["Event 2", "Event 1", "Event 0"]
+    for event in upcoming + recent:
+        assert isinstance(event, EventView)
+        assert len(event.description) == DESCRIPTION_PREVIEW_CHARS + 1
+
+
+async def _measure(load: Callable[[Any], Any]) -> Dict[str, float]:
+    async for session in session_scope():
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = await load(session)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"rows": len(rows), "seconds": elapsed, "peak_mb": peak / 2**20}
+
+
+async def _load_orm(session: Any) -> List[Event]:
+    result = await session.execute(select(Event).where(Event.discord_user_id == "42").order_by(Event.start_time))
+    return list(result.scalars().all())
+
+
+async def _load_views(session: Any) -> List[EventView]:
+    result = await session.execute(
+        select(*_EVENT_VIEW_COLUMNS).where(Event.discord_user_id == "42").order_by(Event.start_time)
+    )
+    return [EventView(*row) for row in result.all()]
+
+
+@pytest.mark.benchmark
+def test_projection_beats_orm_objects_on_50k_rows(run) -> None:
+    """Load 50k events with long descriptions and attendee lists as ORM objects and as EventView rows."""
+    async def scenario() -> Tuple[Dict[str, float], Dict[str, float]]:
+        await _seed(50_000)
+        return await _measure(_load_orm), await _measure(_load_views)
+
+    orm, views = run(scenario())
+
+    logger.info("50k events: ORM %.0fms / %.1fMB peak, EventView %.0fms / %.1fMB peak",
+                orm["seconds"] * 1000, orm["peak_mb"], views["seconds"] * 1000, views["peak_mb"])
+    assert orm["rows"] == views["rows"] == 50_000
+    assert views["peak_mb"] * 2 < orm["peak_mb"]
+    assert views["seconds"] < orm["seconds"]
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+import pytest
+
+from events_agent.infra import freebusy_cache as freebusy_cache_module
+from events_agent.infra.freebusy_cache import FreeBusyCache
+
+T0 = datetime(2026, 10, 20, 9, 0, tzinfo=timezone.utc)
+Interval = Tuple[datetime, datetime]
+
+
+def _at(hours: float) -> datetime:
+    return T0 + timedelta(hours=hours)
+
+
+class Google:
+    """Counts freebusy fetches; ``gate`` holds them open until released, answering as of the call."""
+
+    def __init__(self, busy: List[Interval]) -> None:
+        self.busy = busy
+        self.calls: List[Interval] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.error: Optional[Exception] = None
+
+    async def fetch(self, time_min: datetime, time_max: datetime) -> List[Interval]:
+        self.calls.append((time_min, time_max))
+        busy = list(self.busy)
+        await self.gate.wait()
+        if self.error:
+            raise self.error
+        return busy
+
+
+def test_covered_sub_window_is_a_hit() -> None:
+    cache = FreeBusyCache(ttl_seconds=120)
+    google = Google([(_at(1), _at(2)), (_at(5), _at(6))])
+
+    async def scenario() -> List[List[Interval]]:
+        return [
+            await cache.get_busy("42", _at(0), _at(8), google.fetch),
+            await cache.get_busy("42", _at(1.5), _at(5.5), google.fetch),
+            await cache.get_busy("42", _at(3), _at(4), google.fetch),
+        ]
+
+    full, sub, empty = asyncio.run(scenario())
+
+    assert len(google.calls) == 1
+    # Misses fetch past the requested end by the TTL so a moving "now + N" window stays covered.
+    assert google.calls[0] == (_at(0), _at(8) + timedelta(seconds=120))
+    assert full == [(_at(1), _at(2)), (_at(5), _at(6))]
+    assert sub == [(_at(1.5), _at(2)), (_at(5), _at(5.5))]
+    assert empty == []
+
+
+def test_uncovered_window_and_other_keys_miss() -> None:
+    cache = FreeBusyCache(ttl_seconds=120)
+    google = Google([])
+
+    async def scenario() -> None:
+        await cache.get_busy("42", _at(1), _at(8), google.fetch)
+        await cache.get_busy("42", _at(0), _at(2), google.fetch)
+        await cache.get_busy("43", _at(1), _at(8), google.fetch)
+
+    asyncio.run(scenario())
+
+    assert len(google.calls) == 3
+
+
+def test_entries_expire_after_the_ttl(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(freebusy_cache_module.time, "monotonic", lambda: now[0])
+    cache = FreeBusyCache(ttl_seconds=120)
+    google = Google([])
+
+    async def scenario() -> None:
+        await cache.get_busy("42", _at(0), _at(8), google.fetch)
+        now[0] += 119
+        await cache.get_busy("42", _at(0), _at(8), google.fetch)
+        now[0] += 2
+        await cache.get_busy("42", _at(0), _at(8), google.fetch)
+
+    asyncio.run(scenario())
+
+    assert len(google.calls) == 2
+
+
+def test_concurrent_misses_share_one_fetch() -> None:
+    cache = FreeBusyCache(ttl_seconds=120)
+    google = Google([(_at(1), _at(2))])
+
+    async def scenario() -> List[List[Interval]]:
+        google.gate.clear()
+        waiters = [asyncio.create_task(cache.get_busy("42", _at(0), _at(8), google.fetch)) for _ in range(20)]
+        # A narrower window inside the in-flight one joins it as well.
+        waiters.append(asyncio.create_task(cache.get_busy("42", _at(1.5), _at(3), google.fetch)))
+        await asyncio.sleep(0)
+        google.gate.set()
+        return await asyncio.gather(*waiters)
+
+    results = asyncio.run(scenario())
+
+    assert len(google.calls) == 1
+    assert results[:20] == [[(_at(1), _at(2))]] * 20
+    assert results[20] == [(_at(1.5), _at(2))]
+
+
+def test_fetch_errors_reach_every_waiter_and_are_not_cached() -> None:
+    cache = FreeBusyCache(ttl_seconds=120)
+    google = Google([])
+
+    async def scenario() -> List[object]:
+        google.gate.clear()
+        google.error = RuntimeError("quota exceeded")
+        waiters = [asyncio.create_task(cache.get_busy("42", _at(0), _at(8), google.fetch)) for _ in range(3)]
+        await asyncio.sleep(0)
+        google.gate.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        google.error = None
+        return results + [await cache.get_busy("42", _at(0), _at(8), google.fetch)]
+
+    results = asyncio.run(scenario())
+
+    assert [type(r) for r in results[:3]] == [RuntimeError] * 3
+    assert results[3] == []
+    assert len(google.calls) == 2
+
+
+def test_invalidate_during_fetch_does_not_store_stale_busy_times() -> None:
+    cache = FreeBusyCache(ttl_seconds=120)
+    google = Google([(_at(1), _at(2))])
+
+    async def scenario() -> List[List[Interval]]:
+        google.gate.clear()
+        stale = asyncio.create_task(cache.get_busy("42", _at(0), _at(8), google.fetch))
+        await asyncio.sleep(0)
+        # An event is created while the fetch is in flight.
+        cache.invalidate("42")
+        google.busy = [(_at(1), _at(2)), (_at(3), _at(4))]
+        # Requests after the invalidation do not join the fetch that started before it.
+        fresh = asyncio.create_task(cache.get_busy("42", _at(0), _at(8), google.fetch))
+        await asyncio.sleep(0)
+        google.gate.set()
+        return [await stale, await fresh, await cache.get_busy("42", _at(0), _at(8), google.fetch)]
+
+    stale, fresh, later = asyncio.run(scenario())
+
+    assert len(google.calls) == 2
+    assert stale == [(_at(1), _at(2))]
+    assert fresh == later == [(_at(1), _at(2)), (_at(3), _at(4))]
+
+
+@pytest.mark.parametrize("max_windows", [1, 2])
+def test_windows_per_key_are_bounded(max_windows: int) -> None:
+    cache = FreeBusyCache(ttl_seconds=120, max_windows_per_key=max_windows)
+    google = Google([])
+
+    async def scenario() -> None:
+        await cache.get_busy("42", _at(0), _at(1), google.fetch)
+        await cache.get_busy("42", _at(10), _at(11), google.fetch)
+        await cache.get_busy("42", _at(0), _at(1), google.fetch)
+
+    asyncio.run(scenario())
+
+    assert len(google.calls) == (3 if max_windows == 1 else 2)
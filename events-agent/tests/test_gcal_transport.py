@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from events_agent.adapters import gcal, gcal_pool
+from events_agent.adapters.gcal_http import AsyncCalendarTransport
+from events_agent.adapters.gcal_pool import CalendarClientPool
+from events_agent.infra.settings import settings
+
+API_PREFIX = "/calendar/v3"
+logger = logging.getLogger(__name__)
+
+TOKEN = {"access_token": "test-access-token", "client_id": "cid", "client_secret": "secret"}
+
+
+class StubCalendar:
+    """
+    Minimal events.insert / events.get endpoint.
+
+    ``insert_failures`` holds status codes returned by the next inserts; with
+    ``store_before_failing`` the event is saved first, like a response lost
+    after Google committed the write.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.insert_calls = 0
+        self.insert_failures: List[int] = []
+        self.store_before_failing = False
+        self.lock = threading.Lock()
+
+    def handle_insert(self, body: Dict[str, Any]) -> tuple[int, Dict[str, Any]]:
+        with self.lock:
+            self.insert_calls += 1
+            failure = self.insert_failures.pop(0) if self.insert_failures else None
+            if failure and not self.store_before_failing:
+                return failure, {"error": {"code": failure}}
+            if body["id"] in self.events:
+                return 409, {"error": {"code": 409, "message": "The requested identifier already exists."}}
+            event = {**body, "status": "confirmed", "htmlLink": f"https://calendar.test/{body['id']}"}
+            self.events[body["id"]] = event
+            if failure:
+                return failure, {"error": {"code": failure}}
+            return 200, event
+
+    def handle_get(self, event_id: str) -> tuple[int, Dict[str, Any]]:
+        with self.lock:
+            event = self.events.get(event_id)
+        return (200, event) if event else (404, {"error": {"code": 404}})
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def _handler(stub: StubCalendar) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            self._reply(*stub.handle_insert(body))
+
+        def do_GET(self) -> None:
+            self._reply(*stub.handle_get(self.path.split("?")[0].rsplit("/", 1)[-1]))
+
+        def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+            if stub.latency:
+                time.sleep(stub.latency)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stub() -> Iterator[StubCalendar]:
+    calendar = StubCalendar()
+    server = _StubServer(("127.0.0.1", 0), _handler(calendar))
+    calendar.base_url = f"http://127.0.0.1:{server.server_address[1]}{API_PREFIX}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield calendar
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["discovery", "httpx"])
+def transport(request: pytest.FixtureRequest, stub: StubCalendar, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Point both Calendar transports at the stub; the param selects the one in use."""
+    real_build = gcal_pool.build
+    monkeypatch.setattr(
+        gcal_pool, "build",
+        lambda *args, **kwargs: real_build(*args, client_options={"api_endpoint": stub.base_url + "/"}, **kwargs),
+    )
+    monkeypatch.setattr(gcal, "client_pool", CalendarClientPool())
+    monkeypatch.setattr(gcal, "async_transport", AsyncCalendarTransport(base_url=stub.base_url))
+    monkeypatch.setattr(settings, "gcal_transport", request.param)
+    return request.param
+
+
+async def _create(body: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        return await gcal.create_event(TOKEN, body, user_key="u1")
+    finally:
+        await gcal.async_transport.aclose()
+
+
+def _event_body(title: str = "Standup") -> Dict[str, Any]:
+    return {
+        "summary": title,
+        "start": {"dateTime": "2026-10-20T09:00:00Z"},
+        "end": {"dateTime": "2026-10-20T09:30:00Z"},
+    }
+
+
+def test_insert_sends_client_generated_id(transport: str, stub: StubCalendar) -> None:
+    created = asyncio.run(_create(_event_body()))
+
+    assert created["id"] in stub.events
+    assert len(created["id"]) >= 5 and set(created["id"]) <= set("0123456789abcdefghijklmnopqrstuv")
+
+
+def test_retried_insert_after_lost_response_creates_one_event(transport: str, stub: StubCalendar) -> None:
+    stub.insert_failures = [503]
+    stub.store_before_failing = True
+
+    created = asyncio.run(_create(_event_body()))
+
+    assert stub.insert_calls == 2
+    assert list(stub.events) == [created["id"]]
+    assert created["summary"] == "Standup"
+
+
+def test_transient_insert_failure_is_retried(transport: str, stub: StubCalendar) -> None:
+    stub.insert_failures = [429, 503]
+
+    created = asyncio.run(_create(_event_body()))
+
+    assert stub.insert_calls == 3
+    assert list(stub.events) == [created["id"]]
+
+
+def test_client_errors_are_not_retried(transport: str, stub: StubCalendar) -> None:
+    stub.insert_failures = [400]
+
+    with pytest.raises(HttpError) as excinfo:
+        asyncio.run(_create(_event_body()))
+
+    assert excinfo.value.resp.status == 400
+    assert stub.insert_calls == 1
+    assert stub.events == {}
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _burst(concurrency: int) -> tuple[float, List[float]]:
+    async def one(i: int) -> float:
+        start = time.perf_counter()
+        await gcal.create_event(TOKEN, _event_body(f"event {i}"), user_key="u1")
+        return time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(i) for i in range(concurrency)))
+        return time.perf_counter() - start, list(latencies)
+    finally:
+        await gcal.async_transport.aclose()
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("concurrency", [100, 500, 1000])
+def test_create_event_latency_benchmark(transport: str, stub: StubCalendar, concurrency: int) -> None:
+    """Before (discovery client on worker threads) vs after (httpx) under a 20 ms Google round trip."""
+    stub.latency = 0.02
+
+    elapsed, latencies = asyncio.run(_burst(concurrency))
+
+    logger.info(
+        "%s: %d concurrent inserts in %.2fs (%.0f/s) p50=%.0fms p95=%.0fms",
+        transport, concurrency, elapsed, concurrency / elapsed,
+        _percentile(latencies, 0.5) * 1000, _percentile(latencies, 0.95) * 1000,
+    )
+    assert stub.insert_calls == concurrency
+    assert len(stub.events) == concurrency
+    # Every insert waits on the 20 ms round trip; nothing may be answered without reaching the stub.
+    assert min(latencies) >= stub.latency
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+
+from events_agent.adapters import gcal
+from events_agent.domain.models import User
+from events_agent.infra.crypto import encrypt_token
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import EventRepository, ReminderRepository, UserRepository
+from events_agent.services.calendar_service import GoogleCalendarService
+
+
+def _token(name: str) -> str:
+    return encrypt_token(json.dumps({
+        "access_token": f"access-{name}", "refresh_token": f"refresh-{name}",
+        "client_id": "cid", "client_secret": "secret",
+    }))
+
+
+async def _suggest(monkeypatch, busy_for: Dict[str, bool]) -> Dict[str, Any]:
+    queried: List[str] = []
+
+    async def fake_freebusy(token: Dict[str, Any], body: Dict[str, Any], user_key: Any = None) -> Dict[str, Any]:
+        queried.append(token["access_token"])
+        busy = []
+        if busy_for.get(token["access_token"]):
+            busy = [{"start": body["timeMin"], "end": body["timeMax"]}]
+        return {"calendars": {item["id"]: {"busy": busy} for item in body["items"]}}
+
+    monkeypatch.setattr(gcal, "freebusy_query", fake_freebusy)
+    async for session in session_scope():
+        await session.execute(insert(User), [
+            {"id": 1, "discord_id": "100", "token_ciphertext": _token("organizer")},
+            {"id": 2, "discord_id": "200", "token_ciphertext": _token("alice")},
+            {"id": 3, "discord_id": "300", "token_ciphertext": _token("bob")},
+            {"id": 4, "discord_id": "400"},
+        ])
+        await session.commit()
+        service = GoogleCalendarService(UserRepository(session), EventRepository(session), ReminderRepository(session))
+        result = await service.suggest_meeting_times(
+            "100", 60, 2, preferred_start_hour=0, preferred_end_hour=24,
+            attendee_discord_ids=["200", "300", "400", "200"], min_attendees=2
+        )
+        result["queried"] = sorted(queried)
+        return result
+
+
+def test_group_suggestions_rank_by_attendee(run, monkeypatch) -> None:
+    result = run(_suggest(monkeypatch, {"access-bob": True}))
+
+    assert result["success"]
+    assert result["queried"] == ["access-alice", "access-bob", "access-organizer"]
+    assert result["not_connected"] == ["400"]
+    best = result["suggestions"][0]
+    assert best["total_attendees"] == 3
+    assert best["available_count"] == 2
+    assert sorted(best["available_attendees"]) == ["100", "200"]
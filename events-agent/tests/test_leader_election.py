@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from events_agent.infra import scheduler
+from events_agent.infra.scheduler import LeaderElector
+from events_agent.infra.settings import settings
+
+
+class Clock(datetime):
+    """Stands in for ``datetime`` in the scheduler module so lease expiry can be stepped through."""
+
+    current = datetime(2026, 10, 20, 12, 0, tzinfo=timezone.utc)
+
+    @classmethod
+    def now(cls, tz: Any = None) -> datetime:
+        return cls.current
+
+    @classmethod
+    def advance(cls, seconds: float) -> None:
+        cls.current += timedelta(seconds=seconds)
+
+
+def _patch_clock(monkeypatch) -> type:
+    monkeypatch.setattr(Clock, "current", Clock.current)
+    monkeypatch.setattr(scheduler, "datetime", Clock)
+    return Clock
+
+
+async def _heartbeats(a: LeaderElector, b: LeaderElector) -> List[bool]:
+    return [await a.heartbeat(), await b.heartbeat()]
+
+
+def test_lease_row_elects_one_leader_and_fails_over_after_the_lease(run, monkeypatch) -> None:
+    clock = _patch_clock(monkeypatch)
+    a, b = LeaderElector(worker_id="a"), LeaderElector(worker_id="b")
+
+    async def scenario() -> Dict[str, Any]:
+        steps: Dict[str, Any] = {"start": await _heartbeats(a, b)}
+        clock.advance(settings.scheduler_leader_heartbeat_seconds)
+        steps["renewed"] = await _heartbeats(a, b)
+        # The leader stops heartbeating (process hung or killed); its lease still runs for 6s.
+        clock.advance(settings.scheduler_leader_lease_seconds - 0.5)
+        steps["lease_live"] = await b.heartbeat()
+        clock.advance(1)
+        steps["lease_expired"] = await b.heartbeat()
+        steps["old_leader_returns"] = await a.heartbeat()
+        return steps
+
+    steps = run(scenario())
+
+    assert settings.scheduler_leader_lease_seconds == 6
+    assert steps["start"] == [True, False]
+    assert steps["renewed"] == [True, False]
+    assert steps["lease_live"] is False
+    assert steps["lease_expired"] is True
+    # The old leader finds the lease taken and steps down instead of running jobs twice.
+    assert steps["old_leader_returns"] is False
+    assert (a.is_leader, b.is_leader) == (False, True)
+
+
+def test_resigning_leader_hands_over_without_waiting_for_the_lease(run, monkeypatch) -> None:
+    _patch_clock(monkeypatch)
+    a, b = LeaderElector(worker_id="a"), LeaderElector(worker_id="b")
+
+    async def scenario() -> List[bool]:
+        await _heartbeats(a, b)
+        await a.resign()
+        return [a.is_leader, await b.heartbeat()]
+
+    assert run(scenario()) == [False, True]
+
+
+def test_heartbeat_failure_steps_down(run, monkeypatch) -> None:
+    _patch_clock(monkeypatch)
+    a = LeaderElector(worker_id="a")
+
+    async def failing_heartbeat() -> bool:
+        raise ConnectionError("database unreachable")
+
+    async def scenario() -> List[bool]:
+        first = await a.heartbeat()
+        monkeypatch.setattr(a, "_lease_heartbeat", failing_heartbeat)
+        return [first, await a.heartbeat(), a.is_leader]
+
+    assert run(scenario()) == [True, False, False]
+
+
+def test_advisory_lock_elects_one_leader_and_releases_on_resign(run, postgres_url: str) -> None:
+    a, b = LeaderElector(worker_id="a"), LeaderElector(worker_id="b")
+
+    async def scenario() -> Dict[str, Any]:
+        steps: Dict[str, Any] = {"start": await _heartbeats(a, b), "renewed": await _heartbeats(a, b)}
+        await a.resign()
+        steps["after_resign"] = await _heartbeats(b, a)
+        # A leader whose connection dies loses the lock with it.
+        await b._conn.invalidate()
+        b._conn = None
+        b.is_leader = False
+        steps["after_crash"] = await a.heartbeat()
+        await a.resign()
+        return steps
+
+    steps = run(scenario())
+
+    assert steps["start"] == [True, False]
+    assert steps["renewed"] == [True, False]
+    assert steps["after_resign"] == [True, False]
+    assert steps["after_crash"] is True
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List, Tuple
+
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import (
+    EventRepository, ReminderRepository, SyncStateRepository, UserRepository
+)
+from events_agent.infra.settings import settings
+from events_agent.services.calendar_service import GoogleCalendarService
+from events_agent.services.sync_service import google_event_fields, is_sync_fresh
+
+ME = {"email": "me@example.com", "self": True}
+
+# An events.list page for the user's primary calendar (time zone Europe/Berlin)...
+EVENTS_PAGE = {
+    "timeZone": "Europe/Berlin",
+    "items": [
+        {"id": "standup", "start": {"dateTime": "2026-10-20T07:00:00Z"}, "end": {"dateTime": "2026-10-20T07:30:00Z"}},
+        # Overlaps the standup: freebusy merges the two.
+        {"id": "sync1", "start": {"dateTime": "2026-10-20T07:15:00Z"}, "end": {"dateTime": "2026-10-20T08:00:00Z"}},
+        {"id": "focus", "transparency": "transparent",
+         "start": {"dateTime": "2026-10-20T09:00:00Z"}, "end": {"dateTime": "2026-10-20T11:00:00Z"}},
+        {"id": "declined", "attendees": [{**ME, "responseStatus": "declined"}],
+         "start": {"dateTime": "2026-10-20T12:00:00Z"}, "end": {"dateTime": "2026-10-20T13:00:00Z"}},
+        {"id": "tentative", "attendees": [{**ME, "responseStatus": "tentative"}],
+         "start": {"dateTime": "2026-10-20T14:00:00Z"}, "end": {"dateTime": "2026-10-20T14:30:00Z"}},
+        {"id": "unanswered", "attendees": [{**ME, "responseStatus": "needsAction"}],
+         "start": {"dateTime": "2026-10-20T15:00:00Z"}, "end": {"dateTime": "2026-10-20T15:30:00Z"}},
+        # All-day events are free by default in Google; this one is marked busy.
+        {"id": "holiday", "transparency": "transparent", "start": {"date": "2026-10-21"}, "end": {"date": "2026-10-22"}},
+        {"id": "offsite", "start": {"date": "2026-10-22"}, "end": {"date": "2026-10-23"}},
+        # Runs past the end of the query window.
+        {"id": "late", "start": {"dateTime": "2026-10-22T23:30:00Z"}, "end": {"dateTime": "2026-10-23T01:00:00Z"}},
+    ],
+}
+
+# ...and what freebusy.query returns for the same calendar and window.
+FREEBUSY_RESPONSE = {
+    "timeMin": "2026-10-20T00:00:00.000Z",
+    "timeMax": "2026-10-23T00:00:00.000Z",
+    "calendars": {"primary": {"busy": [
+        {"start": "2026-10-20T07:00:00Z", "end": "2026-10-20T08:00:00Z"},
+        {"start": "2026-10-20T14:00:00Z", "end": "2026-10-20T14:30:00Z"},
+        {"start": "2026-10-20T15:00:00Z", "end": "2026-10-20T15:30:00Z"},
+        {"start": "2026-10-21T22:00:00Z", "end": "2026-10-22T22:00:00Z"},
+        {"start": "2026-10-22T23:30:00Z", "end": "2026-10-23T00:00:00Z"},
+    ]}},
+}
+
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _freebusy_busy() -> List[Tuple[datetime, datetime]]:
+    return [(_parse(p["start"]), _parse(p["end"])) for p in FREEBUSY_RESPONSE["calendars"]["primary"]["busy"]]
+
+
+def test_local_busy_periods_match_freebusy(run) -> None:
+    async def scenario() -> List[Tuple[datetime, datetime]]:
+        async for session in session_scope():
+            await UserRepository(session).create_user("42", "me")
+            events = EventRepository(session)
+            upserts = [google_event_fields(item, EVENTS_PAGE["timeZone"]) for item in EVENTS_PAGE["items"]]
+            await events.apply_google_changes(1, "42", upserts, [])
+            # The organizer's copy of the event this user declined still blocks the organizer only.
+            organizer = {**EVENTS_PAGE["items"][3], "attendees": [{**ME, "responseStatus": "accepted"}]}
+            await events.apply_google_changes(2, "43", [google_event_fields(organizer)], [])
+            sync = SyncStateRepository(session)
+            await sync.save_state(1, "42", "token", datetime.now(timezone.utc), full_sync=True)
+
+            service = GoogleCalendarService(UserRepository(session), events, ReminderRepository(session), sync)
+            return await service._get_local_busy_periods(
+                "42", _parse(FREEBUSY_RESPONSE["timeMin"]), _parse(FREEBUSY_RESPONSE["timeMax"])
+            )
+
+    local = run(scenario())
+
+    assert [(_as_utc(s), _as_utc(e)) for s, e in local] == _freebusy_busy()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def test_polled_sync_stays_fresh_for_a_whole_sync_interval(monkeypatch) -> None:
+    now = datetime(2026, 10, 20, 12, 0, tzinfo=timezone.utc)
+    interval = timedelta(seconds=settings.calendar_sync_interval_seconds)
+
+    def state(synced_ago: timedelta) -> SimpleNamespace:
+        return SimpleNamespace(last_full_sync_at=now - timedelta(days=1), last_synced_at=now - synced_ago,
+                               channel_id=None, channel_expires_at=None)
+
+    # Without push channels the previous sweep must count as fresh until the next one lands.
+    assert is_sync_fresh(state(interval - timedelta(seconds=1)), now)
+    assert is_sync_fresh(state(interval + timedelta(seconds=60)), now)
+    assert not is_sync_fresh(state(2 * interval), now)
+
+    monkeypatch.setattr(settings, "local_availability_max_staleness_seconds", 300)
+    assert not is_sync_fresh(state(timedelta(seconds=301)), now)
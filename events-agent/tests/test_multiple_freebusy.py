@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List
+
+from events_agent.adapters import gcal
+
+TIME_MIN = "2026-10-20T00:00:00Z"
+TIME_MAX = "2026-10-21T00:00:00Z"
+
+
+def _token(name: str, **extra: Any) -> Dict[str, Any]:
+    return {"access_token": f"access-{name}", "refresh_token": f"refresh-{name}", "client_id": "cid", **extra}
+
+
+def _fake_freebusy(requests: List[Dict[str, Any]]):
+    async def fake(token: Dict[str, Any], body: Dict[str, Any], user_key: Any = None) -> Dict[str, Any]:
+        requests.append({"token": token["access_token"], "items": [item["id"] for item in body["items"]]})
+        owner = token["access_token"].removeprefix("access-")
+        return {"calendars": {
+            item["id"]: {"busy": [{"start": TIME_MIN, "end": TIME_MAX}]} if owner == "bob" else {"busy": []}
+            for item in body["items"]
+        }}
+    return fake
+
+
+def test_results_are_keyed_by_attendee_not_calendar(monkeypatch) -> None:
+    requests: List[Dict[str, Any]] = []
+    monkeypatch.setattr(gcal, "freebusy_query", _fake_freebusy(requests))
+
+    result = asyncio.run(gcal.get_multiple_freebusy(
+        [_token("alice", attendee="alice"), _token("bob", attendee="bob"), _token("carol", email="carol@example.com")],
+        TIME_MIN, TIME_MAX,
+    ))
+
+    assert set(result["calendars"]) == {"alice", "bob", "carol@example.com"}
+    assert result["calendars"]["alice"]["busy"] == []
+    assert result["calendars"]["bob"]["busy"] == [{"start": TIME_MIN, "end": TIME_MAX}]
+    assert len(requests) == 3
+
+
+def test_calendars_sharing_a_credential_are_batched(monkeypatch) -> None:
+    requests: List[Dict[str, Any]] = []
+    monkeypatch.setattr(gcal, "freebusy_query", _fake_freebusy(requests))
+
+    result = asyncio.run(gcal.get_multiple_freebusy(
+        [_token("alice", attendee="alice"), _token("bob", attendee="bob")],
+        TIME_MIN, TIME_MAX,
+        calendar_ids=["room-1@resource.calendar.google.com", "team@group.calendar.google.com"],
+    ))
+
+    assert sorted(requests, key=lambda r: r["token"]) == [
+        {"token": "access-alice",
+         "items": ["primary", "room-1@resource.calendar.google.com", "team@group.calendar.google.com"]},
+        {"token": "access-bob", "items": ["primary"]},
+    ]
+    assert set(result["calendars"]) == {
+        "alice", "bob", "room-1@resource.calendar.google.com", "team@group.calendar.google.com"
+    }
+
+
+def test_failed_request_marks_every_calendar_in_it(monkeypatch) -> None:
+    async def failing(token: Dict[str, Any], body: Dict[str, Any], user_key: Any = None) -> Dict[str, Any]:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(gcal, "freebusy_query", failing)
+
+    result = asyncio.run(gcal.get_multiple_freebusy(
+        [_token("alice", attendee="alice")], TIME_MIN, TIME_MAX, calendar_ids=["room-1"]
+    ))
+
+    assert result["calendars"]["alice"]["errors"][0]["reason"] == "requestFailed"
+    assert result["calendars"]["room-1"]["errors"][0]["reason"] == "requestFailed"
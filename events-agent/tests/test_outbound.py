@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from events_agent.bot.outbound import Lane, OutboundQueue
+from events_agent.infra.metrics import registry
+from events_agent.infra.rate_limit import TokenBucket
+
+
+def _queue(**overrides: Any) -> OutboundQueue:
+    # Generous limits by default, so each test only meets the limit it is about.
+    options: Dict[str, Any] = dict(
+        rate_per_second=1000.0, burst=1000, route_rate_per_second=1000.0, route_burst=1000,
+        max_pending=1000, concurrency=1,
+    )
+    options.update(overrides)
+    return OutboundQueue(**options)
+
+
+def _recorder(sent: List[str], gate: Optional[asyncio.Event] = None) -> Callable[[str], Callable[[], Any]]:
+    def make(name: str) -> Callable[[], Any]:
+        async def send() -> str:
+            sent.append(name)
+            if gate is not None:
+                await gate.wait()
+            return name
+        return send
+    return make
+
+
+def _reminder_depth() -> float:
+    return registry.get_sample_value("outbound_queue_depth", {"lane": "reminder"})
+
+
+def test_interactive_message_jumps_queued_reminders() -> None:
+    async def scenario() -> List[str]:
+        queue = _queue()
+        sent: List[str] = []
+        gate = asyncio.Event()
+        blocked = _recorder(sent, gate)
+        send = _recorder(sent)
+
+        # The only send slot is held while the rest of the traffic queues up.
+        tasks = [asyncio.create_task(queue.send("dm:0", Lane.REMINDER, blocked("reminder 0")))]
+        await asyncio.sleep(0.01)
+        tasks += [asyncio.create_task(queue.send(f"dm:{i}", Lane.REMINDER, send(f"reminder {i}"))) for i in range(1, 6)]
+        await asyncio.sleep(0.01)
+        tasks.append(asyncio.create_task(queue.send("webhook:1", Lane.INTERACTIVE, send("followup"))))
+        await asyncio.sleep(0.01)
+        gate.set()
+        results = await asyncio.gather(*tasks)
+        await queue.stop()
+
+        assert results == [f"reminder {i}" for i in range(6)] + ["followup"]
+        return sent
+
+    sent = asyncio.run(scenario())
+
+    # Reminder 1 was already dequeued and waiting for the slot; everything still queued goes after the followup.
+    assert sent == ["reminder 0", "reminder 1", "followup", "reminder 2", "reminder 3", "reminder 4", "reminder 5"]
+
+
+def test_route_limit_spaces_sends_without_stalling_other_routes() -> None:
+    async def scenario() -> Dict[str, List[float]]:
+        queue = _queue(route_rate_per_second=10.0, route_burst=2, concurrency=10)
+        times: Dict[str, List[float]] = {"busy": [], "quiet": []}
+        started = time.monotonic()
+
+        def send(route: str) -> Callable[[], Any]:
+            async def deliver() -> None:
+                times[route].append(time.monotonic() - started)
+            return deliver
+
+        await asyncio.gather(
+            *(queue.send("busy", Lane.REMINDER, send("busy")) for _ in range(5)),
+            queue.send("quiet", Lane.REMINDER, send("quiet")),
+        )
+        await queue.stop()
+        return times
+
+    times = asyncio.run(scenario())
+
+    busy = times["busy"]
+    assert len(busy) == 5
+    # The burst of two goes at once; the rest follow at the route's 10/s.
+    assert busy[1] < 0.05
+    assert busy[4] - busy[1] >= 0.25
+    # The quiet route is not held up behind the exhausted one.
+    assert times["quiet"][0] < busy[2]
+
+
+def test_full_lane_holds_senders_back() -> None:
+    async def scenario() -> Dict[str, Any]:
+        queue = _queue(max_pending=2)
+        sent: List[str] = []
+        gate = asyncio.Event()
+        blocked = _recorder(sent, gate)
+        send = _recorder(sent)
+
+        tasks = [asyncio.create_task(queue.send(f"dm:{i}", Lane.REMINDER, blocked(f"reminder {i}"))) for i in range(5)]
+        await asyncio.sleep(0.01)
+        # Two reminders are admitted: one is sending, one waits for the slot; three wait outside.
+        depth_while_full = _reminder_depth()
+        followup = asyncio.create_task(queue.send("webhook:1", Lane.INTERACTIVE, send("followup")))
+        await asyncio.sleep(0.01)
+        sent_while_full = list(sent)
+        gate.set()
+        await asyncio.gather(followup, *tasks)
+        await queue.stop()
+        return {"depth": depth_while_full, "sent_while_full": sent_while_full, "sent": sent}
+
+    result = asyncio.run(scenario())
+
+    assert result["depth"] == 1
+    assert result["sent_while_full"] == ["reminder 0"]
+    # The interactive lane has its own admission, so a full reminder lane never blocks it.
+    assert result["sent"].index("followup") == 2
+    assert sorted(result["sent"]) == ["followup"] + [f"reminder {i}" for i in range(5)]
+    assert _reminder_depth() == 0
+
+
+def test_token_bucket_acquire_waits_for_refill() -> None:
+    bucket = TokenBucket(rate_per_minute=600, burst=2)
+
+    async def take(count: int) -> float:
+        started = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(take(4))
+
+    # Two tokens from the burst, then one every 100 ms.
+    assert 0.18 <= elapsed < 0.5
+    assert not bucket.allow()
@@ -0,0 +1,147 @@
+"""
+Index-usage regression tests.
+
+Each hot repository query is captured as executed, then run again under
+SQLite's EXPLAIN QUERY PLAN, and the plan must search the index added
+for it instead of scanning the table. The same checks run against
+Postgres with EXPLAIN (FORMAT JSON) on a schema built by the migrations
+when ``TEST_POSTGRES_URL`` points at a scratch database.
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import event, insert
+
+from events_agent.domain.models import Event, Reminder
+from events_agent.domain.titles import title_hash
+from events_agent.infra.db import get_engine, session_scope
+from events_agent.infra.event_repository import EventRepository, ReminderRepository
+
+NOW = datetime.now(timezone.utc)
+
+
+async def _seed() -> None:
+    async for session in session_scope():
+        await session.execute(insert(Event), [
+            {
+                "user_id": i % 20,
+                "discord_user_id": str(i % 20),
+                "google_event_id": f"evt{i}",
+                "title": f"Meeting {i}",
+                "title_hash": title_hash(f"Meeting {i}"),
+                "start_time": NOW + timedelta(hours=i),
+                "end_time": NOW + timedelta(hours=i, minutes=30),
+            }
+            for i in range(2000)
+        ])
+        await session.execute(insert(Reminder), [
+            {"user_id": i % 20, "event_id": f"evt{i}", "remind_at": NOW + timedelta(minutes=i), "sent": i % 4 == 0}
+            for i in range(2000)
+        ])
+        await session.commit()
+        break
+
+
+async def _plans(call: Callable[[Any], Awaitable[Any]]) -> List[str]:
+    """Run ``call`` with a session and return the query plan of every SELECT it issued."""
+    await _seed()
+    engine = get_engine()
+    statements: List[Tuple[str, Any]] = []
+
+    def record(conn, cursor, statement, parameters, *args) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async for session in session_scope():
+            await call(session)
+            break
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    plans = []
+    async with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            # The seeded tables are small enough that a sequential scan is cheapest;
+            # disabling it asks whether the planner can use an index at all.
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                plan = result.scalar_one()
+                plans.append(_postgres_plan_text((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]))
+        else:
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plans.append("\n".join(row[-1] for row in result.all()))
+    return plans
+
+
+def _postgres_plan_text(node: Dict[str, Any]) -> str:
+    """Flatten a JSON plan into one line per node, e.g. ``Index Scan using ix_... on events``."""
+    line = node["Node Type"]
+    if "Index Name" in node:
+        line += f" using {node['Index Name']}"
+    if "Relation Name" in node:
+        line += f" on {node['Relation Name']}"
+    return "\n".join([line] + [_postgres_plan_text(child) for child in node.get("Plans", [])])
+
+
+HOT_QUERIES = {
+    "upcoming_events_page": (
+        lambda s: EventRepository(s).get_upcoming_events_page("7", limit=5),
+        "ix_events_discord_user_id_start_time",
+    ),
+    "events_for_user": (
+        lambda s: EventRepository(s).list_events_for_user(7, limit=10),
+        "ix_events_user_id_start_time",
+    ),
+    "overlapping_events": (
+        lambda s: EventRepository(s).find_overlapping_events("7", NOW, NOW + timedelta(days=2)),
+        "ix_events_discord_user_id_start_time",
+    ),
+    "duplicate_check_exact": (
+        lambda s: EventRepository(s).check_duplicate_event(
+            "7", "meeting 7", NOW + timedelta(hours=7), NOW + timedelta(hours=8)
+        ),
+        "ix_events_discord_user_id_title_hash_start_time",
+    ),
+    "duplicate_check_fuzzy": (
+        # The hash lookup misses, then the tolerance window is range-scanned.
+        lambda s: EventRepository(s).check_duplicate_event("7", "Meeting 7", NOW, NOW + timedelta(hours=1)),
+        ("ix_events_discord_user_id_title_hash_start_time", "ix_events_discord_user_id_start_time"),
+    ),
+    "pending_reminders": (
+        lambda s: ReminderRepository(s).get_pending_reminders(NOW + timedelta(minutes=30), 5),
+        "ix_reminders_unsent_remind_at",
+    ),
+}
+
+
+def _assert_uses_indexes(plans: List[str], indexes: Any) -> None:
+    if isinstance(indexes, str):
+        indexes = (indexes,) * len(plans)
+    assert plans, "query was not executed"
+    assert len(plans) == len(indexes), plans
+    for plan, index in zip(plans, indexes):
+        assert index in plan, plan
+        assert "SCAN events" not in plan and "SCAN reminders" not in plan, plan
+        assert "Seq Scan" not in plan, plan
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_its_index(run, name: str) -> None:
+    call, indexes = HOT_QUERIES[name]
+
+    _assert_uses_indexes(run(_plans(call)), indexes)
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_its_index_on_postgres(run, postgres_url: str, name: str) -> None:
+    call, indexes = HOT_QUERIES[name]
+
+    _assert_uses_indexes(run(_plans(call)), indexes)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import insert, select, update
+
+from events_agent.domain.models import Reminder
+from events_agent.infra.db import get_engine, session_scope
+from events_agent.infra.event_repository import ReminderRepository, UserRepository
+from events_agent.infra.settings import settings
+from events_agent.services.reminder_service import ReminderService
+
+
+class FailingChannel:
+    def __init__(self) -> None:
+        self.id = 999
+        self.attempts = 0
+
+    async def send(self, **kwargs) -> None:
+        self.attempts += 1
+        raise RuntimeError("discord unavailable")
+
+
+class FakeClient:
+    def __init__(self, channel: FailingChannel) -> None:
+        self.channel = channel
+
+    def get_channel(self, channel_id: int) -> FailingChannel:
+        return self.channel
+
+
+async def _seed(count: int, channel_id: str | None = None, retries: int = 0) -> None:
+    now = datetime.now(timezone.utc)
+    async for session in session_scope():
+        await UserRepository(session).create_user("1001", "alice")
+        await session.execute(insert(Reminder), [
+            {
+                "user_id": 1,
+                "event_id": f"evt-{i}",
+                "channel_id": channel_id,
+                "remind_at": now - timedelta(seconds=i),
+                "sent": False,
+                "retries": retries,
+            }
+            for i in range(count)
+        ])
+        await session.commit()
+        break
+
+
+async def _reminders() -> List[Reminder]:
+    async for session in session_scope():
+        return list((await session.execute(select(Reminder).order_by(Reminder.id))).scalars())
+    return []
+
+
+def test_failed_send_backs_off_instead_of_retrying_in_the_same_pass(run):
+    channel = FailingChannel()
+
+    async def scenario():
+        await _seed(1, channel_id="999")
+        await asyncio.wait_for(ReminderService(FakeClient(channel)).process_due_reminders(), timeout=10)
+        return await _reminders()
+
+    [reminder] = run(scenario())
+
+    assert channel.attempts == 1
+    assert reminder.sent is False
+    assert reminder.retries == 1
+    assert reminder.claimed_by is None
+    held_for = reminder.claimed_until.replace(tzinfo=timezone.utc) - datetime.now(timezone.utc)
+    assert held_for > timedelta(seconds=settings.reminder_retry_backoff_seconds * 0.5)
+
+
+def test_reminder_is_given_up_after_max_retries(run):
+    channel = FailingChannel()
+    service = ReminderService(FakeClient(channel))
+
+    async def scenario():
+        await _seed(1, channel_id="999", retries=settings.reminder_max_retries - 1)
+        await service.process_due_reminders()
+        # Expire the backoff; the reminder has no retries left and must not be claimed again.
+        async for session in session_scope():
+            await session.execute(update(Reminder).values(claimed_until=datetime.now(timezone.utc) - timedelta(seconds=1)))
+            await session.commit()
+            break
+        await service.process_due_reminders()
+        return await _reminders()
+
+    [reminder] = run(scenario())
+
+    assert channel.attempts == 1
+    assert reminder.retries == settings.reminder_max_retries
+    assert reminder.sent is False
+
+
+def _claim_worker(worker_id: str, start: "multiprocessing.Barrier", results: "multiprocessing.Queue") -> None:
+    async def drain() -> List[int]:
+        claimed: List[int] = []
+        async for session in session_scope():
+            repo = ReminderRepository(session)
+            while True:
+                batch = await repo.claim_reminders(
+                    worker_id, 60, datetime.now(timezone.utc), settings.reminder_max_retries, limit=25
+                )
+                if not batch:
+                    break
+                claimed.extend(reminder.id for reminder in batch)
+                await asyncio.sleep(0.01)  # stand-in for sending, so workers interleave
+                await repo.mark_reminders_sent([reminder.id for reminder in batch])
+            break
+        await get_engine().dispose()
+        return claimed
+
+    start.wait()
+    results.put(asyncio.run(drain()))
+
+
+def test_concurrent_processes_claim_each_reminder_once(run):
+    total = 600
+    run(_seed(total))
+
+    context = multiprocessing.get_context("spawn")
+    start = context.Barrier(4)
+    results = context.Queue()
+    workers = [context.Process(target=_claim_worker, args=(f"worker-{i}", start, results)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    claimed = [results.get(timeout=120) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=30)
+
+    all_ids = [reminder_id for ids in claimed for reminder_id in ids]
+    assert len(all_ids) == total
+    assert len(set(all_ids)) == total
+    assert sum(1 for ids in claimed if ids) > 1
+    assert all(reminder.sent for reminder in run(_reminders()))
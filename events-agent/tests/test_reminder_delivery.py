@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Set
+
+import discord
+from sqlalchemy import insert, select, update
+
+from events_agent.bot.dm_cache import dm_cache
+from events_agent.bot.outbound import OutboundQueue
+from events_agent.domain.models import Reminder, User
+from events_agent.infra.db import session_scope
+from events_agent.infra.settings import settings
+from events_agent.services import reminder_service
+from events_agent.services.reminder_service import ReminderService
+
+
+class FakeDMChannel:
+    def __init__(self, client: "FakeClient", user_id: int) -> None:
+        self.client = client
+        self.id = 10_000_000 + user_id
+        self.user_id = user_id
+
+    async def send(self, **kwargs) -> None:
+        await asyncio.sleep(self.client.latency)
+        self.client.attempts.append(self.user_id)
+        if self.user_id in self.client.closed_dms:
+            raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Cannot send messages to this user")
+        if self.user_id in self.client.failing_users:
+            raise RuntimeError("503 Service Unavailable")
+        self.client.delivered.append(self.user_id)
+
+
+class FakeClient:
+    """Stands in for discord.Client: DM channels for any user, an unusable guild channel."""
+
+    def __init__(
+        self, latency: float = 0.0, failing_users: Optional[Set[int]] = None, closed_dms: Optional[Set[int]] = None
+    ) -> None:
+        self.latency = latency
+        self.failing_users = failing_users or set()
+        self.closed_dms = closed_dms or set()
+        self.attempts: List[int] = []
+        self.delivered: List[int] = []
+
+    def get_user(self, user_id: int) -> SimpleNamespace:
+        return SimpleNamespace(dm_channel=FakeDMChannel(self, user_id))
+
+    def get_channel(self, channel_id: int) -> None:
+        return None
+
+    async def fetch_channel(self, channel_id: int) -> None:
+        raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Missing Access")
+
+
+async def _seed(user_count: int, channel_id: Optional[str] = None) -> None:
+    now = datetime.now(timezone.utc)
+    async for session in session_scope():
+        await session.execute(insert(User), [
+            {"id": i, "discord_id": str(i)} for i in range(1, user_count + 1)
+        ])
+        await session.execute(insert(Reminder), [
+            {
+                "user_id": i,
+                "event_id": f"evt-{i}",
+                "channel_id": channel_id,
+                "remind_at": now - timedelta(seconds=1),
+                "sent": False,
+                "retries": 0,
+            }
+            for i in range(1, user_count + 1)
+        ])
+        await session.commit()
+        break
+
+
+async def _sent_by_user() -> Dict[int, bool]:
+    async for session in session_scope():
+        rows = await session.execute(select(Reminder.user_id, Reminder.sent))
+        return {row.user_id: row.sent for row in rows}
+    return {}
+
+
+async def _expire_backoff() -> None:
+    async for session in session_scope():
+        await session.execute(update(Reminder).values(claimed_until=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        await session.commit()
+        break
+
+
+def test_transient_send_failure_is_retried_not_marked_sent(run):
+    client = FakeClient(failing_users={1})
+
+    async def scenario():
+        await _seed(1)
+        await ReminderService(client).process_due_reminders()
+        first = await _sent_by_user()
+        client.failing_users.clear()
+        await _expire_backoff()
+        await ReminderService(client).process_due_reminders()
+        return first, await _sent_by_user()
+
+    first, second = run(scenario())
+
+    assert first == {1: False}
+    assert second == {1: True}
+    assert client.delivered == [1]
+
+
+def test_missing_discord_client_leaves_reminders_unsent(run):
+    async def scenario():
+        await _seed(2)
+        await ReminderService(None).process_due_reminders()
+        return await _sent_by_user()
+
+    assert run(scenario()) == {1: False, 2: False}
+
+
+def test_closed_dms_are_remembered_and_skipped(run):
+    client = FakeClient(closed_dms={1})
+
+    async def scenario():
+        await _seed(2)
+        await ReminderService(client).process_due_reminders()
+        async for session in session_scope():
+            await session.execute(insert(Reminder), [
+                {"user_id": i, "event_id": f"evt-{i}-later", "remind_at": datetime.now(timezone.utc) - timedelta(seconds=1)}
+                for i in (1, 2)
+            ])
+            await session.commit()
+            break
+        await ReminderService(client).process_due_reminders()
+
+    run(scenario())
+
+    assert dm_cache.is_forbidden(1)
+    # User 1 refused the first DM; the second reminder is not even attempted.
+    assert client.attempts.count(1) == 1
+    assert client.delivered == [2, 2]
+
+
+def test_fallback_dms_are_tracked_per_recipient(run):
+    # The guild channel is unusable, so the group falls back to one DM per user;
+    # only the user whose DM failed is retried.
+    client = FakeClient(failing_users={2})
+
+    async def scenario():
+        await _seed(3, channel_id="555")
+        await ReminderService(client).process_due_reminders()
+        first = await _sent_by_user()
+        client.failing_users.clear()
+        await _expire_backoff()
+        await ReminderService(client).process_due_reminders()
+        return first, await _sent_by_user()
+
+    first, second = run(scenario())
+
+    assert first == {1: True, 2: False, 3: True}
+    assert second == {1: True, 2: True, 3: True}
+    assert sorted(client.delivered) == [1, 2, 3]
+
+
+def test_drain_time_for_10k_due_reminders(run, monkeypatch):
+    """Benchmark: 10k reminders to distinct users through a fake client with 5 ms sends."""
+    count, latency, concurrency = 10_000, 0.005, 50
+    monkeypatch.setattr(settings, "reminder_delivery_concurrency", concurrency)
+    # Measure the pipeline itself, not Discord's rate limit.
+    monkeypatch.setattr(reminder_service, "outbound", OutboundQueue(
+        rate_per_second=1e6, burst=10_000, route_rate_per_second=1e6, route_burst=10_000,
+        max_pending=count, concurrency=concurrency,
+    ))
+    client = FakeClient(latency=latency)
+
+    async def scenario():
+        await _seed(count)
+        started = time.perf_counter()
+        await ReminderService(client).process_due_reminders()
+        elapsed = time.perf_counter() - started
+        await reminder_service.outbound.stop()
+        return elapsed, await _sent_by_user()
+
+    elapsed, sent = run(scenario())
+
+    sequential = count * latency
+    print(f"\n10k reminders drained in {elapsed:.2f}s ({count / elapsed:.0f}/s); sequential sends alone take {sequential:.0f}s")
+    assert len(client.delivered) == count
+    assert all(sent.values())
+    assert elapsed < sequential / 3
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+from sqlalchemy import insert, select
+
+from events_agent.domain.models import Reminder, User
+from events_agent.infra.db import session_scope
+from events_agent.infra.reminder_dispatcher import ReminderDispatcher
+from events_agent.services.reminder_service import ReminderService
+
+
+def test_dispatcher_holds_due_reminders_and_never_sends_early(run):
+    batches: List[Tuple[datetime, List[int]]] = []
+
+    async def deliver(reminder_ids: List[int]) -> None:
+        batches.append((datetime.now(timezone.utc), sorted(reminder_ids)))
+
+    async def scenario():
+        dispatcher = ReminderDispatcher(horizon_seconds=60, coalesce_seconds=0.3)
+        dispatcher.start(deliver)
+        await asyncio.sleep(0.05)
+        now = datetime.now(timezone.utc)
+        due = {
+            1: now + timedelta(seconds=0.1),
+            2: now + timedelta(seconds=0.25),  # falls due while 1 is held
+            3: now + timedelta(seconds=1.0),   # outside the window
+        }
+        for reminder_id, remind_at in due.items():
+            dispatcher.notify(reminder_id, remind_at)
+        await asyncio.sleep(1.6)
+        await dispatcher.stop()
+        return due
+
+    due = run(scenario())
+
+    assert [ids for _, ids in batches] == [[1, 2], [3]]
+    for delivered_at, ids in batches:
+        assert all(delivered_at >= due[reminder_id] for reminder_id in ids)
+        assert delivered_at - due[ids[0]] < timedelta(seconds=0.6)
+
+
+def test_polling_pass_does_not_claim_reminders_before_they_are_due(run):
+    class Channel:
+        id = 1
+        sent = 0
+
+        async def send(self, **kwargs) -> None:
+            Channel.sent += 1
+
+    class Client:
+        def get_user(self, user_id):
+            return type("U", (), {"dm_channel": Channel()})()
+
+    async def scenario():
+        now = datetime.now(timezone.utc)
+        async for session in session_scope():
+            await session.execute(insert(User), [{"id": 1, "discord_id": "1"}])
+            await session.execute(insert(Reminder), [
+                {"user_id": 1, "event_id": "due", "remind_at": now - timedelta(seconds=1), "sent": False, "retries": 0},
+                {"user_id": 1, "event_id": "soon", "remind_at": now + timedelta(seconds=30), "sent": False, "retries": 0},
+            ])
+            await session.commit()
+            break
+        await ReminderService(Client()).process_due_reminders()
+        async for session in session_scope():
+            return dict((await session.execute(select(Reminder.event_id, Reminder.sent))).all())
+
+    assert run(scenario()) == {"due": True, "soon": False}
+    assert Channel.sent == 1
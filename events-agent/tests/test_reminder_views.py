@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import event, insert
+
+from events_agent.domain.models import Event, Reminder, User
+from events_agent.infra.db import get_engine, session_scope
+from events_agent.infra.event_repository import ReminderRepository
+
+NOW = datetime.now(timezone.utc)
+
+
+async def _seed(count: int) -> None:
+    async for session in session_scope():
+        await session.execute(insert(User), [{"id": i, "discord_id": f"d{i}"} for i in range(1, 11)])
+        # Every user holds their own copy of the same shared event.
+        await session.execute(insert(Event), [
+            {
+                "user_id": i,
+                "discord_user_id": f"d{i}",
+                "google_event_id": "shared",
+                "title": f"Shared for d{i}",
+                "start_time": NOW + timedelta(hours=1),
+                "end_time": NOW + timedelta(hours=2),
+            }
+            for i in range(1, 11)
+        ])
+        await session.execute(insert(Reminder), [
+            {
+                "user_id": i % 10 + 1 if i % 7 else 99,  # every 7th reminder's user is gone
+                "event_id": "shared" if i % 5 else f"deleted-{i}",  # every 5th reminder's event is gone
+                "remind_at": NOW - timedelta(seconds=i),
+            }
+            for i in range(1, count + 1)
+        ])
+        await session.commit()
+        break
+
+
+async def _claim(count: int) -> Dict[str, Any]:
+    await _seed(count)
+    engine = get_engine()
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement.lstrip().split(None, 1)[0].upper())
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async for session in session_scope():
+            views = await ReminderRepository(session).claim_reminders("worker", 60, NOW, 5, limit=count)
+            break
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return {"views": views, "statements": statements}
+
+
+@pytest.mark.parametrize("count", [10, 400])
+def test_claimed_batch_is_hydrated_with_one_select(run, count: int) -> None:
+    result = run(_claim(count))
+
+    assert result["statements"].count("SELECT") == 1
+    views = result["views"]
+    assert len(views) == count
+    for view in views:
+        if view.user_id == 99:
+            assert view.discord_user_id is None
+        else:
+            assert view.discord_user_id == f"d{view.user_id}"
+        if view.event_id == "shared" and view.user_id != 99:
+            assert view.event.title == f"Shared for d{view.user_id}"
+        else:
+            assert view.event is None
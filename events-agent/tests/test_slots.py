@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+import pytest
+
+from events_agent.domain.slots import Interval, find_free_slots, merge_intervals
+
+logger = logging.getLogger(__name__)
+
+T0 = datetime(2026, 10, 20, 0, 0, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def _at(hours: float) -> datetime:
+    return T0 + timedelta(hours=hours)
+
+
+def _rescan_slots(
+    busy: List[Interval],
+    window_start: datetime,
+    window_end: datetime,
+    duration: timedelta,
+    step: timedelta = timedelta(minutes=30),
+    buffer: timedelta = timedelta(0),
+    working_hours: Optional[Tuple[int, int]] = None,
+    limit: Optional[int] = 10,
+) -> List[Interval]:
+    """The step-and-rescan loop find_free_slots replaced: every grid step checks every busy period."""
+    slots = []
+    busy = sorted(busy)
+    current = window_start
+    while current + duration <= window_end:
+        if not working_hours or working_hours[0] <= current.hour < working_hours[1]:
+            end = current + duration
+            if not any(current - buffer < b_end and end + buffer > b_start for b_start, b_end in busy):
+                slots.append((current, end))
+        current += step
+    return slots[:limit] if limit is not None else slots
+
+
+def test_merge_joins_touching_and_overlapping_intervals() -> None:
+    busy = [(_at(3), _at(4)), (_at(1), _at(2)), (_at(2), _at(2.5)), (_at(3.5), _at(3.75)), (_at(6), _at(7))]
+
+    assert merge_intervals(busy) == [(_at(1), _at(2.5)), (_at(3), _at(4)), (_at(6), _at(7))]
+    # Padding can close a gap that was open before.
+    assert merge_intervals(busy, pad=timedelta(minutes=15)) == [
+        (_at(0.75), _at(4.25)), (_at(5.75), _at(7.25))
+    ]
+
+
+def test_touching_busy_intervals_leave_no_gap() -> None:
+    busy = [(_at(9), _at(10)), (_at(10), _at(11))]
+
+    slots = find_free_slots(busy, _at(9), _at(13), HOUR, limit=None)
+
+    assert slots == [(_at(11), _at(12)), (_at(11.5), _at(12.5)), (_at(12), _at(13))]
+
+
+def test_slot_may_touch_a_busy_interval() -> None:
+    slots = find_free_slots([(_at(10), _at(11))], _at(9), _at(12), HOUR, limit=None)
+
+    assert slots == [(_at(9), _at(10)), (_at(11), _at(12))]
+
+
+def test_overlapping_busy_intervals_are_merged() -> None:
+    busy = [(_at(9), _at(11)), (_at(9.5), _at(10)), (_at(10.5), _at(12))]
+
+    assert find_free_slots(busy, _at(9), _at(13), HOUR, limit=None) == [(_at(12), _at(13))]
+
+
+def test_gap_exactly_the_duration_fits_and_one_minute_less_does_not() -> None:
+    busy = [(_at(8), _at(9)), (_at(10), _at(11))]
+    short = [(_at(8), _at(9)), (_at(10) - timedelta(minutes=1), _at(11))]
+
+    assert find_free_slots(busy, _at(8), _at(11), HOUR) == [(_at(9), _at(10))]
+    assert find_free_slots(short, _at(8), _at(11), HOUR) == []
+
+
+def test_busy_periods_outside_the_window_are_ignored() -> None:
+    busy = [(_at(0), _at(2)), (_at(20), _at(30))]
+
+    assert find_free_slots(busy, _at(9), _at(11), HOUR, limit=None) == [
+        (_at(9), _at(10)), (_at(9.5), _at(10.5)), (_at(10), _at(11))
+    ]
+
+
+def test_busy_period_straddling_the_window_start() -> None:
+    slots = find_free_slots([(_at(8), _at(9.25))], _at(9), _at(11), HOUR, limit=None)
+
+    # Slots stay on the grid anchored at the window start.
+    assert slots == [(_at(9.5), _at(10.5)), (_at(10), _at(11))]
+
+
+def test_buffer_widens_busy_time() -> None:
+    busy = [(_at(10), _at(11))]
+
+    slots = find_free_slots(busy, _at(8), _at(13), HOUR, buffer=timedelta(minutes=15), limit=None)
+
+    # 9:00-10:00 would end inside the buffer before the meeting, 11:00-12:00 start inside the one after it.
+    assert slots == [(_at(8), _at(9)), (_at(8.5), _at(9.5)), (_at(11.5), _at(12.5)), (_at(12), _at(13))]
+
+
+def test_working_hours_skip_the_night() -> None:
+    slots = find_free_slots([], _at(16), _at(34), HOUR, working_hours=(9, 17), limit=3)
+
+    assert slots == [(_at(16), _at(17)), (_at(16.5), _at(17.5)), (_at(33), _at(34))]
+
+
+@pytest.mark.parametrize("duration, step, window", [
+    (timedelta(0), timedelta(minutes=30), (_at(0), _at(4))),
+    (HOUR, timedelta(0), (_at(0), _at(4))),
+    (HOUR, timedelta(minutes=30), (_at(4), _at(4))),
+])
+def test_degenerate_inputs_return_nothing(duration: timedelta, step: timedelta, window: Interval) -> None:
+    assert find_free_slots([], window[0], window[1], duration, step=step) == []
+
+
+def _random_busy(rng: random.Random, count: int, days: int) -> List[Interval]:
+    busy = []
+    for _ in range(count):
+        start = T0 + timedelta(minutes=rng.randrange(0, days * 24 * 60, 5))
+        busy.append((start, start + timedelta(minutes=rng.choice([15, 30, 45, 60, 90, 120]))))
+    return busy
+
+
+def test_matches_the_rescan_loop_on_random_calendars() -> None:
+    rng = random.Random(5)
+    for _ in range(500):
+        days = rng.randint(1, 5)
+        busy = _random_busy(rng, rng.randint(0, 40), days)
+        start = T0 + timedelta(minutes=rng.randrange(0, 24 * 60, 10))
+        args = (busy, start, start + timedelta(days=days), timedelta(minutes=rng.choice([15, 30, 60, 90])))
+        kwargs = dict(
+            buffer=timedelta(minutes=rng.choice([0, 5, 15])),
+            working_hours=rng.choice([None, (9, 17), (8, 20)]),
+            limit=rng.choice([None, 10]),
+        )
+
+        assert find_free_slots(*args, **kwargs) == _rescan_slots(*args, **kwargs)
+
+
+def _best_of(runs: int, call) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+@pytest.mark.benchmark
+def test_sweep_beats_rescan_on_a_busy_quarter() -> None:
+    """90-day window, 6000 busy periods, working hours and a buffer: the old loop vs the sweep."""
+    busy = _random_busy(random.Random(90), 6000, 90)
+    args = (busy, T0, T0 + timedelta(days=90), HOUR)
+    kwargs = dict(buffer=timedelta(minutes=10), working_hours=(9, 17), limit=None)
+
+    assert find_free_slots(*args, **kwargs) == _rescan_slots(*args, **kwargs)
+    rescan = _best_of(3, lambda: _rescan_slots(*args, **kwargs))
+    sweep = _best_of(3, lambda: find_free_slots(*args, **kwargs))
+
+    logger.info("free slots over 90 days: rescan %.1fms, sweep %.1fms (%.0fx)",
+                rescan * 1000, sweep * 1000, rescan / sweep)
+    assert sweep * 5 < rescan
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+import httpx
+from sqlalchemy import insert, select
+
+from events_agent.adapters.gcal_http import AsyncCalendarTransport
+from events_agent.domain.models import User
+from events_agent.infra.crypto import decrypt_token, encrypt_token
+from events_agent.infra.db import session_scope
+from events_agent.services.token_refresher import TokenRefresher, save_refreshed_token
+
+TOKEN_URI = "https://oauth2.test/token"
+API = "https://calendar.test/calendar/v3"
+
+
+class StubGoogle:
+    """Token endpoint and a Calendar endpoint that only accepts the latest access token."""
+
+    def __init__(self, expires_in: Optional[int] = 3599) -> None:
+        self.expires_in = expires_in
+        self.token_requests: List[Dict[str, str]] = []
+        self.api_requests: List[str] = []
+        self.issued = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if str(request.url) == TOKEN_URI:
+            form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+            self.token_requests.append(form)
+            self.issued += 1
+            payload: Dict[str, Any] = {"access_token": f"fresh-{self.issued}", "token_type": "Bearer"}
+            if self.expires_in:
+                payload["expires_in"] = self.expires_in
+            return httpx.Response(200, json=payload)
+        auth = request.headers["Authorization"]
+        self.api_requests.append(auth)
+        if auth != f"Bearer fresh-{self.issued}":
+            return httpx.Response(401, json={"error": {"code": 401, "message": "Invalid Credentials"}})
+        return httpx.Response(200, json={"items": [], "nextSyncToken": "t1"})
+
+    def transport(self) -> AsyncCalendarTransport:
+        transport = AsyncCalendarTransport(base_url=API, token_uri=TOKEN_URI)
+        transport._http = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        return transport
+
+
+def _token(name: str, expiry: Optional[datetime], refresh: bool = True) -> str:
+    token = {"access_token": f"stale-{name}", "client_id": "cid", "client_secret": "secret"}
+    if refresh:
+        token["refresh_token"] = f"refresh-{name}"
+    if expiry:
+        token["expiry"] = expiry.isoformat()
+    return encrypt_token(json.dumps(token))
+
+
+async def _seed() -> None:
+    now = datetime.now(timezone.utc)
+    async for session in session_scope():
+        await session.execute(insert(User), [
+            {"discord_id": "fresh", "google_sub": "sub-1", "token_ciphertext": _token("fresh", now + timedelta(hours=1))},
+            {"discord_id": "expiring", "google_sub": "sub-2", "token_ciphertext": _token("expiring", now + timedelta(seconds=30))},
+            {"discord_id": "no-expiry", "google_sub": None, "token_ciphertext": _token("no-expiry", None)},
+            {"discord_id": "no-refresh", "token_ciphertext": _token("no-refresh", None, refresh=False)},
+        ])
+        await session.commit()
+        break
+
+
+async def _users() -> Dict[str, Any]:
+    async for session in session_scope():
+        result = await session.execute(select(User.discord_id, User.google_sub, User.token_ciphertext))
+        return {
+            row.discord_id: (row.google_sub, json.loads(decrypt_token(row.token_ciphertext)))
+            for row in result.all()
+        }
+
+
+async def _refresh_twice(google: StubGoogle) -> Dict[str, Any]:
+    await _seed()
+    transport = google.transport()
+    refresher = TokenRefresher(transport=transport, margin_seconds=300)
+    try:
+        first = await refresher.refresh_due()
+        second = await refresher.refresh_due()
+    finally:
+        await transport.aclose()
+    return {"first": first, "second": second, "users": await _users()}
+
+
+def test_refresher_refreshes_only_due_tokens(run) -> None:
+    google = StubGoogle()
+
+    result = run(_refresh_twice(google))
+
+    assert result["first"] == 2
+    assert result["second"] == 0
+    assert sorted(r["refresh_token"] for r in google.token_requests) == ["refresh-expiring", "refresh-no-expiry"]
+    assert google.token_requests[0]["grant_type"] == "refresh_token"
+    users = result["users"]
+    assert users["fresh"][1]["access_token"] == "stale-fresh"
+    assert users["expiring"][1]["access_token"].startswith("fresh-")
+    assert users["expiring"][0] == "sub-2"
+    # A missing google_sub stays NULL rather than becoming "".
+    assert users["no-expiry"][0] is None
+    assert "expiry" in users["no-expiry"][1]
+
+
+def test_expiry_is_recorded_when_endpoint_omits_expires_in(run) -> None:
+    google = StubGoogle(expires_in=None)
+
+    result = run(_refresh_twice(google))
+
+    assert (result["first"], result["second"]) == (2, 0)
+    expiry = datetime.fromisoformat(result["users"]["no-expiry"][1]["expiry"])
+    assert expiry > datetime.now(timezone.utc) + timedelta(minutes=50)
+
+
+def test_transport_refreshes_once_on_401_and_replays() -> None:
+    google = StubGoogle()
+    token = {"access_token": "stale", "refresh_token": "refresh-1", "client_id": "cid", "client_secret": "secret"}
+
+    async def scenario() -> Dict[str, Any]:
+        transport = google.transport()
+        try:
+            return await transport.list_events(token, maxResults=10)
+        finally:
+            await transport.aclose()
+
+    page = asyncio.run(scenario())
+
+    assert page["nextSyncToken"] == "t1"
+    assert google.api_requests == ["Bearer stale", "Bearer fresh-1"]
+    assert len(google.token_requests) == 1
+    assert token["access_token"] == "fresh-1" and "expiry" in token
+
+
+def test_token_refreshed_on_401_is_saved(run) -> None:
+    google = StubGoogle()
+
+    async def scenario() -> Dict[str, Any]:
+        await _seed()
+        transport = google.transport()
+        transport.on_token_refreshed = save_refreshed_token
+        token = json.loads(decrypt_token(_token("no-expiry", None)))
+        try:
+            await transport.list_events(token, user_key="no-expiry", maxResults=10)
+            # A second call starts from the stored token and goes straight through.
+            stored = (await _users())["no-expiry"][1]
+            await transport.list_events(stored, user_key="no-expiry", maxResults=10)
+        finally:
+            await transport.aclose()
+        return await _users()
+
+    users = run(scenario())
+
+    assert users["no-expiry"][0] is None
+    assert users["no-expiry"][1]["access_token"] == "fresh-1"
+    assert users["no-expiry"][1]["refresh_token"] == "refresh-no-expiry"
+    assert "expiry" in users["no-expiry"][1]
+    assert users["fresh"][1]["access_token"] == "stale-fresh"
+    assert google.api_requests == ["Bearer stale-no-expiry", "Bearer fresh-1", "Bearer fresh-1"]
+    assert len(google.token_requests) == 1
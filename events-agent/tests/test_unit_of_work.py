@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import func, select
+
+from events_agent.domain.models import Reminder, User
+from events_agent.infra.db import session_scope
+from events_agent.infra.event_repository import ReminderRepository, UserRepository
+from events_agent.infra.unit_of_work import UnitOfWork
+
+REMIND_AT = datetime.now(timezone.utc) + timedelta(hours=1)
+
+
+async def _counts() -> Dict[str, int]:
+    async for session in session_scope():
+        users = await session.scalar(select(func.count()).select_from(User))
+        reminders = await session.scalar(select(func.count()).select_from(Reminder))
+        return {"users": users, "reminders": reminders}
+
+
+async def _create(fail: bool) -> Dict[str, Any]:
+    notified: List[int] = []
+    async for session in session_scope():
+        try:
+            async with UnitOfWork(session) as uow:
+                user = await UserRepository(session).create_user("42", "me")
+                reminder = await ReminderRepository(session).create_reminder(user.id, "evt1", None, REMIND_AT)
+                uow.after_commit(notified.append, reminder.id)
+                if fail:
+                    raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+        break
+    return {"counts": await _counts(), "notified": notified}
+
+
+def test_unit_of_work_commits_all_writes_once(run) -> None:
+    result = run(_create(fail=False))
+
+    assert result["counts"] == {"users": 1, "reminders": 1}
+    assert result["notified"] == [1]
+
+
+def test_unit_of_work_rolls_back_on_exception(run) -> None:
+    result = run(_create(fail=True))
+
+    assert result["counts"] == {"users": 0, "reminders": 0}
+    # A rolled-back reminder is never handed to the dispatcher.
+    assert result["notified"] == []
+
+
+def test_repository_commit_only_flushes_inside_a_unit_of_work(run) -> None:
+    async def scenario() -> Dict[str, Any]:
+        notified: List[str] = []
+        async for session in session_scope():
+            async with UnitOfWork(session):
+                async with UnitOfWork(session) as inner:
+                    user = await UserRepository(session).create_user("42", "me")
+                    inner.after_commit(notified.append, "committed")
+                # The user was flushed (it has an ID) but nothing is committed until the outer block exits.
+                before = {"id": user.id, "counts": await _counts(), "notified": list(notified)}
+            return {"before": before, "after": await _counts(), "notified": notified}
+
+    result = run(scenario())
+
+    assert result["before"] == {"id": 1, "counts": {"users": 0, "reminders": 0}, "notified": []}
+    assert result["after"] == {"users": 1, "reminders": 0}
+    assert result["notified"] == ["committed"]
+
+
+def test_failed_repository_write_marks_the_unit_of_work(run) -> None:
+    async def scenario() -> Dict[str, int]:
+        async for session in session_scope():
+            with pytest.raises(Exception):
+                async with UnitOfWork(session):
+                    await UserRepository(session).create_user("42", "me")
+                    # Same discord_id again: the repository rolls back, which must undo the first user too.
+                    await UserRepository(session).create_user("42", "me")
+            break
+        return await _counts()
+
+    assert run(scenario())["users"] == 0
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+from events_agent.domain.views import UserView
+from events_agent.infra import user_cache as user_cache_module
+from events_agent.infra.crypto import encrypt_token
+from events_agent.infra.user_cache import UserCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _user(discord_id: str, token: bool) -> UserView:
+    ciphertext = encrypt_token(json.dumps({"access_token": f"access-{discord_id}"})) if token else None
+    return UserView(id=1, discord_id=discord_id, tz="UTC", email=None, google_sub=None, token_ciphertext=ciphertext)
+
+
+def test_users_with_tokens_expire_on_the_shorter_ttl(monkeypatch) -> None:
+    clock = Clock()
+    monkeypatch.setattr(user_cache_module.time, "monotonic", clock)
+    cache = UserCache(max_entries=10, ttl_seconds=300, token_ttl_seconds=30)
+    cache.put(_user("connected", token=True))
+    cache.put(_user("unconnected", token=False))
+
+    clock.now += 29
+    assert cache.get("connected") is not None
+
+    clock.now += 2
+    # A token rewritten by another replica is re-read from the database now.
+    assert cache.get("connected") is None
+    assert cache.get("unconnected") is not None
+
+    clock.now += 270
+    assert cache.get("unconnected") is None
+
+
+def test_token_ttl_never_exceeds_the_base_ttl() -> None:
+    assert UserCache(ttl_seconds=10, token_ttl_seconds=30).token_ttl == 10
+    assert UserCache(ttl_seconds=300).token_ttl == 300